@@ -1,9 +1,24 @@
+import sys
+import time
+from pathlib import Path
+
 import streamlit as st
-import pickle
 import pandas as pd
 from datetime import datetime, timedelta
 from prophet.plot import plot_plotly
 
+# Hacer importable el paquete src desde la raíz del proyecto
+ROOT_DIR = Path(__file__).resolve().parents[2]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.append(str(ROOT_DIR))
+
+from src.models.sales_predictor import SalesTimeSeriesPredictor
+from src.models.artifacts import load_prophet_model, resolve_model_path
+from src.utils.model_cache import cache_info, load_model_cached
+
+# Si no existe se usa el artefacto models/sales_model.zip
+MODEL_PATH = Path("models/sales_model.pkl")
+
 # Configuración de la página
 st.set_page_config(page_title="Predicción de Ventas", layout="wide")
 
@@ -43,14 +58,16 @@ st.divider()
 # Cargar modelo y generar predicción
 if generate_button:
     try:
-        # Intentar cargar el modelo
+        # Cargar el modelo (una vez por proceso; se recarga solo si cambia el archivo)
         with st.spinner("📂 Cargando modelo de Prophet..."):
             try:
-                with open("models/sales_model.pkl", "rb") as f:
-                    model = pickle.load(f)
+                load_start = time.perf_counter()
+                model_path = resolve_model_path(MODEL_PATH)
+                model = load_model_cached(model_path, loader=load_prophet_model)
+                load_ms = (time.perf_counter() - load_start) * 1000
                 st.success("✅ Modelo cargado correctamente")
             except FileNotFoundError:
-                st.error("❌ Archivo de modelo no encontrado en 'models/sales_model.pkl'")
+                st.error("❌ Archivo de modelo no encontrado en 'models/sales_model.pkl' (ni .zip)")
                 st.stop()
             except Exception as e:
                 st.error(f"❌ Error al cargar el modelo: {str(e)}")
@@ -59,14 +76,25 @@ if generate_button:
         # Generar predicción futura
         with st.spinner(f"🔄 Generando predicción para {prediction_days} días..."):
             try:
-                # Crear dataframe futuro
-                future = model.make_future_dataframe(periods=prediction_days)
+                # Recortar el pronóstico precalculado (se recalcula solo si el modelo cambió)
+                predictor = SalesTimeSeriesPredictor(model_path=str(MODEL_PATH))
+                predictor.model = model
                 
-                # Hacer predicción
-                forecast = model.predict(future)
+                predict_start = time.perf_counter()
+                forecast = predictor.get_forecast(prediction_days, include_history=True)
+                predict_ms = (time.perf_counter() - predict_start) * 1000
                 
                 st.success("✅ Predicción generada exitosamente")
                 
+                # Latencias: carga del modelo (caché) frente a la predicción.
+                # La entrada puede haber salido de la caché (clear_model_cache en otra sesión).
+                info = cache_info(model_path, loader=load_prophet_model)
+                first_load = f" (deserialización inicial: {info['load_seconds'] * 1000:.0f} ms)" if info else ""
+                st.caption(
+                    f"⏱️ Modelo: {load_ms:.1f} ms en esta petición{first_load} · "
+                    f"Predicción: {predict_ms:.1f} ms"
+                )
+                
                 # Mostrar gráfico interactivo
                 st.markdown("### 📊 Gráfico de Predicción")
                 fig = plot_plotly(model, forecast)
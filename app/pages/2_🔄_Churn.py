@@ -1,4 +1,5 @@
-import pickle
+import io
+import sys
 from pathlib import Path
 
 import pandas as pd
@@ -6,6 +7,19 @@ import streamlit as st
 import shap
 import matplotlib.pyplot as plt
 
+# Hacer importable el paquete src desde la raíz del proyecto
+ROOT_DIR = Path(__file__).resolve().parents[2]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.append(str(ROOT_DIR))
+
+from src.data.storage import table_bytes
+from src.models.artifacts import load_xgboost_model, resolve_model_path
+from src.models.churn_explain import ShapStore, build_explainer, explain
+from src.models.churn_inference import ChurnInferenceEngine
+from src.models.feature_store import CustomerFeatureStore
+from src.models.similar_customers import SimilarCustomerIndex
+from src.utils.model_cache import file_fingerprint
+
 # Configuración de la página
 st.set_page_config(page_title="Detector de Churn", layout="wide")
 
@@ -15,19 +29,104 @@ Identifica rápidamente qué clientes tienen mayor probabilidad de abandono y pr
 """)
 
 DATA_PATH = Path("data/processed/customer_features.csv")
+# Si no existe se usa el artefacto models/churn_model.zip
 MODEL_PATH = Path("models/churn_model.pkl")
+# Valores SHAP precalculados (python -m src.models.churn_explain), opcional
+SHAP_PATH = Path("data/processed/churn_shap.npz")
 REQUIRED_FEATURES = ["frequency", "monetary", "avg_ticket"]
+REQUIRED_COLUMNS = {"customer_id", "recency", "frequency", "monetary"}
+# Versiones (datos, modelo) puntuadas que se mantienen en memoria
+MAX_CACHED_VERSIONS = 2
+# Tabla de riesgo: se envía al navegador solo la página visible
+TABLE_COLUMNS = {
+    "customer_id": "Customer ID",
+    "recency": "Recency",
+    "monetary": "Monetary",
+    "Churn_Probability": "Churn Probability",
+}
+SORT_OPTIONS = {"Churn Probability": None, "Monetary": "monetary", "Recency": "recency", "Customer ID": "customer_id"}
+PAGE_SIZES = [25, 50, 100, 250]
+EXPORT_CHUNKSIZE = 50_000
+EXPORT_FORMATS = {"csv": "text/csv", "parquet": "application/vnd.apache.parquet"}
+SIMILAR_CUSTOMERS = 10
+COMPARISON_COLUMNS = ["customer_id", "recency", "frequency", "monetary", "avg_ticket", "Churn_Probability"]
+
+
+# Las versiones (mtime y tamaño del archivo) forman parte de la clave de caché:
+# si cambia el dataset o el modelo se recalcula, si no se reutiliza entre reruns y sesiones.
+@st.cache_resource(show_spinner=False, max_entries=MAX_CACHED_VERSIONS)
+def load_model(path: Path, model_version: tuple):
+    return load_xgboost_model(path)
+
+
+@st.cache_resource(show_spinner=False, max_entries=MAX_CACHED_VERSIONS)
+def load_engine(path: Path, model_version: tuple) -> ChurnInferenceEngine:
+    # Booster con inplace_predict sobre float32 (sin DMatrix por rerun)
+    return ChurnInferenceEngine(load_model(path, model_version))
 
 
-@st.cache_resource(show_spinner=False)
-def load_model(path: Path):
-    with open(path, "rb") as f:
-        return pickle.load(f)
+def load_data(path: Path) -> pd.DataFrame:
+    data = pd.read_csv(path)
+    missing_cols = REQUIRED_COLUMNS - set(data.columns)
+    if missing_cols:
+        raise ValueError(f"❌ Faltan columnas en el dataset: {', '.join(sorted(missing_cols))}")
+    return data
 
 
-@st.cache_data(show_spinner=False)
-def load_data(path: Path) -> pd.DataFrame:
-    return pd.read_csv(path)
+@st.cache_resource(show_spinner=False, max_entries=MAX_CACHED_VERSIONS)
+def load_scored_store(data_path: Path, data_version: tuple,
+                      model_path: Path, model_version: tuple) -> CustomerFeatureStore:
+    # Una inferencia completa por (versión de datos, versión de modelo); el store
+    # queda ordenado por probabilidad y se comparte en solo lectura
+    store = CustomerFeatureStore(load_data(data_path))
+    store.score(load_engine(model_path, model_version))
+    store.frame["Churn_Probability"] = store.probability
+    return store
+
+
+@st.cache_resource(show_spinner=False, max_entries=MAX_CACHED_VERSIONS)
+def load_similarity_index(data_path: Path, data_version: tuple,
+                          model_path: Path, model_version: tuple) -> SimilarCustomerIndex:
+    # KD-tree sobre las features escaladas, construido una vez por versión
+    return SimilarCustomerIndex(load_scored_store(data_path, data_version, model_path, model_version))
+
+
+@st.cache_resource(show_spinner=False, max_entries=MAX_CACHED_VERSIONS)
+def load_explainer(path: Path, model_version: tuple):
+    return build_explainer(load_model(path, model_version))
+
+
+@st.cache_resource(show_spinner=False, max_entries=MAX_CACHED_VERSIONS)
+def load_shap_store(path: Path, shap_version: tuple) -> ShapStore:
+    return ShapStore.load(path)
+
+
+def current_shap_store(model_path: Path, data_path: Path):
+    # Solo se usa si se calculó con el modelo y los datos actuales
+    if not SHAP_PATH.exists():
+        return None
+    shap_store = load_shap_store(SHAP_PATH, file_fingerprint(SHAP_PATH))
+    return shap_store if shap_store.is_current(model_path, data_path) else None
+
+
+@st.cache_data(show_spinner=False, max_entries=256)
+def render_waterfall(customer_id, data_version: tuple, model_version: tuple, _explanation) -> bytes:
+    # PNG por (cliente, datos, modelo): volver a seleccionar un cliente no redibuja
+    fig = plt.figure(figsize=(10, 6))
+    shap.plots.waterfall(_explanation, show=False)
+    buffer = io.BytesIO()
+    plt.gcf().savefig(buffer, format="png", bbox_inches="tight")
+    plt.close("all")
+    return buffer.getvalue()
+
+
+def export_risk_table(store: CustomerFeatureStore, positions, storage_format: str) -> bytes:
+    # Se ejecuta solo al pulsar descargar; las filas se serializan por chunks
+    chunks = (
+        store.frame.iloc[positions[start:start + EXPORT_CHUNKSIZE]][list(TABLE_COLUMNS)].rename(columns=TABLE_COLUMNS)
+        for start in range(0, max(len(positions), 1), EXPORT_CHUNKSIZE)
+    )
+    return table_bytes(chunks, storage_format)
 
 
 # Carga de recursos
@@ -35,44 +134,33 @@ with st.spinner("📂 Cargando datos y modelo..."):
     if not DATA_PATH.exists():
         st.error("❌ No se encontró el dataset en data/processed/customer_features.csv")
         st.stop()
-    if not MODEL_PATH.exists():
-        st.error("❌ No se encontró el modelo en models/churn_model.pkl")
+    try:
+        model_path = resolve_model_path(MODEL_PATH)
+    except FileNotFoundError:
+        st.error("❌ No se encontró el modelo en models/churn_model.pkl (ni .zip)")
         st.stop()
 
+    data_version = file_fingerprint(DATA_PATH)
+    model_version = file_fingerprint(model_path)
+
     try:
-        data = load_data(DATA_PATH)
+        model = load_model(model_path, model_version)
     except Exception as exc:
-        st.error(f"❌ Error al leer el dataset: {exc}")
+        st.error(f"❌ Error al cargar el modelo: {exc}")
         st.stop()
 
+    # Feature store puntuado (avg_ticket recalculado como en el entrenamiento)
     try:
-        model = load_model(MODEL_PATH)
+        store = load_scored_store(DATA_PATH, data_version, model_path, model_version)
+    except ValueError as exc:
+        st.error(str(exc))
+        st.stop()
     except Exception as exc:
-        st.error(f"❌ Error al cargar el modelo: {exc}")
+        st.error(f"❌ Error al generar predicciones: {exc}")
         st.stop()
 
-# Validación de columnas requeridas
-missing_cols = {"customer_id", "recency", "frequency", "monetary"} - set(data.columns)
-if missing_cols:
-    st.error(f"❌ Faltan columnas en el dataset: {', '.join(sorted(missing_cols))}")
-    st.stop()
-
-# Recalcular avg_ticket como en el entrenamiento
-frequency_safe = data["frequency"].replace(0, pd.NA)
-data["avg_ticket"] = (data["monetary"] / frequency_safe).fillna(0)
-
-# Preparar matriz de características
-features = data[REQUIRED_FEATURES].copy()
-
-# Predicción de probabilidad de churn
-try:
-    churn_proba = model.predict_proba(features)[:, 1]
-except Exception as exc:
-    st.error(f"❌ Error al generar predicciones: {exc}")
-    st.stop()
-
-# Anexar probabilidad al dataset original
-data["Churn_Probability"] = churn_proba
+# Dataset con Churn_Probability (compartido por la caché: no modificar)
+data = store.frame
 
 st.divider()
 
@@ -94,37 +182,45 @@ with col_info:
         icon="ℹ️",
     )
 
-# Filtrar clientes en riesgo
-risk_df = data[data["Churn_Probability"] > threshold].copy()
-risk_df.sort_values(by="Churn_Probability", ascending=False, inplace=True)
+# Clientes en riesgo: búsqueda binaria sobre las probabilidades ordenadas y
+# sumas prefijas (no se materializan las filas en riesgo)
+summary = store.risk_summary(threshold)
+page_positions = store.order[:0]
 
 # Métricas principales
 col_a, col_b, col_c = st.columns(3)
 with col_a:
-    st.metric("Total Clientes en Riesgo", f"{len(risk_df):,}")
+    st.metric("Total Clientes en Riesgo", f"{summary['count']:,}")
 with col_b:
-    money_risk = risk_df["monetary"].sum()
-    st.metric("Dinero en Riesgo (Suma Monetary)", f"${money_risk:,.2f}")
+    st.metric("Dinero en Riesgo (Suma Monetary)", f"${summary['monetary']:,.2f}")
 with col_c:
-    avg_prob = risk_df["Churn_Probability"].mean() if not risk_df.empty else 0
-    st.metric("Probabilidad Promedio", f"{avg_prob:.1%}")
+    st.metric("Probabilidad Promedio", f"{summary['avg_probability']:.1%}")
 
 st.divider()
 
 # Tabla de clientes en riesgo
 st.markdown("### 📋 Clientes en Riesgo")
 
-if risk_df.empty:
+if summary["count"] == 0:
     st.warning("No hay clientes por encima del umbral seleccionado.")
 else:
-    table = risk_df[["customer_id", "recency", "monetary", "Churn_Probability"]].rename(
-        columns={
-            "customer_id": "Customer ID",
-            "recency": "Recency",
-            "monetary": "Monetary",
-            "Churn_Probability": "Churn Probability",
-        }
+    # Orden y paginación en el servidor
+    col_sort, col_order, col_size, col_page = st.columns(4)
+    with col_sort:
+        sort_label = st.selectbox("Ordenar por", list(SORT_OPTIONS))
+    with col_order:
+        ascending = st.selectbox("Orden", ["Descendente", "Ascendente"]) == "Ascendente"
+    with col_size:
+        page_size = st.selectbox("Filas por página", PAGE_SIZES, index=1)
+    n_pages = max(1, -(-summary["count"] // page_size))
+    with col_page:
+        page_number = st.number_input("Página", min_value=1, max_value=n_pages, value=1, step=1)
+
+    start = (int(page_number) - 1) * page_size
+    page_positions = store.risk_page(
+        threshold, start, start + page_size, sort_by=SORT_OPTIONS[sort_label], ascending=ascending
     )
+    table = data.iloc[page_positions][list(TABLE_COLUMNS)].rename(columns=TABLE_COLUMNS)
 
     st.dataframe(
         table,
@@ -143,14 +239,19 @@ else:
         },
     )
 
-    csv_bytes = table.to_csv(index=False).encode("utf-8")
-    st.download_button(
-        label="⬇️ Descargar clientes en riesgo",
-        data=csv_bytes,
-        file_name="clientes_en_riesgo.csv",
-        mime="text/csv",
-        use_container_width=True,
-    )
+    st.caption(f"Mostrando {start + 1:,}–{start + len(table):,} de {summary['count']:,} clientes (página {int(page_number)} de {n_pages:,})")
+
+    # Exportación completa bajo demanda (el callable se ejecuta al pulsar el botón)
+    risk_positions = store.positions_above(threshold)
+    for col_export, (storage_format, mime) in zip(st.columns(len(EXPORT_FORMATS)), EXPORT_FORMATS.items()):
+        with col_export:
+            st.download_button(
+                label=f"⬇️ Descargar clientes en riesgo ({storage_format.upper()})",
+                data=lambda storage_format=storage_format: export_risk_table(store, risk_positions, storage_format),
+                file_name=f"clientes_en_riesgo.{storage_format}",
+                mime=mime,
+                use_container_width=True,
+            )
 
 st.divider()
 
@@ -167,25 +268,29 @@ Selecciona un cliente específico para entender qué factores lo hacen estar en
 El gráfico de SHAP (Waterfall) muestra cómo cada característica contribuye a la predicción final.
 """)
 
-if risk_df.empty:
+shap_store = current_shap_store(model_path, DATA_PATH)
+if shap_store is not None:
+    with st.expander(f"📊 Importancia global (SHAP precalculado, {len(shap_store):,} clientes)"):
+        st.bar_chart(shap_store.global_importance().set_index("feature"), horizontal=True)
+
+if summary["count"] == 0:
     st.info("No hay clientes en riesgo para analizar. Ajusta el umbral para ver resultados.")
 else:
-    # Selectbox para elegir cliente
-    customer_list = sorted(risk_df["customer_id"].unique())
+    # Selectbox con los clientes de la página visible de la tabla (en su orden):
+    # el trabajo por rerun queda acotado por el tamaño de página
+    customer_list = store.customer_ids[page_positions].tolist()
     selected_customer_id = st.selectbox(
-        "Selecciona un Cliente ID:",
+        "Selecciona un Cliente ID (página actual de la tabla):",
         customer_list,
-        format_func=lambda x: f"Cliente {x} ({risk_df[risk_df['customer_id']==x]['Churn_Probability'].values[0]:.1%})"
+        format_func=lambda x: f"Cliente {x} ({store.get_probability(x):.1%})"
     )
     
     if selected_customer_id is not None:
         # Obtener datos del cliente seleccionado
-        customer_data = data[data["customer_id"] == selected_customer_id]
-        
-        if not customer_data.empty:
-            customer_idx = data[data["customer_id"] == selected_customer_id].index[0]
-            customer_features = features.iloc[[customer_idx]]
-            customer_churn_prob = churn_proba[customer_idx]
+        if selected_customer_id in store:
+            customer_idx = store.position(selected_customer_id)
+            customer_features = data.iloc[[customer_idx]][REQUIRED_FEATURES]
+            customer_churn_prob = store.get_probability(selected_customer_id)
             
             # Mostrar información del cliente
             col_info1, col_info2, col_info3 = st.columns(3)
@@ -196,6 +301,9 @@ else:
             with col_info3:
                 risk_level = "🔴 Alto" if customer_churn_prob > 0.8 else "🟠 Medio" if customer_churn_prob > 0.6 else "🟡 Bajo"
                 st.metric("Nivel de Riesgo", risk_level)
+            st.caption(
+                f"Ranking de riesgo: #{store.get_rank(selected_customer_id):,} de {len(store):,} clientes"
+            )
             
             st.divider()
             
@@ -203,33 +311,29 @@ else:
             st.markdown("#### Explicación SHAP - Factores de Riesgo")
             
             try:
-                # Crear explainer de SHAP
-                explainer = shap.TreeExplainer(model)
-                shap_values = explainer.shap_values(customer_features)
-                
-                # Obtener los valores base y expected value
-                base_value = explainer.expected_value
-                
-                # Determinar el índice de clase (churn = 1)
-                if isinstance(shap_values, list):
-                    # Para clasificación binaria, usar índice 1 (clase churn)
-                    shap_vals = shap_values[1]
+                if shap_store is not None and selected_customer_id in shap_store:
+                    # Explicación precalculada: búsqueda por customer_id
+                    # (valores y features guardados juntos, de la misma versión)
+                    record = shap_store.get(selected_customer_id)
+                    shap_vals, base_value = record["values"], record["base_value"]
+                    feature_vals = record["data"]
                 else:
-                    shap_vals = shap_values
+                    # Explainer construido una vez por versión del modelo
+                    shap_values, base_value = explain(load_explainer(model_path, model_version), customer_features)
+                    shap_vals = shap_values[0]
+                    feature_vals = customer_features.values[0]
                 
                 # Preparar datos para waterfall plot
                 explanation = shap.Explanation(
-                    values=shap_vals[0] if shap_vals.ndim > 1 else shap_vals,
-                    base_values=base_value if not isinstance(base_value, list) else base_value[1],
-                    data=customer_features.values[0],
+                    values=shap_vals,
+                    base_values=base_value,
+                    data=feature_vals,
                     feature_names=REQUIRED_FEATURES
                 )
                 
-                # Crear y renderizar waterfall plot
-                plt.figure(figsize=(10, 6))
-                shap.plots.waterfall(explanation, show=False)
-                st.pyplot(plt.gcf(), use_container_width=True)
-                plt.clf()
+                # Renderizar waterfall plot (cacheado por cliente, datos y modelo)
+                st.image(render_waterfall(selected_customer_id, data_version, model_version, explanation),
+                         use_container_width=True)
                 
                 st.markdown("""
                 **Interpretación del Gráfico:**
@@ -247,11 +351,19 @@ else:
             st.divider()
             st.markdown("#### Comparación con Clientes Similares")
             
-            comparison_df = risk_df[["customer_id", "recency", "frequency", "monetary", "avg_ticket", "Churn_Probability"]].head(10).copy()
-            comparison_df["Comparación"] = comparison_df["customer_id"].apply(
-                lambda x: "📍 Cliente Seleccionado" if x == selected_customer_id else ""
+            st.caption(
+                f"Los {SIMILAR_CUSTOMERS} clientes más cercanos en recency, frequency, monetary y avg_ticket "
+                "(escaladas), entre todos los clientes."
             )
             
+            similarity_index = load_similarity_index(DATA_PATH, data_version, model_path, model_version)
+            neighbours = similarity_index.similar_to(selected_customer_id, k=SIMILAR_CUSTOMERS)
+            comparison_df = pd.concat([
+                data.iloc[[customer_idx]][COMPARISON_COLUMNS].assign(distance=0.0),
+                neighbours[COMPARISON_COLUMNS + ["distance"]],
+            ])
+            comparison_df["Comparación"] = ["📍 Cliente Seleccionado"] + [""] * len(neighbours)
+            
             st.dataframe(
                 comparison_df,
                 use_container_width=True,
@@ -262,6 +374,7 @@ else:
                     "frequency": st.column_config.NumberColumn(format="%.2f", label="Frequency"),
                     "monetary": st.column_config.NumberColumn(format="$%.2f", label="Monetary"),
                     "avg_ticket": st.column_config.NumberColumn(format="$%.2f", label="Avg Ticket"),
+                    "distance": st.column_config.NumberColumn(format="%.3f", label="Distancia"),
                     "Churn_Probability": st.column_config.ProgressColumn(
                         "Prob. Churn",
                         format="{:.1%}",
@@ -0,0 +1,97 @@
+"""
+Benchmark - Inferencia del modelo de churn
+
+Compara el throughput (filas/s) de XGBClassifier.predict_proba sobre un
+DataFrame con ChurnInferenceEngine (inplace_predict sobre float32, 1 hilo y
+todos los núcleos) y, si tl2cgen está instalado, con el modelo compilado.
+
+Uso (desde la raíz del proyecto):
+    python -m scripts.benchmark_churn_inference [filas_max]
+"""
+
+import os
+import sys
+import time
+import warnings
+
+import numpy as np
+import pandas as pd
+
+from src.models.artifacts import load_xgboost_model
+from src.models.churn_inference import ChurnInferenceEngine
+from src.models.feature_store import build_churn_features
+
+
+MODEL_PATH = 'models/churn_model.pkl'
+ROW_COUNTS = [1_000, 10_000, 100_000, 1_000_000, 10_000_000]
+
+
+def build_features(n_rows):
+    """Features sintéticas de clientes (frequency, monetary, avg_ticket)."""
+    rng = np.random.default_rng(42)
+    customers = pd.DataFrame({
+        'frequency': rng.integers(0, 40, n_rows),
+        'monetary': rng.uniform(0, 5000, n_rows),
+    })
+    return build_churn_features(customers)
+
+
+def rows_per_second(func, X):
+    """Mejor throughput de varias ejecuciones (menos cuanto mayor es la entrada)."""
+    repeats = max(1, min(50, 1_000_000 // len(X)))
+    best = float('inf')
+    for _ in range(repeats):
+        start = time.perf_counter()
+        func(X)
+        best = min(best, time.perf_counter() - start)
+    return len(X) / best
+
+
+def build_methods(model):
+    cores = os.cpu_count() or 1
+    methods = [('predict_proba (actual)', lambda X: model.predict_proba(X)[:, 1])]
+    for nthread in sorted({1, cores}):
+        engine = ChurnInferenceEngine(model, nthread=nthread)
+        methods.append((f"inplace_predict {nthread}h", engine.predict_proba))
+
+    try:
+        engine = ChurnInferenceEngine(model, nthread=cores, backend='tl2cgen')
+        methods.append((f"tl2cgen {cores}h", engine.predict_proba))
+    except ImportError:
+        print("⚠️  tl2cgen no instalado: se omite el backend compilado")
+    return methods
+
+
+def main(max_rows=ROW_COUNTS[-1]):
+    print("=" * 78)
+    print("⏱️  BENCHMARK - INFERENCIA DE CHURN")
+    print("=" * 78)
+
+    model = load_xgboost_model(MODEL_PATH)
+    methods = build_methods(model)
+    row_counts = [n for n in ROW_COUNTS if n <= max_rows]
+
+    header = f"{'Método':<24}" + "".join(f"{n:>13,}" for n in row_counts)
+    print(f"\nFilas/s por tamaño de entrada\n{header}")
+    print("-" * len(header))
+
+    X_by_size = {n: build_features(n) for n in row_counts}
+    reference = {n: model.predict_proba(X)[:, 1] for n, X in X_by_size.items()}
+
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        for name, func in methods:
+            line = f"{name:<24}"
+            max_diff = 0.0
+            for n, X in X_by_size.items():
+                line += f"{rows_per_second(func, X):>13,.0f}"
+                max_diff = max(max_diff, float(np.abs(func(X) - reference[n]).max()))
+            print(f"{line}   (dif. máx. {max_diff:.1e})")
+
+    print("-" * len(header))
+    print(f"  Núcleos disponibles: {os.cpu_count() or 1}")
+    print("=" * 78)
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else ROW_COUNTS[-1])
@@ -0,0 +1,147 @@
+"""
+Benchmark - Servicio de puntuación de churn
+
+Arranca ChurnScoringService en un puerto libre y lanza clientes HTTP
+concurrentes (conexiones persistentes) que piden la probabilidad de un único
+cliente. Informa de las latencias p50/p99 vistas por el cliente, el
+throughput y el tamaño medio de los micro-lotes del servidor, y las compara
+con ChurnPredictor.predict_churn_probability sobre un DataFrame de 1 fila.
+
+Uso (desde la raíz del proyecto):
+    python -m scripts.benchmark_churn_service [peticiones_por_cliente]
+"""
+
+import asyncio
+import json
+import sys
+import time
+import warnings
+
+import numpy as np
+import pandas as pd
+
+from src.models.churn_predictor import ChurnPredictor
+from src.models.churn_service import ChurnScoringService, ChurnServiceClient
+from src.models.feature_store import build_churn_features
+
+
+CONCURRENCY = [1, 8, 64]
+
+
+async def client_worker(port, n_requests, latencies, seed):
+    """Un cliente HTTP/1.1 keep-alive que puntúa clientes aleatorios."""
+    rng = np.random.default_rng(seed)
+    reader, writer = await asyncio.open_connection('127.0.0.1', port)
+    for i in range(n_requests):
+        body = json.dumps({
+            'customer_id': int(seed * n_requests + i),
+            'frequency': int(rng.integers(0, 40)),
+            'monetary': float(rng.uniform(0, 5000)),
+        }).encode()
+        start = time.perf_counter()
+        writer.write(b"POST /score HTTP/1.1\r\nHost: localhost\r\n"
+                     b"Content-Type: application/json\r\n"
+                     + f"Content-Length: {len(body)}\r\n\r\n".encode() + body)
+        await writer.drain()
+
+        headers = await reader.readuntil(b"\r\n\r\n")
+        length = int(headers.lower().split(b"content-length:")[1].split(b"\r\n")[0])
+        json.loads(await reader.readexactly(length))
+        latencies.append(time.perf_counter() - start)
+    writer.close()
+
+
+async def run_load(service, concurrency, n_requests):
+    latencies = []
+    before = service.metrics.snapshot()
+    start = time.perf_counter()
+    await asyncio.gather(*[
+        client_worker(service.port, n_requests, latencies, seed)
+        for seed in range(concurrency)
+    ])
+    elapsed = time.perf_counter() - start
+    after = service.metrics.snapshot()
+
+    batches = after['batches'] - before['batches']
+    p50, p99 = np.percentile(latencies, [50, 99]) * 1000
+    return {
+        'p50_ms': p50,
+        'p99_ms': p99,
+        'requests_per_second': len(latencies) / elapsed,
+        'avg_batch_rows': (after['rows'] - before['rows']) / batches,
+    }
+
+
+def dataframe_latency_ms(predictor, repeats=500):
+    """Latencia p50/p99 de predict_churn_probability con un DataFrame de 1 fila."""
+    customer = pd.DataFrame({'frequency': [5], 'monetary': [320.5]})
+    latencies = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        predictor.predict_churn_probability(build_churn_features(customer))
+        latencies.append(time.perf_counter() - start)
+    return np.percentile(latencies, [50, 99]) * 1000
+
+
+async def benchmark(n_requests):
+    predictor = ChurnPredictor()
+    predictor.load_model()
+    service = ChurnScoringService(predictor=predictor, port=0)
+    await service.start()
+    try:
+        results = [(c, await run_load(service, c, n_requests)) for c in CONCURRENCY]
+    finally:
+        await service.stop()
+    return predictor, service, results
+
+
+def main(n_requests=300):
+    print("=" * 78)
+    print("⏱️  BENCHMARK - SERVICIO DE PUNTUACIÓN DE CHURN")
+    print("=" * 78)
+
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        predictor, service, results = asyncio.run(benchmark(n_requests))
+
+    print(f"\n{'Clientes concurrentes':<22} {'p50 (ms)':>9} {'p99 (ms)':>9} "
+          f"{'Peticiones/s':>13} {'Filas/lote':>11}")
+    print("-" * 78)
+    for concurrency, stats in results:
+        print(f"{concurrency:<22} {stats['p50_ms']:>9.2f} {stats['p99_ms']:>9.2f} "
+              f"{stats['requests_per_second']:>13,.0f} {stats['avg_batch_rows']:>11.1f}")
+
+    p50, p99 = dataframe_latency_ms(predictor)
+    print("-" * 78)
+    print(f"  predict_churn_probability (DataFrame, 1 fila, sin HTTP): "
+          f"p50 {p50:.2f} ms, p99 {p99:.2f} ms")
+    print(f"  Métricas del servidor: {service.metrics.snapshot()}")
+    print("=" * 78)
+
+
+def smoke_test():
+    """Comprueba el servicio con el cliente síncrono (servidor en otro hilo)."""
+    import threading
+
+    loop = asyncio.new_event_loop()
+    service = ChurnScoringService(port=0)
+    loop.run_until_complete(service.start())
+    thread = threading.Thread(target=loop.run_forever, daemon=True)
+    thread.start()
+
+    client = ChurnServiceClient(port=service.port)
+    print(client.score({'customer_id': 1, 'frequency': 5, 'monetary': 320.5}))
+    print(client.score([{'customer_id': 2, 'frequency': 0, 'monetary': 0}]))
+    print(client.metrics())
+    client.close()
+
+    asyncio.run_coroutine_threadsafe(service.stop(), loop).result()
+    loop.call_soon_threadsafe(loop.stop)
+    thread.join()
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == '--smoke':
+        smoke_test()
+    else:
+        main(int(sys.argv[1]) if len(sys.argv) > 1 else 300)
@@ -0,0 +1,72 @@
+"""
+Benchmark - Rutas de predicción de SalesTimeSeriesPredictor
+
+Compara la latencia de predecir con ``make_future_dataframe`` (histórico +
+horizonte, como hacía el código original) frente a la predicción solo de
+fechas futuras, con y sin intervalos de incertidumbre, y frente a recortar
+la caché de pronóstico precalculada.
+
+Uso (desde la raíz del proyecto):
+    python -m scripts.benchmark_forecast [ruta_modelo]
+"""
+
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from src.models.sales_predictor import SalesTimeSeriesPredictor
+
+
+HORIZONS = [1, 30, 90]
+REPEATS = 5
+
+
+def p50_ms(func, repeats=REPEATS):
+    """Mediana en milisegundos de ``repeats`` ejecuciones de ``func``."""
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        func()
+        times.append((time.perf_counter() - start) * 1000)
+    return statistics.median(times)
+
+
+def main(model_path='models/sales_model.pkl'):
+    print("=" * 78)
+    print("⏱️  BENCHMARK - PREDICCIÓN DE VENTAS (PROPHET)")
+    print("=" * 78)
+
+    # Trabajar sobre una copia para no escribir la caché junto al modelo real
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        tmp_model = Path(tmp_dir) / Path(model_path).name
+        shutil.copy(model_path, tmp_model)
+
+        predictor = SalesTimeSeriesPredictor(model_path=str(tmp_model))
+        predictor.load_model()
+        print(f"\nHistórico del modelo: {len(predictor.model.history):,} días\n")
+
+        print(f"{'Días':>6} {'Histórico+futuro':>17} {'Solo futuro':>12} "
+              f"{'Sin incert.':>12} {'Caché':>10}   (ms, p50)")
+        print("-" * 78)
+
+        for days in HORIZONS:
+            full = p50_ms(lambda: predictor._predict_full(days))
+            future = p50_ms(lambda: predictor.predict_future(days))
+            point = p50_ms(lambda: predictor.predict_future(days, include_uncertainty=False))
+            cached = p50_ms(lambda: predictor.get_forecast(days))
+            print(f"{days:>6} {full:>17.1f} {future:>12.1f} {point:>12.1f} {cached:>10.2f}")
+
+        # Las predicciones puntuales coinciden con las de la ruta completa
+        full = predictor._predict_full(max(HORIZONS)).tail(max(HORIZONS)).reset_index(drop=True)
+        point = predictor.predict_future(max(HORIZONS), include_uncertainty=False)
+        max_diff = (full['yhat'] - point['yhat']).abs().max()
+        print("-" * 78)
+        print(f"  Diferencia máxima de yhat (completa vs. solo futuro): {max_diff:.2e}")
+    print("=" * 78)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1] if len(sys.argv) > 1 else 'models/sales_model.pkl')
@@ -0,0 +1,57 @@
+"""
+Benchmark - Generación de transacciones sintéticas
+
+Compara el rendimiento (filas/segundo) del generador original fila a fila
+('loop') con el motor vectorizado de NumPy ('vectorized').
+
+Uso (desde la raíz del proyecto):
+    python -m scripts.benchmark_generate_transactions
+"""
+
+import random
+import time
+
+import numpy as np
+
+from src.data.load_data import generate_transactions
+
+
+LOOP_SIZES = [10_000, 50_000, 200_000]
+VECTORIZED_SIZES = [10_000, 50_000, 200_000, 1_000_000, 5_000_000]
+
+
+def run_benchmark(engine, num_transactions):
+    """Genera ``num_transactions`` filas con el motor indicado y mide el tiempo."""
+    np.random.seed(42)
+    random.seed(42)
+
+    start = time.perf_counter()
+    df = generate_transactions(num_transactions=num_transactions, engine=engine)
+    elapsed = time.perf_counter() - start
+
+    return len(df), elapsed
+
+
+def main():
+    print("=" * 70)
+    print("⏱️  BENCHMARK - GENERACIÓN DE TRANSACCIONES")
+    print("=" * 70)
+    print(f"\n{'Motor':<12} {'Filas':>12} {'Tiempo (s)':>12} {'Filas/s':>14}")
+    print("-" * 70)
+
+    results = {}
+    for engine, sizes in [('loop', LOOP_SIZES), ('vectorized', VECTORIZED_SIZES)]:
+        for size in sizes:
+            rows, elapsed = run_benchmark(engine, size)
+            results[(engine, size)] = elapsed
+            print(f"{engine:<12} {rows:>12,} {elapsed:>12.3f} {rows / elapsed:>14,.0f}")
+
+    print("-" * 70)
+    for size in LOOP_SIZES:
+        speedup = results[('loop', size)] / results[('vectorized', size)]
+        print(f"  Speedup con {size:,} filas: {speedup:.1f}x")
+    print("=" * 70)
+
+
+if __name__ == "__main__":
+    main()
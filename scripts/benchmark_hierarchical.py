@@ -0,0 +1,92 @@
+"""
+Benchmark - Pronóstico jerárquico (un modelo Prophet por serie)
+
+Entrena HierarchicalSalesForecaster sobre ventas sintéticas con 1 proceso y
+con todos los núcleos disponibles, e informa de las series entrenadas por
+segundo, el tamaño del artefacto y la coherencia de los pronósticos
+reconciliados (las series suman el total).
+
+Uso (desde la raíz del proyecto):
+    python -m scripts.benchmark_hierarchical [num_productos_top]
+"""
+
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+from src.data.load_data import generate_products, generate_transactions
+from src.data.preprocessing import enrich_transactions
+from src.models.hierarchical_forecaster import TOTAL_SERIES, HierarchicalSalesForecaster
+
+
+NUM_TRANSACTIONS = 300_000
+
+
+def build_sales(top_products):
+    """Ventas sintéticas enriquecidas con la categoría de cada producto."""
+    np.random.seed(42)
+    products = generate_products().rename(columns={'id': 'product_id'})
+    transactions = generate_transactions(num_transactions=NUM_TRANSACTIONS, random_state=42)
+    sales = enrich_transactions(transactions, products)
+
+    # Nivel producto: solo los productos con más ventas, para acotar el benchmark
+    top = sales.groupby('product_id')['total_amount'].sum().nlargest(top_products).index
+    return sales, sales[sales['product_id'].isin(top)]
+
+
+def run(sales, level, n_jobs, model_path):
+    forecaster = HierarchicalSalesForecaster(model_path=model_path, level=level, n_jobs=n_jobs)
+    stats = forecaster.train(sales)
+    return forecaster, stats
+
+
+def main(top_products=20):
+    print("=" * 78)
+    print("⏱️  BENCHMARK - PRONÓSTICO JERÁRQUICO")
+    print("=" * 78)
+
+    sales, top_sales = build_sales(top_products)
+    cores = os.cpu_count() or 1
+    jobs = sorted({1, cores})
+
+    rows = []
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for level, data in [('category', sales), ('product_id', top_sales)]:
+            for n_jobs in jobs:
+                model_path = str(Path(tmp_dir) / f"{level}_{n_jobs}.zip")
+                forecaster, stats = run(data, level, n_jobs, model_path)
+                size_kb = Path(model_path).stat().st_size / 1024
+                rows.append((level, n_jobs, stats, size_kb))
+
+            # Coherencia y carga bajo demanda desde el artefacto
+            loaded = HierarchicalSalesForecaster(model_path=model_path)
+            loaded.load_model()
+            start = time.perf_counter()
+            forecast = loaded.forecast(days=30, reconcile='proportional')
+            forecast_s = time.perf_counter() - start
+            bottom = forecast.drop(columns=TOTAL_SERIES).sum(axis=1)
+            gap = (forecast[TOTAL_SERIES] - bottom).abs().max()
+            rows.append((level, None, {'forecast_s': forecast_s, 'gap': gap}, None))
+
+    print("\n" + "=" * 78)
+    print(f"{'Nivel':<12} {'Procesos':>9} {'Series':>7} {'Tiempo (s)':>11} "
+          f"{'Series/s':>9} {'Artefacto (KB)':>15}")
+    print("-" * 78)
+    for level, n_jobs, stats, size_kb in rows:
+        if n_jobs is None:
+            print(f"{level:<12} pronóstico 30 días: {stats['forecast_s']:.2f}s, "
+                  f"|total - suma series| máx = {stats['gap']:.2e}")
+            continue
+        print(f"{level:<12} {n_jobs:>9} {stats['series']:>7} {stats['seconds']:>11.2f} "
+              f"{stats['series_per_second']:>9.2f} {size_kb:>15.1f}")
+    print("-" * 78)
+    print(f"  Núcleos disponibles: {cores}")
+    print("=" * 78)
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 20)
@@ -0,0 +1,84 @@
+"""
+Benchmark - Formato de artefactos de modelos (.pkl vs .zip versionado)
+
+Convierte los modelos pickle de ventas (Prophet) y churn (XGBoost) al formato
+de src.models.artifacts y compara el tamaño en disco, el tiempo de carga y
+que las predicciones coincidan.
+
+Uso (desde la raíz del proyecto):
+    python -m scripts.benchmark_model_artifacts
+"""
+
+import statistics
+import tempfile
+import time
+import warnings
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from src.models.artifacts import (
+    load_prophet_model,
+    load_xgboost_model,
+    save_prophet_model,
+    save_xgboost_model,
+)
+
+
+REPEATS = 20
+MODELS = [
+    ('ventas (Prophet)', 'models/sales_model.pkl', load_prophet_model, save_prophet_model),
+    ('churn (XGBoost)', 'models/churn_model.pkl', load_xgboost_model, save_xgboost_model),
+]
+
+
+def p50_ms(func, repeats=REPEATS):
+    """Mediana en milisegundos de ``repeats`` ejecuciones de ``func``."""
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        func()
+        times.append((time.perf_counter() - start) * 1000)
+    return statistics.median(times)
+
+
+def max_prediction_diff(name, legacy, model):
+    """Diferencia máxima entre las predicciones de ambos formatos."""
+    if 'Prophet' in name:
+        future = legacy.make_future_dataframe(periods=30)
+        legacy.uncertainty_samples = model.uncertainty_samples = 0
+        return np.abs(legacy.predict(future)['yhat'] - model.predict(future)['yhat']).max()
+
+    rng = np.random.default_rng(42)
+    X = pd.DataFrame({
+        'frequency': rng.integers(1, 30, 1000),
+        'monetary': rng.uniform(10, 5000, 1000),
+    })
+    X['avg_ticket'] = X['monetary'] / X['frequency']
+    return np.abs(legacy.predict_proba(X) - model.predict_proba(X)).max()
+
+
+def main():
+    print("=" * 78)
+    print("⏱️  BENCHMARK - ARTEFACTOS DE MODELOS")
+    print("=" * 78)
+    print(f"\n{'Modelo':<18} {'Formato':<8} {'Tamaño (KB)':>12} {'Carga p50 (ms)':>15} {'Dif. pred.':>12}")
+    print("-" * 78)
+
+    with tempfile.TemporaryDirectory() as tmp_dir, warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        for name, pkl_path, load, save in MODELS:
+            legacy = load(pkl_path)
+            zip_path = save(legacy, Path(tmp_dir) / Path(pkl_path).with_suffix('.zip').name)
+
+            for fmt, path in [('pkl', Path(pkl_path)), ('zip', zip_path)]:
+                load_ms = p50_ms(lambda: load(path))
+                diff = max_prediction_diff(name, load(pkl_path), load(path)) if fmt == 'zip' else 0.0
+                size_kb = path.stat().st_size / 1024
+                print(f"{name:<18} {fmt:<8} {size_kb:>12.1f} {load_ms:>15.2f} {diff:>12.2e}")
+    print("=" * 78)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""
+Benchmark - Carga del modelo de ventas
+
+Compara el coste de abrir y deserializar models/sales_model.pkl en cada
+petición (comportamiento original de la página de Ventas) con la caché de
+proceso de src.utils.model_cache, y lo pone en contexto con el tiempo de
+predicción.
+
+Uso (desde la raíz del proyecto):
+    python -m scripts.benchmark_model_loading [ruta_modelo]
+"""
+
+import pickle
+import sys
+import time
+
+import numpy as np
+
+from src.utils.model_cache import clear_model_cache, load_model_cached
+
+
+REPEATS = 20
+
+
+def measure(func, repeats=REPEATS):
+    """Devuelve la lista de tiempos (ms) de ``repeats`` ejecuciones."""
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        func()
+        times.append((time.perf_counter() - start) * 1000)
+    return np.array(times)
+
+
+def main(model_path='models/sales_model.pkl'):
+    print("=" * 70)
+    print("⏱️  BENCHMARK - CARGA DEL MODELO DE VENTAS")
+    print("=" * 70)
+
+    def load_uncached():
+        with open(model_path, 'rb') as f:
+            return pickle.load(f)
+
+    uncached = measure(load_uncached)
+
+    clear_model_cache()
+    start = time.perf_counter()
+    model = load_model_cached(model_path)
+    first_load = (time.perf_counter() - start) * 1000
+    cached = measure(lambda: load_model_cached(model_path))
+
+    future = model.make_future_dataframe(periods=30)
+    predict = measure(lambda: model.predict(future), repeats=3)
+
+    print(f"\nModelo: {model_path}")
+    print(f"  Sin caché (pickle.load por petición): p50 {np.median(uncached):8.2f} ms")
+    print(f"  Con caché, primera carga del proceso:     {first_load:8.2f} ms")
+    print(f"  Con caché, peticiones siguientes:    p50 {np.median(cached):8.3f} ms")
+    print(f"  Predicción (30 días):                p50 {np.median(predict):8.2f} ms")
+    print(f"\n  Ahorro por petición: {np.median(uncached) - np.median(cached):.2f} ms "
+          f"({np.median(uncached) / np.median(cached):,.0f}x más rápido)")
+    print("=" * 70)
+
+
+if __name__ == "__main__":
+    main(*sys.argv[1:])
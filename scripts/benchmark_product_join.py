@@ -0,0 +1,93 @@
+"""
+Benchmark - Enriquecimiento de transacciones con productos
+
+Compara el merge general contra la tabla de productos (implementación
+original) con el gather directo sobre un ProductLookup denso indexado por
+product_id, tanto construyendo la tabla en cada llamada como reutilizando
+una precalculada. Verifica además que ambos resultados coinciden.
+
+Uso (desde la raíz del proyecto):
+    python -m scripts.benchmark_product_join
+"""
+
+import time
+
+import numpy as np
+import pandas as pd
+
+from src.data.load_data import generate_products, generate_transactions
+from src.data.preprocessing import DTYPE_POLICY, ProductLookup, apply_dtype_policy
+
+
+SIZES = [200_000, 1_000_000, 5_000_000]
+
+
+def merge_join(transactions, products):
+    """Implementación original: merge left + margen con una copia del frame."""
+    sales = transactions.merge(
+        products[['product_id', 'category', 'price', 'cost']],
+        on='product_id',
+        how='left'
+    )
+    sales['margin'] = (sales['price'] - sales['cost']) * sales['quantity']
+    return sales
+
+
+def lookup_join(transactions, lookup):
+    """Gather sobre ProductLookup y margen en el sitio."""
+    sales = transactions
+    lookup.enrich(sales)
+    margin = np.subtract(sales['price'].to_numpy(), sales['cost'].to_numpy())
+    np.multiply(margin, sales['quantity'].to_numpy(), out=margin)
+    sales['margin'] = margin
+    return sales
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+
+def main():
+    print("=" * 78)
+    print("⏱️  BENCHMARK - JOIN DE PRODUCTOS")
+    print("=" * 78)
+
+    np.random.seed(42)
+    products = generate_products(num_products=5000).rename(columns={'id': 'product_id'})
+    apply_dtype_policy(products, DTYPE_POLICY)
+
+    print(f"\n{'Transacciones':>14} {'Merge (s)':>10} {'Lookup+build (s)':>17} "
+          f"{'Lookup (s)':>11} {'Speedup':>9} {'Idéntico':>9}")
+    print("-" * 78)
+
+    for size in SIZES:
+        transactions = apply_dtype_policy(
+            generate_transactions(num_transactions=size, random_state=42), DTYPE_POLICY
+        )
+        # Algunos ids inexistentes para comprobar la semántica de merge left
+        transactions.loc[transactions.index[:10], 'product_id'] = 999_999
+
+        merged, merge_time = timed(merge_join, transactions.copy(), products)
+        _, build_time = timed(
+            lambda sales: lookup_join(sales, ProductLookup(products)), transactions.copy()
+        )
+
+        lookup = ProductLookup(products)
+        gathered, lookup_time = timed(lookup_join, transactions.copy(), lookup)
+
+        try:
+            pd.testing.assert_frame_equal(merged, gathered.reset_index(drop=True))
+            identical = "sí"
+        except AssertionError:
+            identical = "NO"
+
+        print(f"{size:>14,} {merge_time:>10.3f} {build_time:>17.3f} {lookup_time:>11.3f} "
+              f"{merge_time / lookup_time:>8.1f}x {identical:>9}")
+
+    print("=" * 78)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""
+Benchmark - Cálculo de características RFM
+
+Compara la agregación original (lambda por cliente dentro de groupby().agg)
+con el motor vectorizado de src.data.preprocessing.compute_rfm, escalando el
+número de clientes y de transacciones, y verifica que los resultados son
+idénticos.
+
+Uso (desde la raíz del proyecto):
+    python -m scripts.benchmark_rfm
+"""
+
+import time
+
+import pandas as pd
+
+from src.data.load_data import generate_transactions
+from src.data.preprocessing import compute_rfm
+
+
+# (clientes, transacciones)
+SCENARIOS = [
+    (10_000, 50_000),
+    (50_000, 200_000),
+    (200_000, 1_000_000),
+    (1_000_000, 4_000_000),
+]
+
+
+def legacy_rfm(sales):
+    """Implementación original basada en una lambda por cliente."""
+    max_date = sales['date'].max()
+    rfm = sales.groupby('customer_id').agg({
+        'date': lambda x: (max_date - x.max()).days,
+        'product_id': 'count',
+        'total_amount': 'sum'
+    }).reset_index()
+    rfm.columns = ['customer_id', 'recency', 'frequency', 'monetary']
+    return rfm
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+
+def main():
+    print("=" * 78)
+    print("⏱️  BENCHMARK - CARACTERÍSTICAS RFM")
+    print("=" * 78)
+    print(f"\n{'Clientes':>10} {'Transacciones':>14} {'Lambda (s)':>11} "
+          f"{'Vectorizado (s)':>16} {'Speedup':>9} {'Idéntico':>9}")
+    print("-" * 78)
+
+    for num_customers, num_transactions in SCENARIOS:
+        sales = generate_transactions(
+            num_transactions=num_transactions,
+            num_customers=num_customers,
+            random_state=42
+        )
+
+        legacy, legacy_time = timed(legacy_rfm, sales)
+        fast, fast_time = timed(compute_rfm, sales)
+
+        try:
+            pd.testing.assert_frame_equal(legacy, fast)
+            identical = "sí"
+        except AssertionError:
+            identical = "NO"
+
+        print(f"{num_customers:>10,} {num_transactions:>14,} {legacy_time:>11.3f} "
+              f"{fast_time:>16.3f} {legacy_time / fast_time:>8.1f}x {identical:>9}")
+
+    print("=" * 78)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""
+Benchmark - Búsqueda de clientes similares
+
+Construye SimilarCustomerIndex (KD-tree) sobre bases sintéticas de clientes
+y mide el tiempo de construcción y la latencia p50/p99 de similar_to(),
+comparada con un top-k exacto vectorizado (distancias a todos los clientes
++ argpartition). Comprueba que ambos devuelven las mismas distancias.
+
+Uso (desde la raíz del proyecto):
+    python -m scripts.benchmark_similar_customers [clientes_max]
+"""
+
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from src.models.feature_store import CustomerFeatureStore
+from src.models.similar_customers import SimilarCustomerIndex
+
+
+CUSTOMER_COUNTS = [100_000, 1_000_000, 10_000_000]
+K = 10
+QUERIES = 200
+BRUTE_FORCE_QUERIES = 5
+
+
+def build_customers(n_customers):
+    """Clientes sintéticos con recency, frequency y monetary."""
+    rng = np.random.default_rng(42)
+    frequency = rng.poisson(4, n_customers) + 1
+    return pd.DataFrame({
+        'customer_id': np.arange(1, n_customers + 1),
+        'recency': rng.integers(0, 1500, n_customers),
+        'frequency': frequency,
+        'monetary': frequency * rng.lognormal(5, 1, n_customers),
+    })
+
+
+def brute_force_distances(scaled, position, k):
+    """Top-k exacto: distancias a todos los clientes y argpartition."""
+    distances = np.sqrt(((scaled - scaled[position]) ** 2).sum(axis=1))
+    distances[position] = np.inf
+    nearest = np.argpartition(distances, k)[:k]
+    return np.sort(distances[nearest])
+
+
+def main(max_customers=CUSTOMER_COUNTS[-1]):
+    print("=" * 78)
+    print("⏱️  BENCHMARK - CLIENTES SIMILARES (k = 10)")
+    print("=" * 78)
+    print(f"\n{'Clientes':>12} {'Construcción (s)':>17} {'KD-tree p50 (ms)':>17} "
+          f"{'KD-tree p99 (ms)':>17} {'Exacto (ms)':>12}")
+    print("-" * 78)
+
+    rng = np.random.default_rng(0)
+    for n_customers in [n for n in CUSTOMER_COUNTS if n <= max_customers]:
+        store = CustomerFeatureStore(build_customers(n_customers))
+
+        start = time.perf_counter()
+        index = SimilarCustomerIndex(store)
+        build_s = time.perf_counter() - start
+
+        latencies = []
+        for customer_id in rng.choice(store.customer_ids, QUERIES, replace=False):
+            start = time.perf_counter()
+            index.similar_to(customer_id, k=K)
+            latencies.append(time.perf_counter() - start)
+        p50, p99 = np.percentile(latencies, [50, 99]) * 1000
+
+        # Top-k exacto sobre la misma matriz escalada (y comprobación de resultados)
+        scaled = index.scale_features(store.frame)
+        brute_times = []
+        for position in rng.choice(len(store), BRUTE_FORCE_QUERIES, replace=False):
+            start = time.perf_counter()
+            expected = brute_force_distances(scaled, position, K)
+            brute_times.append(time.perf_counter() - start)
+            found = index.similar_to(store.customer_ids[position], k=K)['distance'].to_numpy()
+            assert np.allclose(found, expected), "KD-tree y top-k exacto no coinciden"
+
+        print(f"{n_customers:>12,} {build_s:>17.2f} {p50:>17.2f} {p99:>17.2f} "
+              f"{np.median(brute_times) * 1000:>12.1f}")
+
+    print("=" * 78)
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else CUSTOMER_COUNTS[-1])
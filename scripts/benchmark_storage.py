@@ -0,0 +1,71 @@
+"""
+Benchmark - Formatos de almacenamiento (CSV vs Parquet vs Feather)
+
+Mide tiempo de escritura, tiempo de lectura completa, tiempo de lectura con
+proyección de columnas (las que usa SalesTimeSeriesPredictor.train) y tamaño
+en disco para una tabla de transacciones sintéticas.
+
+Uso (desde la raíz del proyecto):
+    python -m scripts.benchmark_storage [num_transacciones]
+"""
+
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from src.data.load_data import generate_transactions
+from src.data.storage import available_formats, read_table, table_path, write_table
+
+
+PROJECTED_COLUMNS = ['date', 'total_amount', 'quantity']
+
+
+def timed(func, *args, **kwargs):
+    """Ejecuta ``func`` y devuelve (resultado, segundos)."""
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+
+def main(num_transactions=1_000_000):
+    print("=" * 78)
+    print("⏱️  BENCHMARK - FORMATOS DE ALMACENAMIENTO")
+    print("=" * 78)
+
+    df = generate_transactions(num_transactions=num_transactions, random_state=42)
+    print(f"\nTabla de prueba: {len(df):,} transacciones, {len(df.columns)} columnas\n")
+
+    print(f"{'Formato':<10} {'Escritura (s)':>14} {'Lectura (s)':>12} "
+          f"{'Proyección (s)':>15} {'Tamaño (MB)':>12}")
+    print("-" * 78)
+
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for fmt in available_formats():
+            path = table_path(tmp_dir, 'transactions', fmt)
+
+            _, write_time = timed(write_table, df, path)
+            _, read_time = timed(read_table, path, parse_dates=['date'])
+            _, projected_time = timed(read_table, path, columns=PROJECTED_COLUMNS,
+                                      parse_dates=['date'])
+            size_mb = Path(path).stat().st_size / 1024 ** 2
+
+            results[fmt] = (write_time, read_time, projected_time, size_mb)
+            print(f"{fmt:<10} {write_time:>14.3f} {read_time:>12.3f} "
+                  f"{projected_time:>15.3f} {size_mb:>12.1f}")
+
+    print("-" * 78)
+    csv_write, csv_read, csv_projected, csv_size = results['csv']
+    for fmt, (write_time, read_time, projected_time, size_mb) in results.items():
+        if fmt == 'csv':
+            continue
+        print(f"  {fmt}: escritura {csv_write / write_time:.1f}x, "
+              f"lectura {csv_read / read_time:.1f}x, "
+              f"proyección {csv_projected / projected_time:.1f}x, "
+              f"tamaño {csv_size / size_mb:.1f}x menor que CSV")
+    print("=" * 78)
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
@@ -3,8 +3,23 @@
 import pandas as pd
 import numpy as np
 import random
+import argparse
+import sys
 from pathlib import Path
 from datetime import datetime, timedelta
+from typing import Iterable, Iterator, List, Optional
+
+# Allow direct execution: python src/data/load_data.py
+if __package__ in (None, ''):
+    sys.path.append(str(Path(__file__).resolve().parents[2]))
+
+from src.data.storage import (
+    TableWriter,
+    available_formats,
+    read_table,
+    table_path,
+    write_table,
+)
 
 
 def generate_products(num_products: int = 5000) -> pd.DataFrame:
@@ -56,25 +71,96 @@ def generate_customers(num_customers: int = 50000) -> pd.DataFrame:
     return df
 
 
-def generate_transactions(
-    num_transactions: int = 200000,
-    num_customers: int = 50000,
-    num_products: int = 5000,
-    start_date: str = '2022-01-01'
+TRANSACTIONS_END_DATE = '2026-01-09'
+SUMMER_MONTHS = (6, 7, 8)
+JARDIN_PRODUCT_RANGE = (1000, 2000)
+
+
+def _months_since(dates: np.ndarray, start: np.datetime64) -> np.ndarray:
+    """Return whole calendar months elapsed between ``start`` and each date."""
+    return (
+        dates.astype('datetime64[M]') - start.astype('datetime64[M]')
+    ).astype(np.int64)
+
+
+def _draw_transaction_rows(
+    day_offsets: np.ndarray,
+    start: np.datetime64,
+    num_customers: int,
+    num_products: int,
+    rng=None
 ) -> pd.DataFrame:
-    """Generate synthetic transaction data with seasonality and trend.
+    """Draw every transaction attribute for a batch of day offsets at once.
+    
+    Mirrors the per-row logic of the original loop (trend acceptance, summer
+    Jardín override, quantity and ±10% price variation) using whole-array
+    draws, so the cost per row is a handful of NumPy operations.
     
     Args:
-        num_transactions: Number of transactions to generate
-        num_customers: Number of customers (for reference)
-        num_products: Number of products (for reference)
-        start_date: Start date for transactions
+        day_offsets: Days elapsed since ``start`` for each candidate row
+        start: First day of the generated period
+        num_customers: Number of customers to sample from
+        num_products: Number of products to sample from
+        rng: ``np.random.RandomState``; defaults to the global NumPy state
         
     Returns:
-        DataFrame with transaction data
+        DataFrame with the accepted transactions (unsorted)
+    """
+    if rng is None:
+        rng = np.random
+    
+    n = len(day_offsets)
+    dates = start + day_offsets.astype('timedelta64[D]')
+    
+    # Trend: 1% monthly cumulative growth applied as acceptance probability
+    trend_multiplier = 1.01 ** _months_since(dates, start)
+    accepted = rng.random_sample(n) < trend_multiplier
+    
+    customer_ids = rng.randint(1, num_customers + 1, n)
+    product_ids = rng.randint(1, num_products + 1, n)
+    
+    # Higher chance of selecting Jardín in summer (ids 1000-2000 are Jardín)
+    month = dates.astype('datetime64[M]').astype(np.int64) % 12 + 1
+    is_summer = np.isin(month, SUMMER_MONTHS)
+    jardin = is_summer & (rng.random_sample(n) < 0.5)
+    jardin_low, jardin_high = JARDIN_PRODUCT_RANGE
+    product_ids[jardin] = rng.randint(
+        jardin_low, min(jardin_high, num_products) + 1, int(jardin.sum())
+    )
+    
+    quantities = rng.randint(1, 11, n)
+    
+    # Simulate price variation (±10%) around an average price of 50
+    price_variation = 50.0 * rng.uniform(0.9, 1.1, n)
+    total_amounts = np.round(quantities * price_variation, 2)
+    
+    df = pd.DataFrame({
+        'date': dates,
+        'customer_id': customer_ids,
+        'product_id': product_ids,
+        'quantity': quantities,
+        'total_amount': total_amounts
+    })
+    
+    if not accepted.all():
+        df = df[accepted]
+    
+    return df
+
+
+def _generate_transactions_loop(
+    num_transactions: int,
+    num_customers: int,
+    num_products: int,
+    start_date: str
+) -> pd.DataFrame:
+    """Legacy row-by-row generator driven by the ``random`` module.
+    
+    Kept to reproduce datasets generated before the vectorized engine
+    (``main`` seeds ``random`` with 42 as it always did).
     """
     start = pd.to_datetime(start_date)
-    end = pd.to_datetime('2026-01-09')
+    end = pd.to_datetime(TRANSACTIONS_END_DATE)
     total_days = (end - start).days
     
     transactions = []
@@ -136,6 +222,131 @@ def generate_transactions(
     return df
 
 
+def generate_transactions(
+    num_transactions: int = 200000,
+    num_customers: int = 50000,
+    num_products: int = 5000,
+    start_date: str = '2022-01-01',
+    engine: str = 'vectorized',
+    random_state: int = None
+) -> pd.DataFrame:
+    """Generate synthetic transaction data with seasonality and trend.
+    
+    Args:
+        num_transactions: Number of transactions to generate
+        num_customers: Number of customers (for reference)
+        num_products: Number of products (for reference)
+        start_date: Start date for transactions
+        engine: 'vectorized' (NumPy batched, default) or 'loop' (legacy
+            row-by-row generator, reproduces previously generated files)
+        random_state: Seed for the vectorized engine; when None the global
+            NumPy random state is used (seeded by ``main``)
+        
+    Returns:
+        DataFrame with transaction data
+    """
+    if engine == 'loop':
+        return _generate_transactions_loop(
+            num_transactions, num_customers, num_products, start_date
+        )
+    if engine != 'vectorized':
+        raise ValueError(f"Unknown engine '{engine}'. Use 'vectorized' or 'loop'.")
+    
+    rng = np.random.RandomState(random_state) if random_state is not None else np.random
+    
+    start = np.datetime64(start_date, 'D')
+    total_days = int((np.datetime64(TRANSACTIONS_END_DATE, 'D') - start).astype(np.int64))
+    
+    day_offsets = rng.randint(0, total_days + 1, num_transactions)
+    
+    df = _draw_transaction_rows(day_offsets, start, num_customers, num_products, rng)
+    df = df.sort_values('date', kind='stable').reset_index(drop=True)
+    
+    return df
+
+
+def generate_transaction_chunks(
+    num_transactions: int = 200000,
+    chunk_size: int = 1_000_000,
+    num_customers: int = 50000,
+    num_products: int = 5000,
+    start_date: str = '2022-01-01',
+    random_state: int = 42
+) -> Iterator[pd.DataFrame]:
+    """Stream synthetic transactions as fixed-size, date-ordered chunks.
+    
+    The number of transactions per day is drawn up front (a multinomial over
+    the period, equivalent to sampling each row's day uniformly), so rows can
+    be emitted in date order without ever holding the full table in memory.
+    Peak memory is bounded by ``chunk_size`` and the output is deterministic
+    for a given ``random_state`` and ``chunk_size``.
+    
+    Args:
+        num_transactions: Total number of candidate transactions
+        chunk_size: Rows per yielded chunk (the last one may be smaller)
+        num_customers: Number of customers (for reference)
+        num_products: Number of products (for reference)
+        start_date: Start date for transactions
+        random_state: Seed for the chunk generator
+        
+    Yields:
+        DataFrames with the same columns as ``generate_transactions``
+    """
+    if chunk_size <= 0:
+        raise ValueError("chunk_size must be a positive integer")
+    
+    rng = np.random.RandomState(random_state)
+    
+    start = np.datetime64(start_date, 'D')
+    num_days = int((np.datetime64(TRANSACTIONS_END_DATE, 'D') - start).astype(np.int64)) + 1
+    
+    daily_counts = rng.multinomial(num_transactions, np.full(num_days, 1.0 / num_days))
+    cumulative_counts = np.cumsum(daily_counts)
+    
+    for chunk_start in range(0, num_transactions, chunk_size):
+        chunk_end = min(chunk_start + chunk_size, num_transactions)
+        day_offsets = np.searchsorted(
+            cumulative_counts, np.arange(chunk_start, chunk_end), side='right'
+        )
+        
+        df = _draw_transaction_rows(day_offsets, start, num_customers, num_products, rng)
+        df.index = pd.RangeIndex(chunk_start, chunk_start + len(df))
+        
+        yield df
+
+
+def save_transaction_chunks(chunks: Iterable[pd.DataFrame], filepath) -> dict:
+    """Append transaction chunks to a file, one chunk at a time.
+    
+    Args:
+        chunks: Iterable of transaction DataFrames
+        filepath: Destination file (overwritten); its suffix selects the
+            storage format (.csv, .parquet or .feather)
+        
+    Returns:
+        Dictionary with running summary statistics of the written rows
+    """
+    stats = {'rows': 0, 'min_date': None, 'max_date': None,
+             'total_amount': 0.0, 'quantity': 0}
+    
+    with TableWriter(filepath) as writer:
+        for chunk in chunks:
+            writer.write(chunk)
+            
+            if chunk.empty:
+                continue
+            stats['rows'] += len(chunk)
+            stats['total_amount'] += float(chunk['total_amount'].sum())
+            stats['quantity'] += int(chunk['quantity'].sum())
+            chunk_min, chunk_max = chunk['date'].min(), chunk['date'].max()
+            if stats['min_date'] is None or chunk_min < stats['min_date']:
+                stats['min_date'] = chunk_min
+            if stats['max_date'] is None or chunk_max > stats['max_date']:
+                stats['max_date'] = chunk_max
+    
+    return stats
+
+
 def load_csv(filepath: str) -> pd.DataFrame:
     """Load CSV file into DataFrame.
     
@@ -148,11 +359,32 @@ def load_csv(filepath: str) -> pd.DataFrame:
     return pd.read_csv(filepath)
 
 
-def load_data(data_dir: str = None) -> tuple:
+def load_table(
+    filepath: str,
+    columns: Optional[List[str]] = None,
+    parse_dates: Optional[List[str]] = None
+) -> pd.DataFrame:
+    """Load a CSV, Parquet or Feather file into DataFrame.
+    
+    Args:
+        filepath: Path to the file (a sibling in another format is used
+            when this one does not exist)
+        columns: Columns to load (all when None)
+        parse_dates: Columns to return as datetime64
+        
+    Returns:
+        DataFrame with the loaded data
+    """
+    return read_table(filepath, columns=columns, parse_dates=parse_dates)
+
+
+def load_data(data_dir: str = None, storage_format: str = 'csv') -> tuple:
     """Load data from raw data directory.
     
     Args:
         data_dir: Path to data directory
+        storage_format: Preferred format ('csv', 'parquet' or 'feather');
+            files stored in another format are still found
         
     Returns:
         Tuple of DataFrames (products, customers, transactions)
@@ -160,18 +392,41 @@ def load_data(data_dir: str = None) -> tuple:
     if data_dir is None:
         data_dir = Path(__file__).parent.parent.parent / "data" / "raw"
     
-    products = load_csv(str(Path(data_dir) / 'products.csv'))
-    customers = load_csv(str(Path(data_dir) / 'customers.csv'))
-    transactions = load_csv(str(Path(data_dir) / 'transactions.csv'))
+    products = load_table(table_path(data_dir, 'products', storage_format))
+    customers = load_table(table_path(data_dir, 'customers', storage_format))
+    transactions = load_table(
+        table_path(data_dir, 'transactions', storage_format),
+        parse_dates=['date']
+    )
     
     return products, customers, transactions
 
 
-def main():
+def parse_args(argv=None) -> argparse.Namespace:
+    """Parse command line options for the synthetic data generator."""
+    parser = argparse.ArgumentParser(description="Generate synthetic retail data.")
+    parser.add_argument('--num-products', type=int, default=5000)
+    parser.add_argument('--num-customers', type=int, default=50000)
+    parser.add_argument('--num-transactions', type=int, default=200000)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--engine', choices=['vectorized', 'loop'], default='vectorized',
+                        help="Transaction generator used when not streaming")
+    parser.add_argument('--stream', action='store_true',
+                        help="Write transactions in fixed-size chunks with bounded memory")
+    parser.add_argument('--chunk-size', type=int, default=1_000_000,
+                        help="Rows per chunk in streaming mode")
+    parser.add_argument('--format', dest='storage_format', choices=available_formats(),
+                        default='csv', help="Storage format of the generated files")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
     """Main function to generate and save synthetic retail data."""
+    args = parse_args(argv)
+    
     # Set random seeds for reproducibility
-    np.random.seed(42)
-    random.seed(42)
+    np.random.seed(args.seed)
+    random.seed(args.seed)
     
     # Define data directory
     data_dir = Path(__file__).parent.parent.parent / "data" / "raw"
@@ -179,23 +434,42 @@ def main():
     
     # Generate datasets
     print("Generating products data...")
-    products = generate_products(num_products=5000)
-    products.to_csv(data_dir / 'products.csv', index=False)
+    products = generate_products(num_products=args.num_products)
+    write_table(products, table_path(data_dir, 'products', args.storage_format))
     print(f"  ✓ {len(products):,} productos guardados")
     
     print("Generating customers data...")
-    customers = generate_customers(num_customers=50000)
-    customers.to_csv(data_dir / 'customers.csv', index=False)
+    customers = generate_customers(num_customers=args.num_customers)
+    write_table(customers, table_path(data_dir, 'customers', args.storage_format))
     print(f"  ✓ {len(customers):,} clientes guardados")
     
     print("Generating transactions data (con estacionalidad y tendencia)...")
-    transactions = generate_transactions(
-        num_transactions=200000,
-        num_customers=50000,
-        num_products=5000
-    )
-    transactions.to_csv(data_dir / 'transactions.csv', index=False)
-    print(f"  ✓ {len(transactions):,} transacciones guardadas")
+    transactions_path = table_path(data_dir, 'transactions', args.storage_format)
+    if args.stream:
+        chunks = generate_transaction_chunks(
+            num_transactions=args.num_transactions,
+            chunk_size=args.chunk_size,
+            num_customers=args.num_customers,
+            num_products=args.num_products,
+            random_state=args.seed
+        )
+        stats = save_transaction_chunks(chunks, transactions_path)
+    else:
+        transactions = generate_transactions(
+            num_transactions=args.num_transactions,
+            num_customers=args.num_customers,
+            num_products=args.num_products,
+            engine=args.engine
+        )
+        write_table(transactions, transactions_path)
+        stats = {
+            'rows': len(transactions),
+            'min_date': transactions['date'].min(),
+            'max_date': transactions['date'].max(),
+            'total_amount': transactions['total_amount'].sum(),
+            'quantity': transactions['quantity'].sum()
+        }
+    print(f"  ✓ {stats['rows']:,} transacciones guardadas")
     
     # Summary statistics
     print("\n" + "="*60)
@@ -210,10 +484,11 @@ def main():
     for seg, count in customers['segment'].value_counts().items():
         print(f"    - {seg}: {count:,} ({count/len(customers)*100:.1f}%)")
     
-    print(f"\nTransacciones: {len(transactions):,}")
-    print(f"  Período: {transactions['date'].min().date()} a {transactions['date'].max().date()}")
-    print(f"  Monto promedio: ${transactions['total_amount'].mean():.2f}")
-    print(f"  Cantidad promedio: {transactions['quantity'].mean():.1f} unidades")
+    print(f"\nTransacciones: {stats['rows']:,}")
+    if stats['rows']:
+        print(f"  Período: {stats['min_date'].date()} a {stats['max_date'].date()}")
+        print(f"  Monto promedio: ${stats['total_amount'] / stats['rows']:.2f}")
+        print(f"  Cantidad promedio: {stats['quantity'] / stats['rows']:.1f} unidades")
     
     print("\n" + "="*60)
     print("✅ Datos generados exitosamente en data/raw/")
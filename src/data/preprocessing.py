@@ -1,45 +1,549 @@
 """Module for data preprocessing and feature engineering."""
 
+import os
+import sys
+import argparse
+from concurrent.futures import ProcessPoolExecutor
 import pandas as pd
 import numpy as np
 from pathlib import Path
 
+# Permitir la ejecución directa: python src/data/preprocessing.py
+if __package__ in (None, ''):
+    sys.path.append(str(Path(__file__).resolve().parents[2]))
+
+from src.data.storage import (
+    TableWriter,
+    append_table,
+    available_formats,
+    iter_table,
+    read_table,
+    resolve_table_path,
+    table_path,
+    write_table,
+)
+
+
+# Columnas que lee cada etapa (proyección al cargar)
+PRODUCT_COLUMNS = ['id', 'category', 'price', 'cost']
+TRANSACTION_COLUMNS = ['date', 'customer_id', 'product_id', 'quantity', 'total_amount']
+
+# Modo fuera de memoria: filas por chunk y cada cuántos chunks se compactan los agregados RFM
+DEFAULT_CHUNKSIZE = 1_000_000
+STATE_MERGE_EVERY = 16
+
+# Particiones por cliente: por debajo de este número, una máscara por partición
+# es más rápida que la ordenación estable en una sola pasada
+SINGLE_PASS_MIN_PARTITIONS = 8
+
+# Agregados diarios materializados junto a sales_processed (entrenamiento de modelos)
+DAILY_SALES = 'daily_sales'
+DAILY_CATEGORY_SALES = 'daily_category_sales'
+DAILY_KEYS = {DAILY_SALES: ['date'], DAILY_CATEGORY_SALES: ['date', 'category']}
+
+# Política de tipos compactos aplicada desde la carga hasta el guardado.
+# total_amount y monetary se mantienen en float64 porque se acumulan en sumas.
+DTYPE_POLICY = {
+    'id': 'int32',
+    'customer_id': 'int32',
+    'product_id': 'int32',
+    'quantity': 'int16',
+    'price': 'float32',
+    'cost': 'float32',
+    'margin': 'float32',
+    'year': 'int16',
+    'month': 'int8',
+    'day_of_week': 'int8',
+    'category': 'category',
+    'segment': 'category',
+    'churn_risk': 'float32',
+    'recency': 'int32',
+    'frequency': 'int32',
+}
+
+
+def apply_dtype_policy(df: pd.DataFrame, policy: dict = None) -> pd.DataFrame:
+    """
+    Convierte las columnas de un DataFrame a los tipos compactos de la política.
+    
+    Las columnas enteras con valores nulos (p. ej. tras un merge sin match) se
+    dejan sin convertir.
+    
+    Args:
+        df: DataFrame a convertir (se modifica en el sitio)
+        policy: Tipo por columna (por defecto DTYPE_POLICY)
+        
+    Returns:
+        El mismo DataFrame con los tipos convertidos
+    """
+    for col, dtype in (policy or DTYPE_POLICY).items():
+        if col not in df.columns or df[col].dtype == dtype:
+            continue
+        if dtype != 'category' and np.dtype(dtype).kind in 'iu' and df[col].isna().any():
+            continue
+        df[col] = df[col].astype(dtype)
+    return df
+
+
+def memory_usage_mb(df: pd.DataFrame) -> float:
+    """Memoria ocupada por un DataFrame en MB (incluye strings y categorías)."""
+    return df.memory_usage(deep=True).sum() / 1024 ** 2
+
+
+class ProductLookup:
+    """
+    Tabla densa de productos indexada directamente por product_id.
+    
+    Los product_id son enteros densos, así que category/price/cost se guardan
+    en arrays de tamaño max(product_id) + 1 y el enriquecimiento de las
+    transacciones es un gather por posición, sin hash join ni copia del frame.
+    Los ids sin producto devuelven NaN, igual que un merge left.
+    
+    Attributes:
+        category_codes (np.ndarray): Código de categoría por product_id (-1 si no existe)
+        categories (pd.Index): Categorías correspondientes a los códigos
+        price (np.ndarray): Precio por product_id
+        cost (np.ndarray): Costo por product_id
+    """
+    
+    # Límite de densidad: tamaño del array frente al número de productos
+    MAX_SPARSITY = 16
+    
+    def __init__(self, products: pd.DataFrame):
+        """
+        Construye la tabla a partir del DataFrame de productos.
+        
+        Args:
+            products: Productos con product_id, category, price y cost
+            
+        Raises:
+            ValueError: Si los product_id no son enteros únicos, no negativos y densos
+        """
+        if not self.is_supported(products):
+            raise ValueError("❌ product_id debe ser entero, único, no negativo y denso")
+        
+        ids = products['product_id'].to_numpy()
+        size = int(ids.max()) + 1 if len(ids) else 0
+        
+        category = products['category']
+        self.category_dtype = category.dtype
+        categorical = pd.Categorical(category)
+        self.categories = categorical.categories
+        self.category_codes = np.full(size, -1, dtype=categorical.codes.dtype)
+        self.category_codes[ids] = categorical.codes
+        
+        self.price = self._dense(products['price'], ids, size)
+        self.cost = self._dense(products['cost'], ids, size)
+    
+    @staticmethod
+    def _dense(values: pd.Series, ids: np.ndarray, size: int) -> np.ndarray:
+        """Array de tamaño ``size`` con ``values`` en las posiciones ``ids`` y NaN en el resto."""
+        dense = np.full(size, np.nan, dtype=np.result_type(values.dtype, np.float32))
+        dense[ids] = values.to_numpy()
+        return dense
+    
+    @classmethod
+    def is_supported(cls, products: pd.DataFrame) -> bool:
+        """Indica si los product_id permiten una tabla densa."""
+        ids = products['product_id']
+        if not pd.api.types.is_integer_dtype(ids) or ids.empty:
+            return False
+        return (
+            ids.min() >= 0
+            and ids.max() < cls.MAX_SPARSITY * len(ids) + 1024
+            and ids.is_unique
+        )
+    
+    def enrich(self, sales: pd.DataFrame):
+        """
+        Añade category, price y cost a ``sales`` en el sitio.
+        
+        Args:
+            sales: Transacciones con columna product_id
+        """
+        ids = sales['product_id'].to_numpy()
+        valid = (ids >= 0) & (ids < len(self.price))
+        
+        if valid.all():
+            codes = self.category_codes[ids]
+            price = self.price[ids]
+            cost = self.cost[ids]
+        else:
+            rows = np.where(valid, ids, 0)
+            codes = np.where(valid, self.category_codes[rows], -1)
+            price = np.where(valid, self.price[rows], np.nan)
+            cost = np.where(valid, self.cost[rows], np.nan)
+        
+        category = pd.Categorical.from_codes(codes, categories=self.categories)
+        if not isinstance(self.category_dtype, pd.CategoricalDtype):
+            category = category.astype(self.category_dtype)
+        
+        sales['category'] = pd.Series(category, index=sales.index)
+        sales['price'] = price
+        sales['cost'] = cost
+
+
+def enrich_transactions(transactions: pd.DataFrame, products) -> pd.DataFrame:
+    """
+    Enriquece transacciones con columnas temporales, datos de producto y margen.
+    
+    Opera fila a fila, por lo que puede aplicarse a todo el histórico o a cada
+    chunk/partición por separado con el mismo resultado. Con product_id densos
+    el enriquecimiento se hace por gathers sobre un ProductLookup y en el sitio
+    (el resultado es el mismo objeto ``transactions``); si no, con un merge.
+    
+    Args:
+        transactions: Transacciones crudas (se añaden year, month, day_of_week)
+        products: Productos (DataFrame con product_id, category, price y cost)
+            o un ProductLookup precalculado
+        
+    Returns:
+        DataFrame de ventas procesadas
+    """
+    # Convertir fecha a datetime (solo si no llegó ya tipada desde la carga)
+    if not pd.api.types.is_datetime64_any_dtype(transactions['date']):
+        transactions['date'] = pd.to_datetime(transactions['date'])
+    
+    # Crear columnas temporales
+    transactions['year'] = transactions['date'].dt.year
+    transactions['month'] = transactions['date'].dt.month
+    transactions['day_of_week'] = transactions['date'].dt.dayofweek
+    
+    if isinstance(products, pd.DataFrame) and ProductLookup.is_supported(products):
+        products = ProductLookup(products)
+    
+    if isinstance(products, ProductLookup):
+        # Gather directo por product_id, sin copiar las transacciones
+        sales = transactions
+        products.enrich(sales)
+    else:
+        # Merge con productos para obtener categoría y costo
+        sales = transactions.merge(
+            products[['product_id', 'category', 'price', 'cost']],
+            on='product_id',
+            how='left'
+        )
+    
+    # Calcular margen en el sitio: (price - cost) * quantity
+    margin = np.subtract(sales['price'].to_numpy(), sales['cost'].to_numpy())
+    np.multiply(margin, sales['quantity'].to_numpy(), out=margin)
+    sales['margin'] = margin
+    
+    return sales
+
+
+def partition_by_customer(transactions: pd.DataFrame, n_partitions: int) -> list:
+    """
+    Divide las transacciones en particiones por hash de customer_id.
+    
+    Todas las transacciones de un cliente caen en la misma partición, por lo
+    que los agregados RFM de cada partición son disjuntos.
+    
+    Args:
+        transactions: Transacciones con columna customer_id
+        n_partitions: Número de particiones
+        
+    Returns:
+        Lista de DataFrames (conservan el índice original y el orden relativo)
+    """
+    buckets = pd.util.hash_array(transactions['customer_id'].to_numpy()) % n_partitions
+    if n_partitions < SINGLE_PASS_MIN_PARTITIONS:
+        return [transactions[buckets == i] for i in range(n_partitions)]
+
+    # Una sola pasada: ordenación estable por partición (radix sort con enteros
+    # de 8/16 bits) y cortes en los límites, en lugar de una máscara por partición
+    buckets = buckets.astype(np.min_scalar_type(max(n_partitions - 1, 0)))
+    order = np.argsort(buckets, kind='stable')
+    bounds = np.searchsorted(buckets[order], np.arange(1, n_partitions))
+    return [transactions.iloc[rows] for rows in np.split(order, bounds)]
+
+
+def _process_partition(transactions: pd.DataFrame, products,
+                       optimize_dtypes: bool) -> tuple:
+    """Enriquece una partición y calcula sus agregados RFM (se ejecuta en un worker)."""
+    index = transactions.index
+    sales = enrich_transactions(transactions, products)
+    sales.index = index
+    if optimize_dtypes:
+        apply_dtype_policy(sales)
+    return sales, compute_rfm_state(sales)
+
+
+def compute_rfm_state(sales: pd.DataFrame) -> pd.DataFrame:
+    """
+    Calcula los agregados RFM por cliente con agregaciones nativas de pandas.
+    
+    Args:
+        sales: Transacciones con columnas date, customer_id, product_id y total_amount
+        
+    Returns:
+        DataFrame con customer_id, last_date (última compra), frequency y monetary
+    """
+    return sales.groupby('customer_id').agg(
+        last_date=('date', 'max'),
+        frequency=('product_id', 'count'),
+        monetary=('total_amount', 'sum')
+    ).reset_index()
+
+
+def merge_rfm_states(states: list) -> pd.DataFrame:
+    """
+    Combina agregados RFM parciales (por lotes, particiones o chunks).
+    
+    Args:
+        states: Lista de DataFrames devueltos por compute_rfm_state
+        
+    Returns:
+        DataFrame con un único registro por cliente
+    """
+    return pd.concat(states, ignore_index=True).groupby('customer_id').agg(
+        last_date=('last_date', 'max'),
+        frequency=('frequency', 'sum'),
+        monetary=('monetary', 'sum')
+    ).reset_index()
+
+
+def rfm_from_state(state: pd.DataFrame, max_date: pd.Timestamp) -> pd.DataFrame:
+    """
+    Obtiene las métricas RFM a partir de los agregados por cliente.
+    
+    La recency se calcula con una única resta vectorizada contra max_date.
+    
+    Args:
+        state: Agregados devueltos por compute_rfm_state
+        max_date: Fecha de referencia (última fecha del dataset)
+        
+    Returns:
+        DataFrame con customer_id, recency, frequency y monetary
+    """
+    return pd.DataFrame({
+        'customer_id': state['customer_id'],
+        'recency': (max_date - state['last_date']).dt.days,
+        'frequency': state['frequency'],
+        'monetary': state['monetary']
+    })
+
+
+def compute_daily_aggregates(sales: pd.DataFrame) -> dict:
+    """
+    Calcula las ventas diarias totales y por categoría.
+    
+    Las sumas se acumulan en float64 (total_amount, margin) e int64
+    (quantity) aunque las columnas de origen sean compactas.
+    
+    Args:
+        sales: Ventas procesadas con date, category, total_amount, quantity y margin
+        
+    Returns:
+        dict {DAILY_SALES: DataFrame, DAILY_CATEGORY_SALES: DataFrame}
+    """
+    values = pd.DataFrame({
+        'date': sales['date'],
+        'category': sales['category'],
+        'total_amount': sales['total_amount'].astype('float64'),
+        'quantity': sales['quantity'].astype('int64'),
+        'margin': sales['margin'].astype('float64'),
+    })
+    return {
+        name: values.groupby(keys, observed=True)[['total_amount', 'quantity', 'margin']]
+        .sum().reset_index()
+        for name, keys in DAILY_KEYS.items()
+    }
+
+
+def merge_daily_aggregates(parts: list) -> dict:
+    """
+    Combina agregados diarios parciales (por lotes, particiones o chunks).
+    
+    Args:
+        parts: Lista de dicts devueltos por compute_daily_aggregates
+        
+    Returns:
+        dict con un único registro por clave en cada agregado
+    """
+    return {
+        name: pd.concat([part[name] for part in parts], ignore_index=True)
+        .groupby(keys, observed=True)[['total_amount', 'quantity', 'margin']]
+        .sum().reset_index()
+        for name, keys in DAILY_KEYS.items()
+    }
+
+
+def load_daily_aggregate(sales_path, name: str = DAILY_SALES, columns: list = None):
+    """
+    Lee un agregado diario materializado junto a sales_processed si está al día.
+    
+    El agregado se considera obsoleto si sales_processed se modificó después
+    de escribirlo (p. ej. un lote incremental que no lo actualizó).
+    
+    Args:
+        sales_path: Ruta de sales_processed (el agregado está en el mismo directorio)
+        name: DAILY_SALES o DAILY_CATEGORY_SALES
+        columns: Columnas a cargar (todas si None)
+        
+    Returns:
+        DataFrame con el agregado, o None si no existe o está obsoleto
+    """
+    sales_path = Path(sales_path)
+    try:
+        aggregate_path = resolve_table_path(sales_path.with_name(name + sales_path.suffix))
+    except FileNotFoundError:
+        return None
+    
+    try:
+        source_mtime = resolve_table_path(sales_path).stat().st_mtime_ns
+    except FileNotFoundError:
+        source_mtime = None
+    if source_mtime is not None and source_mtime > aggregate_path.stat().st_mtime_ns:
+        return None
+    
+    return read_table(aggregate_path, columns=columns, parse_dates=['date'])
+
+
+def compute_rfm(sales: pd.DataFrame) -> pd.DataFrame:
+    """
+    Calcula Recency, Frequency y Monetary por cliente sin funciones Python por grupo.
+    
+    Args:
+        sales: Transacciones con columnas date, customer_id, product_id y total_amount
+        
+    Returns:
+        DataFrame con customer_id, recency, frequency y monetary
+    """
+    return rfm_from_state(compute_rfm_state(sales), sales['date'].max())
+
 
 class DataPreprocessor:
     """Pipeline de procesamiento de datos para análisis de retail."""
     
-    def __init__(self, raw_data_path: str = 'data/raw', processed_data_path: str = 'data/processed'):
+    def __init__(self, raw_data_path: str = 'data/raw', processed_data_path: str = 'data/processed',
+                 storage_format: str = 'csv', optimize_dtypes: bool = True,
+                 chunksize: int = None, n_jobs: int = 1):
         """
         Inicializa el preprocessor.
         
         Args:
             raw_data_path: Ruta a los datos crudos
             processed_data_path: Ruta donde guardar datos procesados
+            storage_format: Formato de almacenamiento ('csv', 'parquet' o 'feather').
+                Al cargar se aceptan archivos existentes en cualquier formato.
+            optimize_dtypes: Aplicar DTYPE_POLICY (categorías, enteros reducidos,
+                float32) en todas las etapas
+            chunksize: Si se indica, run_pipeline procesa las transacciones fuera
+                de memoria en chunks de este número de filas
+            n_jobs: Procesos usados por run_pipeline (particiones por cliente);
+                -1 usa todos los núcleos disponibles
+        
+        Raises:
+            ValueError: Si se combinan chunksize y n_jobs > 1 (el modo fuera de
+                memoria es secuencial)
         """
+        n_jobs = os.cpu_count() if n_jobs == -1 else n_jobs
+        if chunksize and n_jobs and n_jobs > 1:
+            raise ValueError("❌ chunksize y n_jobs > 1 no se pueden combinar: el modo fuera de memoria es secuencial")
+        
         self.raw_data_path = Path(raw_data_path)
         self.processed_data_path = Path(processed_data_path)
+        self.storage_format = storage_format
+        self.optimize_dtypes = optimize_dtypes
+        self.chunksize = chunksize
+        self.n_jobs = n_jobs
+        
+        # Memoria por etapa: lista de {stage, table, rows, memory_mb}
+        self.memory_report = []
         
         # DataFrames
         self.customers = None
         self.products = None
+        self.product_lookup = None
         self.transactions = None
         self.sales_processed = None
         self.customer_features = None
+        self.rfm_state = None
+        self.daily_aggregates = None
         
-    def load_data(self):
-        """Carga los datos desde archivos CSV."""
-        print("📂 Cargando datos...")
+    def _raw_path(self, name: str) -> Path:
+        """Ruta de un dataset crudo en el formato configurado."""
+        return table_path(self.raw_data_path, name, self.storage_format)
+    
+    def _processed_path(self, name: str) -> Path:
+        """Ruta de un dataset procesado en el formato configurado."""
+        return table_path(self.processed_data_path, name, self.storage_format)
+    
+    def _read(self, path, columns=None, parse_dates=None) -> pd.DataFrame:
+        """Lee un dataset aplicando la política de tipos ya en la lectura."""
+        dtype = DTYPE_POLICY if self.optimize_dtypes else None
+        return read_table(path, columns=columns, parse_dates=parse_dates, dtype=dtype)
+    
+    def _optimize(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Aplica DTYPE_POLICY si la optimización de tipos está activada."""
+        return apply_dtype_policy(df) if self.optimize_dtypes else df
+    
+    def _report_memory(self, stage: str):
+        """Registra e imprime la memoria de los DataFrames cargados en una etapa."""
+        tables = {
+            'customers': self.customers,
+            'products': self.products,
+            'transactions': self.transactions,
+            'sales_processed': self.sales_processed,
+            'customer_features': self.customer_features,
+        }
         
-        self.customers = pd.read_csv(self.raw_data_path / 'customers.csv')
-        self.products = pd.read_csv(self.raw_data_path / 'products.csv')
-        self.transactions = pd.read_csv(self.raw_data_path / 'transactions.csv')
+        usage = []
+        seen = []
+        for name, df in tables.items():
+            # sales_processed puede ser el mismo objeto que transactions (enriquecido en el sitio)
+            if df is None or any(df is other for other in seen):
+                continue
+            seen.append(df)
+            memory_mb = memory_usage_mb(df)
+            self.memory_report.append({
+                'stage': stage, 'table': name, 'rows': len(df), 'memory_mb': memory_mb
+            })
+            usage.append(f"{name} {memory_mb:.1f} MB")
+        
+        print(f"  🧠 Memoria ({stage}): {', '.join(usage)}")
+    
+    def get_memory_report(self) -> pd.DataFrame:
+        """
+        Devuelve la memoria ocupada por cada tabla en cada etapa del pipeline.
+        
+        Returns:
+            DataFrame con columnas stage, table, rows y memory_mb
+        """
+        return pd.DataFrame(self.memory_report, columns=['stage', 'table', 'rows', 'memory_mb'])
+    
+    def _load_reference_data(self):
+        """Carga clientes y productos (solo las columnas que se usan)."""
+        self.customers = self._read(self._raw_path('customers'))
+        self.products = self._read(self._raw_path('products'), columns=PRODUCT_COLUMNS)
         
         # Renombrar columna 'id' a 'product_id' en productos para hacer match con transacciones
         self.products.rename(columns={'id': 'product_id'}, inplace=True)
         
+        # Tabla densa por product_id, se construye una vez y se reutiliza en cada chunk/partición
+        if ProductLookup.is_supported(self.products):
+            self.product_lookup = ProductLookup(self.products)
+    
+    def _product_source(self):
+        """ProductLookup precalculado si existe; si no, el DataFrame de productos."""
+        return self.product_lookup if self.product_lookup is not None else self.products
+        
+    def load_data(self):
+        """Carga los datos crudos (CSV, Parquet o Feather)."""
+        print("📂 Cargando datos...")
+        
+        self._load_reference_data()
+        self.transactions = self._read(
+            self._raw_path('transactions'),
+            columns=TRANSACTION_COLUMNS,
+            parse_dates=['date']
+        )
+        
         print(f"  ✓ Clientes: {len(self.customers)} registros")
         print(f"  ✓ Productos: {len(self.products)} registros")
         print(f"  ✓ Transacciones: {len(self.transactions)} registros")
+        self._report_memory('load')
         
     def preprocess_transactions(self):
         """
@@ -51,29 +555,11 @@ class DataPreprocessor:
         """
         print("\n🔧 Procesando transacciones...")
         
-        # Convertir fecha a datetime
-        self.transactions['date'] = pd.to_datetime(self.transactions['date'])
-        
-        # Crear columnas temporales
-        self.transactions['year'] = self.transactions['date'].dt.year
-        self.transactions['month'] = self.transactions['date'].dt.month
-        self.transactions['day_of_week'] = self.transactions['date'].dt.dayofweek
-        
-        # Merge con productos para obtener categoría y costo
-        self.sales_processed = self.transactions.merge(
-            self.products[['product_id', 'category', 'price', 'cost']],
-            on='product_id',
-            how='left'
-        )
-        
-        # Calcular margen
-        self.sales_processed['margin'] = (
-            (self.sales_processed['price'] - self.sales_processed['cost']) * 
-            self.sales_processed['quantity']
-        )
+        self.sales_processed = self._optimize(enrich_transactions(self.transactions, self._product_source()))
         
         print(f"  ✓ Transacciones enriquecidas: {len(self.sales_processed)} registros")
         print(f"  ✓ Nuevas columnas: year, month, day_of_week, category, cost, margin")
+        self._report_memory('preprocess')
         
     def create_customer_features(self):
         """
@@ -85,60 +571,262 @@ class DataPreprocessor:
         """
         print("\n📊 Creando características de clientes (RFM)...")
         
-        # Obtener la fecha máxima del dataset como referencia
-        max_date = self.sales_processed['date'].max()
-        
-        # Calcular RFM por cliente
-        rfm = self.sales_processed.groupby('customer_id').agg({
-            'date': lambda x: (max_date - x.max()).days,  # Recency
-            'product_id': 'count',  # Frequency
-            'total_amount': 'sum'  # Monetary
-        }).reset_index()
-        
-        # Renombrar columnas
-        rfm.columns = ['customer_id', 'recency', 'frequency', 'monetary']
+        # Agregados por cliente (se persisten para actualizaciones incrementales)
+        self.rfm_state = self._optimize(compute_rfm_state(self.sales_processed))
         
+        # Calcular RFM por cliente (fecha máxima del dataset como referencia)
+        rfm = rfm_from_state(self.rfm_state, self.sales_processed['date'].max())
+        self._build_customer_features(rfm)
+    
+    def _build_customer_features(self, rfm: pd.DataFrame):
+        """Une las métricas RFM con la información de clientes."""
         # Merge con información de clientes
-        self.customer_features = rfm.merge(
+        self.customer_features = self._optimize(rfm.merge(
             self.customers,
             on='customer_id',
             how='left'
-        )
+        ))
         
         print(f"  ✓ Clientes procesados: {len(self.customer_features)} registros")
         print(f"  ✓ Métricas RFM calculadas:")
         print(f"    - Recency promedio: {self.customer_features['recency'].mean():.1f} días")
         print(f"    - Frequency promedio: {self.customer_features['frequency'].mean():.1f} transacciones")
         print(f"    - Monetary promedio: ${self.customer_features['monetary'].mean():.2f}")
+        self._report_memory('features')
         
     def save_data(self):
-        """Guarda los datos procesados en archivos CSV."""
+        """Guarda los datos procesados en el formato configurado."""
         print("\n💾 Guardando datos procesados...")
         
         # Crear directorio si no existe
         self.processed_data_path.mkdir(parents=True, exist_ok=True)
         
         # Guardar transacciones procesadas
-        sales_path = self.processed_data_path / 'sales_processed.csv'
-        self.sales_processed.to_csv(sales_path, index=False)
+        sales_path = write_table(self.sales_processed, self._processed_path('sales_processed'))
         print(f"  ✓ Guardado: {sales_path}")
         
+        # Agregados diarios (después de sales_processed: así constan como actualizados)
+        self.daily_aggregates = compute_daily_aggregates(self.sales_processed)
+        self._save_daily_outputs()
+        
+        self._save_customer_outputs()
+    
+    def _save_daily_outputs(self):
+        """Guarda los agregados diarios (total y por categoría)."""
+        for name, daily in self.daily_aggregates.items():
+            daily_path = write_table(daily, self._processed_path(name))
+            print(f"  ✓ Guardado: {daily_path} ({len(daily)} filas)")
+    
+    def _save_customer_outputs(self):
+        """Guarda las características de clientes y el estado RFM."""
         # Guardar características de clientes
-        customers_path = self.processed_data_path / 'customer_features.csv'
-        self.customer_features.to_csv(customers_path, index=False)
+        customers_path = write_table(self.customer_features, self._processed_path('customer_features'))
         print(f"  ✓ Guardado: {customers_path}")
         
+        # Guardar estado RFM para actualizaciones incrementales
+        state_path = write_table(self.rfm_state, self._processed_path('rfm_state'))
+        print(f"  ✓ Guardado: {state_path}")
+        
     def run_pipeline(self):
         """Ejecuta el pipeline completo de procesamiento."""
+        if self.chunksize:
+            self.run_out_of_core()
+            return
+        if self.n_jobs and self.n_jobs > 1:
+            self.run_parallel()
+            return
+        
         self.load_data()
         self.preprocess_transactions()
         self.create_customer_features()
         self.save_data()
         
         print(f"\n✅ Datos procesados guardados: {len(self.sales_processed)} transacciones y {len(self.customer_features)} clientes.")
+    
+    def run_parallel(self):
+        """
+        Ejecuta el pipeline repartiendo el trabajo entre varios procesos.
+        
+        Las transacciones se particionan por hash de customer_id; cada proceso
+        enriquece su partición y calcula sus agregados RFM. Los resultados se
+        concatenan respetando el orden original de las transacciones, por lo
+        que los archivos generados coinciden con el modo secuencial.
+        """
+        self.load_data()
+        
+        print(f"\n🔧 Procesando transacciones en {self.n_jobs} procesos...")
+        partitions = partition_by_customer(self.transactions, self.n_jobs)
+        
+        with ProcessPoolExecutor(max_workers=self.n_jobs) as pool:
+            results = list(pool.map(
+                _process_partition,
+                partitions,
+                [self._product_source()] * len(partitions),
+                [self.optimize_dtypes] * len(partitions)
+            ))
+        
+        sales_parts, states = zip(*results)
+        self.sales_processed = pd.concat(sales_parts).sort_index().reset_index(drop=True)
+        self._optimize(self.sales_processed)
+        print(f"  ✓ Particiones: {', '.join(f'{len(part):,}' for part in sales_parts)} transacciones")
+        print(f"  ✓ Transacciones enriquecidas: {len(self.sales_processed)} registros")
+        self._report_memory('preprocess')
+        
+        print("\n📊 Creando características de clientes (RFM)...")
+        self.rfm_state = self._optimize(merge_rfm_states(list(states)))
+        rfm = rfm_from_state(self.rfm_state, self.sales_processed['date'].max())
+        self._build_customer_features(rfm)
+        
+        self.save_data()
+        
+        print(f"\n✅ Datos procesados guardados: {len(self.sales_processed)} transacciones y {len(self.customer_features)} clientes.")
+    
+    def run_out_of_core(self):
+        """
+        Ejecuta el pipeline sin cargar todas las transacciones en memoria.
+        
+        Lee las transacciones por chunks de ``chunksize`` filas; cada chunk se
+        enriquece con productos, se calcula su margen, se escribe a
+        sales_processed y se reduce a agregados RFM parciales que se combinan
+        al final. Solo un chunk y los agregados por cliente viven en memoria.
+        Los archivos generados son los mismos que en el modo en memoria.
+        """
+        chunksize = self.chunksize or DEFAULT_CHUNKSIZE
+        
+        print("📂 Cargando datos de referencia...")
+        self._load_reference_data()
+        print(f"  ✓ Clientes: {len(self.customers)} registros")
+        print(f"  ✓ Productos: {len(self.products)} registros")
+        
+        print(f"\n🔧 Procesando transacciones por chunks de {chunksize:,} filas...")
+        chunks = iter_table(
+            self._raw_path('transactions'),
+            chunksize=chunksize,
+            columns=TRANSACTION_COLUMNS,
+            parse_dates=['date'],
+            dtype=DTYPE_POLICY if self.optimize_dtypes else None
+        )
+        
+        states = []
+        daily_parts = []
+        with TableWriter(self._processed_path('sales_processed')) as writer:
+            for i, chunk in enumerate(chunks, start=1):
+                sales = self._optimize(enrich_transactions(chunk, self._product_source()))
+                writer.write(sales)
+                states.append(compute_rfm_state(sales))
+                daily_parts.append(compute_daily_aggregates(sales))
+                
+                # Compactar agregados parciales para acotar la memoria
+                if len(states) >= STATE_MERGE_EVERY:
+                    states = [merge_rfm_states(states)]
+                    daily_parts = [merge_daily_aggregates(daily_parts)]
+                
+                print(f"  ✓ Chunk {i}: {len(sales):,} transacciones ({writer.rows_written:,} acumuladas)")
+        
+        print(f"  ✓ Guardado: {writer.path}")
+        
+        print("\n📊 Creando características de clientes (RFM)...")
+        self.rfm_state = self._optimize(merge_rfm_states(states))
+        rfm = rfm_from_state(self.rfm_state, self.rfm_state['last_date'].max())
+        self._build_customer_features(rfm)
+        
+        print("\n💾 Guardando datos procesados...")
+        self.daily_aggregates = merge_daily_aggregates(daily_parts)
+        self._save_daily_outputs()
+        self._save_customer_outputs()
+        
+        print(f"\n✅ Datos procesados guardados: {writer.rows_written} transacciones y {len(self.customer_features)} clientes.")
+    
+    def run_incremental(self, batch_path: str):
+        """
+        Incorpora un lote de transacciones nuevas sin reprocesar el histórico.
+        
+        Parte del estado RFM persistido (última compra, número de transacciones
+        y gasto total por cliente), le suma los agregados del lote y recalcula
+        la recency contra la nueva fecha máxima. El coste es proporcional al
+        lote más el número de clientes, no al tamaño del histórico. Los
+        agregados diarios se actualizan igual, sumando los del lote.
+        
+        Args:
+            batch_path: Archivo con las transacciones nuevas (mismo esquema que
+                data/raw/transactions)
+            
+        Raises:
+            FileNotFoundError: Si no existe el estado RFM (ejecutar run_pipeline primero)
+        """
+        print("📂 Cargando lote incremental...")
+        
+        state_path = self._processed_path('rfm_state')
+        try:
+            previous_state = self._read(state_path, parse_dates=['last_date'])
+        except FileNotFoundError:
+            raise FileNotFoundError(
+                f"❌ Estado RFM no encontrado: {state_path}. Ejecuta run_pipeline() primero."
+            )
+        
+        self._load_reference_data()
+        self.transactions = self._read(batch_path, columns=TRANSACTION_COLUMNS, parse_dates=['date'])
+        print(f"  ✓ Transacciones nuevas: {len(self.transactions)} registros")
+        print(f"  ✓ Estado RFM previo: {len(previous_state)} clientes")
+        
+        self.preprocess_transactions()
+        
+        print("\n📊 Actualizando características de clientes (RFM incremental)...")
+        batch_state = compute_rfm_state(self.sales_processed)
+        self.rfm_state = self._optimize(merge_rfm_states([previous_state, batch_state]))
+        
+        max_date = max(previous_state['last_date'].max(), self.sales_processed['date'].max())
+        rfm = rfm_from_state(self.rfm_state, max_date)
+        self._build_customer_features(rfm)
+        
+        # Agregados diarios previos (solo si estaban al día con sales_processed)
+        sales_path = self._processed_path('sales_processed')
+        previous_daily = {name: load_daily_aggregate(sales_path, name) for name in DAILY_KEYS}
+        
+        print("\n💾 Guardando datos procesados...")
+        sales_path = append_table(self.sales_processed, sales_path)
+        print(f"  ✓ Añadido a: {sales_path}")
+        
+        if all(daily is not None for daily in previous_daily.values()):
+            self.daily_aggregates = merge_daily_aggregates(
+                [previous_daily, compute_daily_aggregates(self.sales_processed)]
+            )
+            self._save_daily_outputs()
+        else:
+            print("  ⚠ Agregados diarios no disponibles o desactualizados: "
+                  "ejecuta run_pipeline() para regenerarlos")
+        
+        customers_path = write_table(self.customer_features, self._processed_path('customer_features'))
+        print(f"  ✓ Guardado: {customers_path}")
+        
+        state_path = write_table(self.rfm_state, state_path)
+        print(f"  ✓ Guardado: {state_path}")
+        
+        print(f"\n✅ Lote incorporado: {len(self.sales_processed)} transacciones nuevas, {len(self.customer_features)} clientes.")
 
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Pipeline de procesamiento de datos de retail.")
+    parser.add_argument('--format', dest='storage_format', choices=available_formats(),
+                        default='csv', help="Formato de almacenamiento de los datasets")
+    parser.add_argument('--incremental', metavar='BATCH_PATH',
+                        help="Incorporar solo un lote de transacciones nuevas al estado RFM")
+    parser.add_argument('--legacy-dtypes', action='store_true',
+                        help="No aplicar la política de tipos compactos (para comparar memoria)")
+    parser.add_argument('--chunksize', type=int,
+                        help="Procesar las transacciones fuera de memoria en chunks de N filas")
+    parser.add_argument('--n-jobs', type=int, default=1,
+                        help="Procesos para el modo paralelo (-1 = todos los núcleos)")
+    args = parser.parse_args()
+    
     # Ejecutar el pipeline de procesamiento
-    preprocessor = DataPreprocessor()
-    preprocessor.run_pipeline()
+    preprocessor = DataPreprocessor(
+        storage_format=args.storage_format,
+        optimize_dtypes=not args.legacy_dtypes,
+        chunksize=args.chunksize,
+        n_jobs=args.n_jobs
+    )
+    if args.incremental:
+        preprocessor.run_incremental(args.incremental)
+    else:
+        preprocessor.run_pipeline()
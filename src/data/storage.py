@@ -0,0 +1,385 @@
+"""Module for reading and writing tabular datasets in CSV or columnar formats.
+
+Every dataset in ``data/raw`` and ``data/processed`` is addressed by its path;
+the file suffix selects the format. Parquet and Feather files are typed and
+compressed, so dates do not need re-parsing and readers can load only the
+columns they use. Existing CSV files remain readable: when the requested file
+does not exist, a sibling with the same name in another format is used.
+"""
+
+import tempfile
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Union
+
+import pandas as pd
+
+
+PathLike = Union[str, Path]
+
+DEFAULT_COMPRESSION = 'zstd'
+
+
+def _require_pyarrow():
+    """Import pyarrow or raise an explicit installation hint."""
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        raise ImportError("pyarrow no está instalado. Ejecuta: pip install pyarrow")
+
+
+def _parse_dates(df: pd.DataFrame, parse_dates: Optional[List[str]]) -> pd.DataFrame:
+    """Convert the given columns to datetime64 if they are not already."""
+    for col in parse_dates or []:
+        if col in df.columns and not pd.api.types.is_datetime64_any_dtype(df[col]):
+            df[col] = pd.to_datetime(df[col])
+    return df
+
+
+def _apply_dtypes(df: pd.DataFrame, dtype: Optional[Dict[str, str]]) -> pd.DataFrame:
+    """Cast the columns present in ``dtype`` that do not have that dtype yet."""
+    for col, col_dtype in (dtype or {}).items():
+        if col in df.columns and df[col].dtype != col_dtype:
+            df[col] = df[col].astype(col_dtype)
+    return df
+
+
+def _read_csv(path: Path, columns=None, parse_dates=None, dtype=None) -> pd.DataFrame:
+    if parse_dates and columns is not None:
+        parse_dates = [col for col in parse_dates if col in columns]
+    if dtype and columns is not None:
+        dtype = {col: col_dtype for col, col_dtype in dtype.items() if col in columns}
+    return pd.read_csv(path, usecols=columns, parse_dates=parse_dates or None, dtype=dtype or None)
+
+
+def _write_csv(df: pd.DataFrame, path: Path, compression=None):
+    df.to_csv(path, index=False)
+
+
+def _read_parquet(path: Path, columns=None, parse_dates=None, dtype=None) -> pd.DataFrame:
+    _require_pyarrow()
+    df = _parse_dates(pd.read_parquet(path, columns=columns), parse_dates)
+    return _apply_dtypes(df, dtype)
+
+
+def _write_parquet(df: pd.DataFrame, path: Path, compression=DEFAULT_COMPRESSION):
+    _require_pyarrow()
+    df.to_parquet(path, index=False, compression=compression)
+
+
+def _read_feather(path: Path, columns=None, parse_dates=None, dtype=None) -> pd.DataFrame:
+    _require_pyarrow()
+    df = _parse_dates(pd.read_feather(path, columns=columns), parse_dates)
+    return _apply_dtypes(df, dtype)
+
+
+def _write_feather(df: pd.DataFrame, path: Path, compression=DEFAULT_COMPRESSION):
+    _require_pyarrow()
+    df.reset_index(drop=True).to_feather(path, compression=compression)
+
+
+# Registry of supported formats: name -> (suffix, reader, writer)
+_FORMATS: Dict[str, tuple] = {
+    'csv': ('.csv', _read_csv, _write_csv),
+    'parquet': ('.parquet', _read_parquet, _write_parquet),
+    'feather': ('.feather', _read_feather, _write_feather),
+}
+
+
+def register_format(name: str, suffix: str, reader: Callable, writer: Callable):
+    """Register a new storage format.
+
+    Args:
+        name: Format name used by ``table_path`` (e.g. 'orc')
+        suffix: File suffix including the dot (e.g. '.orc')
+        reader: ``reader(path, columns=None, parse_dates=None, dtype=None) -> DataFrame``
+        writer: ``writer(df, path, compression=...)``
+    """
+    _FORMATS[name] = (suffix, reader, writer)
+
+
+def available_formats() -> List[str]:
+    """Return the names of the registered storage formats."""
+    return list(_FORMATS)
+
+
+def format_from_path(path: PathLike) -> str:
+    """Return the registered format name for a file path.
+
+    Raises:
+        ValueError: If the suffix does not belong to any registered format
+    """
+    suffix = Path(path).suffix.lower()
+    for name, (fmt_suffix, _, _) in _FORMATS.items():
+        if suffix == fmt_suffix:
+            return name
+    raise ValueError(f"❌ Formato no soportado: '{suffix}' ({path})")
+
+
+def table_path(directory: PathLike, name: str, storage_format: str = 'csv') -> Path:
+    """Build the path of dataset ``name`` inside ``directory`` for a format.
+
+    Args:
+        directory: Directory containing the dataset
+        name: Dataset name without suffix (e.g. 'transactions')
+        storage_format: One of ``available_formats()``
+
+    Returns:
+        Path with the suffix of the requested format
+    """
+    if storage_format not in _FORMATS:
+        raise ValueError(
+            f"❌ Formato no soportado: '{storage_format}'. "
+            f"Opciones: {', '.join(available_formats())}"
+        )
+    return Path(directory) / f"{name}{_FORMATS[storage_format][0]}"
+
+
+def resolve_table_path(path: PathLike) -> Path:
+    """Return ``path`` if it exists, otherwise a sibling in another format.
+
+    Args:
+        path: Preferred dataset path (its suffix sets the preferred format)
+
+    Returns:
+        Path of an existing file for the dataset
+
+    Raises:
+        FileNotFoundError: If the dataset does not exist in any format
+    """
+    path = Path(path)
+    if path.exists():
+        return path
+
+    for suffix, _, _ in _FORMATS.values():
+        candidate = path.with_suffix(suffix)
+        if candidate.exists():
+            return candidate
+
+    raise FileNotFoundError(f"❌ Archivo no encontrado: {path}")
+
+
+def read_table(
+    path: PathLike,
+    columns: Optional[List[str]] = None,
+    parse_dates: Optional[List[str]] = None,
+    dtype: Optional[Dict[str, str]] = None
+) -> pd.DataFrame:
+    """Read a dataset, loading only the requested columns.
+
+    Args:
+        path: Dataset path; falls back to a sibling file in another format
+        columns: Columns to load (all when None)
+        parse_dates: Columns that must be returned as datetime64
+        dtype: Target dtype per column (columns not loaded are ignored)
+
+    Returns:
+        DataFrame with the loaded data
+    """
+    path = resolve_table_path(path)
+    _, reader, _ = _FORMATS[format_from_path(path)]
+    return reader(path, columns=columns, parse_dates=parse_dates, dtype=dtype)
+
+
+def iter_table(
+    path: PathLike,
+    chunksize: int,
+    columns: Optional[List[str]] = None,
+    parse_dates: Optional[List[str]] = None,
+    dtype: Optional[Dict[str, str]] = None
+) -> Iterator[pd.DataFrame]:
+    """Read a dataset in chunks of at most ``chunksize`` rows.
+
+    Only one chunk is held in memory at a time. CSV files are parsed
+    incrementally, Parquet files are read by record batches and Feather
+    files by their stored Arrow record batches (re-sliced to ``chunksize``).
+
+    Args:
+        path: Dataset path; falls back to a sibling file in another format
+        chunksize: Maximum rows per chunk
+        columns: Columns to load (all when None)
+        parse_dates: Columns that must be returned as datetime64
+        dtype: Target dtype per column (columns not loaded are ignored)
+
+    Yields:
+        DataFrames with consecutive rows of the dataset
+    """
+    path = resolve_table_path(path)
+    storage_format = format_from_path(path)
+
+    if storage_format == 'csv':
+        if parse_dates and columns is not None:
+            parse_dates = [col for col in parse_dates if col in columns]
+        if dtype and columns is not None:
+            dtype = {col: col_dtype for col, col_dtype in dtype.items() if col in columns}
+        yield from pd.read_csv(path, usecols=columns, parse_dates=parse_dates or None,
+                               dtype=dtype or None, chunksize=chunksize)
+        return
+
+    if storage_format == 'parquet':
+        _require_pyarrow()
+        import pyarrow.parquet as pq
+        batches = pq.ParquetFile(path).iter_batches(batch_size=chunksize, columns=columns)
+    elif storage_format == 'feather':
+        _require_pyarrow()
+        import pyarrow as pa
+        reader = pa.ipc.open_file(str(path))
+        batches = (
+            batch.slice(offset, chunksize)
+            for batch in (reader.get_batch(i) for i in range(reader.num_record_batches))
+            for offset in range(0, batch.num_rows, chunksize)
+        )
+        if columns is not None:
+            batches = (batch.select(columns) for batch in batches)
+    else:
+        # Registered formats without incremental reads: a single chunk
+        yield read_table(path, columns=columns, parse_dates=parse_dates, dtype=dtype)
+        return
+
+    for batch in batches:
+        df = _parse_dates(batch.to_pandas(), parse_dates)
+        yield _apply_dtypes(df, dtype)
+
+
+def write_table(df: pd.DataFrame, path: PathLike, compression: str = DEFAULT_COMPRESSION) -> Path:
+    """Write a dataset in the format given by the suffix of ``path``.
+
+    Args:
+        df: DataFrame to save (the index is not stored)
+        path: Destination path
+        compression: Codec for columnar formats (ignored for CSV)
+
+    Returns:
+        Path of the written file
+    """
+    path = Path(path)
+    _, _, writer = _FORMATS[format_from_path(path)]
+    path.parent.mkdir(parents=True, exist_ok=True)
+    writer(df, path, compression=compression)
+    return path
+
+
+def append_table(df: pd.DataFrame, path: PathLike, compression: str = DEFAULT_COMPRESSION) -> Path:
+    """Append rows to an existing dataset (or create it).
+
+    CSV files are appended in place, so the cost is proportional to ``df``.
+    Parquet and Feather files are immutable: the existing rows are read and
+    the file is rewritten.
+
+    Args:
+        df: Rows to append (same columns as the existing dataset)
+        path: Dataset path; an existing sibling in another format is used
+        compression: Codec for columnar formats (ignored for CSV)
+
+    Returns:
+        Path of the written file
+    """
+    try:
+        path = resolve_table_path(path)
+    except FileNotFoundError:
+        return write_table(df, path, compression=compression)
+
+    if format_from_path(path) == 'csv':
+        with open(path, 'a', newline='') as f:
+            df.to_csv(f, index=False, header=False)
+        return path
+
+    existing = read_table(path)
+    return write_table(pd.concat([existing, df], ignore_index=True), path, compression=compression)
+
+
+class TableWriter:
+    """Incremental writer that appends DataFrame chunks to a single file.
+
+    CSV chunks are appended as text, Parquet chunks become row groups and
+    Feather chunks become Arrow record batches, so memory stays bounded by
+    the chunk size. Use it as a context manager::
+
+        with TableWriter('data/raw/transactions.parquet') as writer:
+            for chunk in chunks:
+                writer.write(chunk)
+    """
+
+    def __init__(self, path: PathLike, compression: str = DEFAULT_COMPRESSION):
+        self.path = Path(path)
+        self.format = format_from_path(self.path)
+        self.compression = compression
+        self.rows_written = 0
+        self._sink = None
+        self._writer = None
+        self._schema = None
+
+        if self.format not in ('csv', 'parquet', 'feather'):
+            raise ValueError(f"❌ Escritura incremental no soportada para '{self.format}'")
+        if self.format != 'csv':
+            _require_pyarrow()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+
+    def write(self, df: pd.DataFrame):
+        """Append one chunk to the file."""
+        if self.format == 'csv':
+            if self._sink is None:
+                self._sink = open(self.path, 'w', newline='')
+                df.to_csv(self._sink, index=False)
+            else:
+                df.to_csv(self._sink, index=False, header=False)
+        else:
+            import pyarrow as pa
+
+            if self._schema is None:
+                table = pa.Table.from_pandas(df, preserve_index=False)
+                self._schema = table.schema
+                self._open_arrow_writer()
+            else:
+                table = pa.Table.from_pandas(df, schema=self._schema, preserve_index=False)
+            self._writer.write_table(table)
+
+        self.rows_written += len(df)
+
+    def _open_arrow_writer(self):
+        import pyarrow as pa
+
+        if self.format == 'parquet':
+            import pyarrow.parquet as pq
+            self._writer = pq.ParquetWriter(self.path, self._schema, compression=self.compression)
+        else:
+            options = pa.ipc.IpcWriteOptions(compression=self.compression)
+            self._sink = pa.OSFile(str(self.path), 'wb')
+            self._writer = pa.ipc.new_file(self._sink, self._schema, options=options)
+
+    def close(self):
+        """Flush and close the underlying file."""
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+        if self._sink is not None:
+            self._sink.close()
+            self._sink = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+def table_bytes(chunks: Iterable[pd.DataFrame], storage_format: str = 'csv',
+                compression: str = DEFAULT_COMPRESSION) -> bytes:
+    """Serialize DataFrame chunks into the bytes of a single file.
+
+    Chunks go through ``TableWriter`` on a temporary file, so only one chunk
+    is converted at a time. Meant for exports built on demand (downloads).
+
+    Args:
+        chunks: DataFrames with the same columns, in output order
+        storage_format: 'csv', 'parquet' or 'feather'
+        compression: Codec for the columnar formats
+
+    Returns:
+        File contents (empty if ``chunks`` yields nothing)
+    """
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = table_path(tmp_dir, 'export', storage_format)
+        with TableWriter(path, compression=compression) as writer:
+            for chunk in chunks:
+                writer.write(chunk)
+        return path.read_bytes() if path.exists() else b''
@@ -0,0 +1,287 @@
+"""
+Churn Explanations Module
+Explicaciones SHAP del modelo de churn: un TreeExplainer por modelo y un
+almacén precalculado (npz indexado por customer_id) con los valores SHAP de
+los clientes en riesgo.
+
+Con el almacén, la explicación de un cliente es una búsqueda y la
+importancia global (media de |SHAP|) sale sin recalcular nada.
+
+Uso (desde la raíz del proyecto):
+    python -m src.models.churn_explain --threshold 0.7
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# Permitir la ejecución directa: python src/models/churn_explain.py
+if __package__ in (None, ''):
+    sys.path.append(str(Path(__file__).resolve().parents[2]))
+
+from src.data.storage import read_table
+from src.models.artifacts import load_xgboost_model, resolve_model_path
+from src.models.churn_inference import ChurnInferenceEngine
+from src.models.feature_store import FEATURE_COLUMNS, CustomerFeatureStore, CustomerIndex
+from src.utils.model_cache import file_fingerprint
+
+
+DEFAULT_CUSTOMERS_PATH = 'data/processed/customer_features.csv'
+DEFAULT_MODEL_PATH = 'models/churn_model.pkl'
+DEFAULT_SHAP_PATH = 'data/processed/churn_shap.npz'
+DEFAULT_THRESHOLD = 0.5
+DEFAULT_SHAP_CHUNKSIZE = 10_000
+
+
+def build_explainer(model):
+    """
+    Crea el TreeExplainer de SHAP para el modelo de churn.
+
+    Args:
+        model (XGBClassifier): Modelo entrenado
+
+    Returns:
+        shap.TreeExplainer: Explainer (construirlo una vez por modelo)
+    """
+    import shap
+
+    return shap.TreeExplainer(model)
+
+
+def explain(explainer, features) -> tuple:
+    """
+    Valores SHAP (clase churn) de una matriz de features.
+
+    Args:
+        explainer (shap.TreeExplainer): Explainer de build_explainer
+        features (np.ndarray | pd.DataFrame): Features en orden FEATURE_COLUMNS
+
+    Returns:
+        tuple: (valores (n, n_features) float32, valor base float)
+    """
+    values = explainer.shap_values(features)
+    base_value = explainer.expected_value
+
+    # Algunas versiones devuelven una lista por clase: usar la clase churn (1)
+    if isinstance(values, list):
+        values = values[1]
+    base_value = np.ravel(base_value)
+    base_value = base_value[1] if len(base_value) > 1 else base_value[0]
+    return np.asarray(values, dtype=np.float32).reshape(len(features), -1), float(base_value)
+
+
+class ShapStore:
+    """
+    Valores SHAP precalculados, indexados por customer_id.
+
+    Attributes:
+        customer_ids (np.ndarray): Clientes explicados
+        values (np.ndarray): Valores SHAP (n, n_features) float32
+        data (np.ndarray): Features de cada cliente (n, n_features) float32
+        probability (np.ndarray): Probabilidad de churn de cada cliente
+        base_value (float): Valor esperado del modelo (log-odds)
+        feature_names (list): Nombres de las features
+        model_version (tuple): Huella del modelo con el que se calcularon
+        data_version (tuple): Huella del archivo de clientes con el que se calcularon
+        threshold (float): Umbral de probabilidad usado al precalcular
+    """
+
+    def __init__(self, customer_ids, values, data, probability, base_value,
+                 feature_names=FEATURE_COLUMNS, model_version=(), data_version=(), threshold=None):
+        self.customer_ids = np.asarray(customer_ids)
+        self.values = np.asarray(values, dtype=np.float32)
+        self.data = np.asarray(data, dtype=np.float32)
+        self.probability = np.asarray(probability, dtype=np.float32)
+        self.base_value = float(base_value)
+        self.feature_names = list(feature_names)
+        self.model_version = tuple(model_version)
+        self.data_version = tuple(data_version)
+        self.threshold = threshold
+        self.index = CustomerIndex(self.customer_ids)
+
+    def __len__(self):
+        return len(self.customer_ids)
+
+    def __contains__(self, customer_id):
+        return customer_id in self.index
+
+    def save(self, path) -> Path:
+        """Guarda el almacén en un .npz (sin pickle)."""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, 'wb') as f:
+            np.savez(
+                f,
+                customer_ids=self.customer_ids,
+                values=self.values,
+                data=self.data,
+                probability=self.probability,
+                base_value=np.float64(self.base_value),
+                feature_names=np.array(self.feature_names),
+                model_version=np.array([str(v) for v in self.model_version]),
+                data_version=np.array([str(v) for v in self.data_version]),
+                threshold=np.float64(np.nan if self.threshold is None else self.threshold),
+            )
+        return path
+
+    @classmethod
+    def load(cls, path) -> 'ShapStore':
+        """
+        Carga un almacén guardado con save().
+
+        Raises:
+            FileNotFoundError: Si el archivo no existe
+        """
+        path = Path(path)
+        if not path.exists():
+            raise FileNotFoundError(f"❌ Almacén SHAP no encontrado: {path}")
+
+        with np.load(path, allow_pickle=False) as npz:
+            threshold = float(npz['threshold'])
+            return cls(
+                customer_ids=npz['customer_ids'],
+                values=npz['values'],
+                data=npz['data'],
+                probability=npz['probability'],
+                base_value=float(npz['base_value']),
+                feature_names=npz['feature_names'].tolist(),
+                model_version=tuple(npz['model_version'].tolist()),
+                # Almacenes anteriores sin huella de datos: nunca se consideran actuales
+                data_version=tuple(npz['data_version'].tolist()) if 'data_version' in npz else (),
+                threshold=None if np.isnan(threshold) else threshold,
+            )
+
+    def is_current(self, model_path, customers_path) -> bool:
+        """
+        Indica si el almacén se calculó con las versiones actuales del modelo y
+        del archivo de clientes (si cambia cualquiera de los dos, los valores
+        SHAP y las features guardadas ya no corresponden a los actuales).
+        """
+        model_version = file_fingerprint(resolve_model_path(model_path))
+        data_version = file_fingerprint(customers_path)
+        return (self.model_version == tuple(str(v) for v in model_version)
+                and self.data_version == tuple(str(v) for v in data_version))
+
+    def get(self, customer_id) -> dict:
+        """
+        Explicación precalculada de un cliente (búsqueda O(1)).
+
+        Returns:
+            dict: values, data, base_value, probability y feature_names
+
+        Raises:
+            KeyError: Si el cliente no está en el almacén
+        """
+        position = self.index.position(customer_id)
+        return {
+            'values': self.values[position],
+            'data': self.data[position],
+            'base_value': self.base_value,
+            'probability': float(self.probability[position]),
+            'feature_names': self.feature_names,
+        }
+
+    def global_importance(self) -> pd.DataFrame:
+        """
+        Importancia global: media de |SHAP| por feature sobre los clientes del almacén.
+
+        Returns:
+            pd.DataFrame: feature, mean_abs_shap (orden descendente)
+        """
+        return pd.DataFrame({
+            'feature': self.feature_names,
+            'mean_abs_shap': np.abs(self.values).mean(axis=0) if len(self) else 0.0,
+        }).sort_values('mean_abs_shap', ascending=False, ignore_index=True)
+
+
+def precompute_shap(customers_path=DEFAULT_CUSTOMERS_PATH, model_path=DEFAULT_MODEL_PATH,
+                    output_path=DEFAULT_SHAP_PATH, threshold=DEFAULT_THRESHOLD,
+                    chunksize=DEFAULT_SHAP_CHUNKSIZE) -> ShapStore:
+    """
+    Calcula los valores SHAP de todos los clientes con probabilidad > threshold.
+
+    Args:
+        customers_path: Archivo de clientes (customer_id, frequency, monetary)
+        model_path: Modelo de churn (.pkl o .zip)
+        output_path: Archivo .npz de salida
+        threshold (float): Umbral de probabilidad (0 = todos los clientes)
+        chunksize (int): Clientes por llamada a SHAP
+
+    Returns:
+        ShapStore: Almacén guardado en output_path
+
+    Raises:
+        FileNotFoundError: Si no existen los clientes o el modelo
+    """
+    model_path = resolve_model_path(model_path)
+    model = load_xgboost_model(model_path)
+
+    print(f"📂 Cargando clientes desde {customers_path}...")
+    # Huella antes de leer: si el archivo cambia durante el cálculo, el almacén queda obsoleto
+    data_version = file_fingerprint(customers_path)
+    store = CustomerFeatureStore(read_table(customers_path, columns=['customer_id', 'frequency', 'monetary']))
+    store.score(ChurnInferenceEngine(model))
+    positions = store.positions_above(threshold)
+    print(f"✓ {len(positions):,} de {len(store):,} clientes con probabilidad > {threshold:.0%}")
+
+    explainer = build_explainer(model)
+    values = np.empty((len(positions), len(FEATURE_COLUMNS)), dtype=np.float32)
+    base_value = float(np.ravel(explainer.expected_value)[-1])
+
+    start = time.perf_counter()
+    for begin in range(0, len(positions), chunksize):
+        chunk = positions[begin:begin + chunksize]
+        values[begin:begin + len(chunk)], base_value = explain(explainer, store.features[chunk])
+        done = begin + len(chunk)
+        print(f"  ✓ SHAP {done:,}/{len(positions):,} ({done / (time.perf_counter() - start):,.0f} clientes/s)")
+
+    shap_store = ShapStore(
+        customer_ids=store.customer_ids[positions],
+        values=values,
+        data=store.features[positions],
+        probability=store.probability[positions],
+        base_value=base_value,
+        model_version=tuple(str(v) for v in file_fingerprint(model_path)),
+        data_version=tuple(str(v) for v in data_version),
+        threshold=threshold,
+    )
+    shap_store.save(output_path)
+    print(f"✅ Valores SHAP guardados en {output_path} ({time.perf_counter() - start:.1f}s)")
+    return shap_store
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    """Parse command-line options for SHAP precomputation."""
+    parser = argparse.ArgumentParser(description="Precálculo de valores SHAP de churn.")
+    parser.add_argument('--input', default=DEFAULT_CUSTOMERS_PATH,
+                        help="Archivo de clientes (customer_id, frequency, monetary)")
+    parser.add_argument('--model', default=DEFAULT_MODEL_PATH,
+                        help="Modelo de churn (.pkl o artefacto .zip)")
+    parser.add_argument('--output', default=DEFAULT_SHAP_PATH, help="Archivo .npz de salida")
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help="Solo clientes con probabilidad > threshold (0 = todos)")
+    parser.add_argument('--chunksize', type=int, default=DEFAULT_SHAP_CHUNKSIZE,
+                        help="Clientes por llamada a SHAP")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    shap_store = precompute_shap(
+        customers_path=args.input,
+        model_path=args.model,
+        output_path=args.output,
+        threshold=args.threshold,
+        chunksize=args.chunksize
+    )
+    print("\nImportancia global (media de |SHAP|):")
+    for _, row in shap_store.global_importance().iterrows():
+        print(f"  {row['feature']:15} {row['mean_abs_shap']:.4f}")
+
+
+if __name__ == "__main__":
+    main()
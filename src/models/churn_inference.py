@@ -0,0 +1,150 @@
+"""
+Churn Inference Module
+Motor de inferencia para el modelo de churn sin pasar por el wrapper de
+scikit-learn: ``Booster.inplace_predict`` sobre arrays float32 contiguos con
+un número de hilos configurable.
+
+Opcionalmente el modelo se compila a código nativo con tl2cgen
+(``pip install tl2cgen``, requiere un compilador de C). La librería compilada
+se guarda en disco indexada por el contenido del modelo, así que solo se
+compila la primera vez.
+"""
+
+import hashlib
+import os
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+
+BACKENDS = ('xgboost', 'tl2cgen')
+
+# Librerías compiladas por tl2cgen: <DEFAULT_LIB_DIR>/churn_<hash del modelo>.<ext>
+DEFAULT_LIB_DIR = 'models/compiled'
+TOOLCHAIN = 'gcc'
+LIB_SUFFIX = {'win32': '.dll', 'darwin': '.dylib'}.get(sys.platform, '.so')
+
+
+def to_feature_matrix(X, feature_names=None) -> np.ndarray:
+    """
+    Convierte features a una matriz float32 contigua (C-order).
+
+    Args:
+        X (pd.DataFrame | np.ndarray): Features de clientes
+        feature_names (list, optional): Orden de columnas del modelo; si X es
+            un DataFrame se reordena con él
+
+    Returns:
+        np.ndarray: Matriz (n_filas, n_features) float32
+    """
+    if isinstance(X, pd.DataFrame):
+        if feature_names is not None:
+            X = X[list(feature_names)]
+        X = X.to_numpy(dtype=np.float32)
+    return np.ascontiguousarray(X, dtype=np.float32)
+
+
+class ChurnInferenceEngine:
+    """
+    Predicción de probabilidades de churn directamente sobre el Booster.
+
+    Attributes:
+        booster (xgboost.Booster): Copia del booster con ``nthread`` fijado
+        feature_names (list): Orden de columnas esperado
+        nthread (int): Hilos de inferencia
+        backend (str): 'xgboost' (inplace_predict) o 'tl2cgen' (código compilado)
+    """
+
+    def __init__(self, model, nthread=None, backend='xgboost', lib_dir=DEFAULT_LIB_DIR):
+        """
+        Inicializa el motor de inferencia.
+
+        Args:
+            model (XGBClassifier | xgboost.Booster): Modelo entrenado
+            nthread (int, optional): Hilos de inferencia (por defecto todos los núcleos)
+            backend (str): 'xgboost' o 'tl2cgen' (requiere el paquete tl2cgen)
+            lib_dir (str): Directorio de las librerías compiladas por tl2cgen
+
+        Raises:
+            ValueError: Si el backend no es válido
+            ImportError: Si se pide 'tl2cgen' y no está instalado
+        """
+        if backend not in BACKENDS:
+            raise ValueError(f"❌ Backend no válido: {backend}. Opciones: {', '.join(BACKENDS)}")
+
+        booster = model.get_booster() if hasattr(model, 'get_booster') else model
+        # Copia: no modificar el booster del modelo (puede estar compartido en caché)
+        self.booster = booster.copy()
+        self.nthread = nthread or os.cpu_count() or 1
+        self.booster.set_param({'nthread': self.nthread})
+        self.feature_names = self.booster.feature_names
+        self.backend = backend
+        self._compiled = self._compile(Path(lib_dir)) if backend == 'tl2cgen' else None
+
+    def _compile(self, lib_dir):
+        """
+        Compila el booster con tl2cgen y carga la librería resultante.
+
+        Si ya existe una librería para el mismo modelo (mismo contenido y
+        versión de tl2cgen) se reutiliza sin volver a compilar.
+
+        Returns:
+            tl2cgen.Predictor: Predictor sobre la librería compilada
+        """
+        try:
+            import tl2cgen
+            import treelite
+        except ImportError:
+            raise ImportError("tl2cgen no está instalado. Ejecuta: pip install tl2cgen")
+
+        digest = hashlib.sha256(bytes(self.booster.save_raw('ubj')))
+        digest.update(tl2cgen.__version__.encode())
+        lib_path = lib_dir / f"churn_{digest.hexdigest()[:16]}{LIB_SUFFIX}"
+
+        if not lib_path.exists():
+            lib_dir.mkdir(parents=True, exist_ok=True)
+            # Compilar en un temporal y renombrar: otro proceso nunca carga una librería a medias
+            tmp_path = lib_dir / f".{lib_path.stem}.{os.getpid()}.tmp{LIB_SUFFIX}"
+            try:
+                tl2cgen.export_lib(treelite.frontend.from_xgboost(self.booster),
+                                   toolchain=TOOLCHAIN, libpath=tmp_path, nthread=self.nthread)
+                os.replace(tmp_path, lib_path)
+            finally:
+                if tmp_path.exists():
+                    tmp_path.unlink()
+
+        # OpenMP no admite más hilos que núcleos
+        return tl2cgen.Predictor(lib_path, nthread=min(self.nthread, os.cpu_count() or 1))
+
+    def predict_proba(self, X) -> np.ndarray:
+        """
+        Predice la probabilidad de churn.
+
+        Args:
+            X (pd.DataFrame | np.ndarray): Features en el orden de feature_names
+
+        Returns:
+            np.ndarray: Probabilidades de churn (float32, una por fila)
+        """
+        data = to_feature_matrix(X, self.feature_names)
+        if self._compiled is not None:
+            import tl2cgen
+            return self._compiled.predict(tl2cgen.DMatrix(data)).ravel()
+
+        # binary:logistic -> inplace_predict ya devuelve la probabilidad
+        return self.booster.inplace_predict(data, validate_features=False)
+
+    def predict(self, X, threshold=0.5) -> np.ndarray:
+        """
+        Clasificación binaria a partir de la probabilidad.
+
+        Args:
+            X (pd.DataFrame | np.ndarray): Features de clientes
+            threshold (float): Umbral de churn
+
+        Returns:
+            np.ndarray: Predicciones (0 = No churn, 1 = Churn)
+        """
+        return (self.predict_proba(X) > threshold).astype(int)
@@ -4,8 +4,8 @@ Utiliza XGBoost para identificar clientes en riesgo de abandono
 """
 
 import pandas as pd
-import pickle
 import os
+import sys
 import numpy as np
 from pathlib import Path
 from xgboost import XGBClassifier
@@ -22,6 +22,20 @@ from sklearn.metrics import (
 )
 import warnings
 
+# Permitir la ejecución directa: python src/models/churn_predictor.py
+if __package__ in (None, ''):
+    sys.path.append(str(Path(__file__).resolve().parents[2]))
+
+from src.data.storage import read_table
+from src.models.artifacts import load_xgboost_model, read_metadata, resolve_model_path, save_xgboost_model
+from src.models.churn_inference import ChurnInferenceEngine
+from src.models.feature_store import (
+    FEATURE_COLUMNS,
+    CustomerFeatureStore,
+    build_churn_features,
+)
+from src.models.similar_customers import SimilarCustomerIndex
+
 warnings.filterwarnings('ignore', category=DeprecationWarning)
 warnings.filterwarnings('ignore', category=FutureWarning)
 
@@ -33,21 +47,27 @@ class ChurnPredictor:
     Attributes:
         model (XGBClassifier): Modelo XGBoost entrenado
         data_path (str): Ruta del archivo de datos procesados
-        model_path (str): Ruta donde guardar el modelo entrenado
+        model_path (str): Ruta donde guardar el modelo entrenado (.pkl o artefacto .zip)
         feature_names (list): Nombres de las features utilizadas
         metrics (dict): Métricas de rendimiento del modelo
+        engine (ChurnInferenceEngine): Motor de inferencia sobre el Booster
+        feature_store (CustomerFeatureStore): Clientes puntuados indexados por customer_id
+        similarity_index (SimilarCustomerIndex): KD-tree de clientes similares
     """
     
     def __init__(self, data_path='data/processed/customer_features.csv',
                  model_path='models/churn_model.pkl',
-                 random_state=42):
+                 random_state=42, nthread=None, backend='xgboost'):
         """
         Inicializa el predictor de churn.
         
         Args:
-            data_path (str): Ruta del archivo CSV con datos de clientes
-            model_path (str): Ruta donde guardar el modelo
+            data_path (str): Ruta del archivo con datos de clientes (CSV, Parquet o Feather)
+            model_path (str): Ruta donde guardar el modelo (.pkl; con .zip se guarda
+                el artefacto sin pickle, ver src.models.artifacts)
             random_state (int): Seed para reproducibilidad
+            nthread (int, optional): Hilos de inferencia (por defecto todos los núcleos)
+            backend (str): Motor de inferencia: 'xgboost' o 'tl2cgen'
         """
         self.data_path = data_path
         self.model_path = model_path
@@ -55,6 +75,11 @@ class ChurnPredictor:
         self.model = None
         self.feature_names = None
         self.metrics = {}
+        self.nthread = nthread
+        self.backend = backend
+        self.engine = None
+        self.feature_store = None
+        self.similarity_index = None
         self.X_test = None
         self.y_test = None
         
@@ -75,29 +100,16 @@ class ChurnPredictor:
         Returns:
             tuple: (X, y, feature_names)
         """
-        df_features = df.copy()
-        
         # Calcular avg_ticket (ticket promedio por transacción)
-        # Evitar división por cero
-        df_features['avg_ticket'] = np.where(
-            df_features['frequency'] > 0,
-            df_features['monetary'] / df_features['frequency'],
-            0
-        )
-        
-        # Crear target: is_churn = 1 si recency > 90 días, 0 si no
-        # Esto significa que el cliente no ha comprado en más de 90 días
-        df_features['is_churn'] = (df_features['recency'] > 90).astype(int)
-        
-        # Features para el modelo
         # IMPORTANTE: No incluir 'recency' porque sería data leakage
         # (el target se define directamente de recency)
-        feature_cols = ['frequency', 'monetary', 'avg_ticket']
+        X = build_churn_features(df)
         
-        X = df_features[feature_cols]
-        y = df_features['is_churn']
+        # Crear target: is_churn = 1 si recency > 90 días, 0 si no
+        # Esto significa que el cliente no ha comprado en más de 90 días
+        y = (df['recency'] > 90).astype(int).rename('is_churn')
         
-        return X, y, feature_cols
+        return X, y, list(FEATURE_COLUMNS)
     
     def train(self, test_size=0.2):
         """
@@ -117,11 +129,8 @@ class ChurnPredictor:
         """
         print("📊 Iniciando entrenamiento del modelo de Churn...")
         
-        # 1. Cargar datos
-        if not os.path.exists(self.data_path):
-            raise FileNotFoundError(f"❌ Archivo no encontrado: {self.data_path}")
-        
-        df = pd.read_csv(self.data_path)
+        # 1. Cargar datos (solo las columnas que usa el modelo)
+        df = read_table(self.data_path, columns=['recency', 'frequency', 'monetary'])
         print(f"✓ Datos cargados: {len(df)} clientes")
         
         # 2. Crear features y target
@@ -169,14 +178,19 @@ class ChurnPredictor:
         with warnings.catch_warnings():
             warnings.simplefilter("ignore")
             self.model.fit(X_train, y_train)
+        self._reset_model_state()
         
         # 5. Calcular métricas
         print("📈 Calculando métricas...")
         self._calculate_metrics(X_train, y_train, X_test, y_test)
         
-        # 6. Guardar modelo
-        with open(self.model_path, 'wb') as f:
-            pickle.dump(self.model, f)
+        # 6. Guardar modelo (booster nativo + cabecera con features y métricas)
+        save_xgboost_model(self.model, self.model_path, metadata={
+            'feature_names': self.feature_names,
+            'metrics': self.metrics,
+            'training_rows': len(X_train),
+            'data_path': str(self.data_path),
+        })
         
         print(f"✅ Modelo entrenado y guardado en: {self.model_path}")
     
@@ -243,20 +257,107 @@ class ChurnPredictor:
         ))
         print("="*70)
     
+    def _reset_model_state(self):
+        """
+        Descarta el estado derivado del modelo anterior: el motor de inferencia
+        y el feature store puntuado con él (y su índice de similitud). Hay que
+        volver a llamar a load_feature_store() con el modelo nuevo.
+        """
+        self.engine = None
+        self.feature_store = None
+        self.similarity_index = None
+    
+    def get_inference_engine(self):
+        """
+        Devuelve el motor de inferencia, creándolo la primera vez.
+        
+        Returns:
+            ChurnInferenceEngine: Motor con el nthread y backend configurados
+        """
+        if self.model is None:
+            raise RuntimeError("❌ El modelo no ha sido entrenado.")
+        
+        if self.engine is None:
+            self.engine = ChurnInferenceEngine(self.model, nthread=self.nthread, backend=self.backend)
+        return self.engine
+    
     def predict_churn_probability(self, X):
         """
         Predice la probabilidad de churn para nuevos clientes.
         
+        Usa Booster.inplace_predict sobre float32 (o el modelo compilado con
+        tl2cgen) en lugar de XGBClassifier.predict_proba, evitando construir
+        un DMatrix por llamada.
+        
         Args:
-            X (pd.DataFrame): Features de clientes
+            X (pd.DataFrame | np.ndarray): Features de clientes
             
         Returns:
             np.ndarray: Probabilidades de churn (0 a 1)
         """
-        if self.model is None:
-            raise RuntimeError("❌ El modelo no ha sido entrenado.")
+        return self.get_inference_engine().predict_proba(X)
+    
+    def load_feature_store(self, customers=None):
+        """
+        Construye y puntúa el feature store de clientes.
         
-        return self.model.predict_proba(X)[:, 1]
+        Args:
+            customers (pd.DataFrame, optional): Clientes; por defecto se leen de data_path
+            
+        Returns:
+            CustomerFeatureStore: Store con probabilidad y ranking por cliente
+        """
+        if customers is None:
+            customers = read_table(self.data_path)
+        
+        store = CustomerFeatureStore(customers)
+        store.score(self.get_inference_engine())
+        self.feature_store = store
+        self.similarity_index = None
+        return store
+    
+    def predict_customer(self, customer_id):
+        """
+        Probabilidad de churn de un cliente del feature store (búsqueda O(1)).
+        
+        Args:
+            customer_id: Identificador del cliente
+            
+        Returns:
+            float: Probabilidad de churn
+            
+        Raises:
+            RuntimeError: Si no se ha cargado el feature store
+            KeyError: Si el cliente no existe
+        """
+        if self.feature_store is None:
+            raise RuntimeError("❌ Feature store no cargado. Ejecuta load_feature_store() primero.")
+        
+        return self.feature_store.get_probability(customer_id)
+    
+    def find_similar_customers(self, customer_id, k=10):
+        """
+        Clientes más parecidos a uno dado (recency, frequency, monetary, avg_ticket escaladas).
+        
+        El KD-tree se construye en la primera llamada y se reutiliza.
+        
+        Args:
+            customer_id: Cliente de referencia
+            k (int): Número de vecinos
+            
+        Returns:
+            pd.DataFrame: Vecinos ordenados por distancia, con su probabilidad de churn
+            
+        Raises:
+            RuntimeError: Si no se ha cargado el feature store
+            KeyError: Si el cliente no existe
+        """
+        if self.feature_store is None:
+            raise RuntimeError("❌ Feature store no cargado. Ejecuta load_feature_store() primero.")
+        
+        if self.similarity_index is None:
+            self.similarity_index = SimilarCustomerIndex(self.feature_store)
+        return self.similarity_index.similar_to(customer_id, k=k)
     
     def predict(self, X):
         """
@@ -271,7 +372,7 @@ class ChurnPredictor:
         if self.model is None:
             raise RuntimeError("❌ El modelo no ha sido entrenado.")
         
-        return self.model.predict(X)
+        return self.get_inference_engine().predict(X)
     
     def get_feature_importance(self):
         """
@@ -295,20 +396,24 @@ class ChurnPredictor:
         """
         Carga un modelo previamente entrenado.
         
+        Con un artefacto .zip las features y métricas se leen de su cabecera.
+        Si model_path no existe se carga el .zip o el .pkl con el mismo nombre.
+        
         Raises:
             FileNotFoundError: Si el archivo del modelo no existe
         """
-        if not os.path.exists(self.model_path):
-            raise FileNotFoundError(f"❌ Modelo no encontrado: {self.model_path}")
+        path = resolve_model_path(self.model_path)
+        self.model = load_xgboost_model(path)
+        self._reset_model_state()
         
-        with open(self.model_path, 'rb') as f:
-            self.model = pickle.load(f)
+        metadata = read_metadata(path)
+        self.metrics = metadata.get('metrics', self.metrics)
         
         # Inicializar feature_names si no están disponibles
         if self.feature_names is None:
-            self.feature_names = ['frequency', 'monetary', 'avg_ticket']
+            self.feature_names = metadata.get('feature_names', list(FEATURE_COLUMNS))
         
-        print(f"✅ Modelo cargado desde: {self.model_path}")
+        print(f"✅ Modelo cargado desde: {path}")
 
 
 if __name__ == "__main__":
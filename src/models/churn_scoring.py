@@ -0,0 +1,137 @@
+"""
+Batch Churn Scoring Module
+Calcula la probabilidad de churn de un archivo de clientes completo por
+chunks, con memoria acotada, y la guarda en un archivo columnar
+
+Uso (desde la raíz del proyecto):
+    python -m src.models.churn_scoring --input data/processed/customer_features.csv \\
+        --output data/processed/churn_scores.parquet --chunksize 500000
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import pandas as pd
+
+# Permitir la ejecución directa: python src/models/churn_scoring.py
+if __package__ in (None, ''):
+    sys.path.append(str(Path(__file__).resolve().parents[2]))
+
+from src.data.preprocessing import DTYPE_POLICY
+from src.data.storage import TableWriter, available_formats, iter_table
+from src.models.artifacts import load_xgboost_model
+from src.models.churn_inference import BACKENDS, ChurnInferenceEngine
+from src.models.feature_store import churn_feature_matrix
+
+
+DEFAULT_INPUT_PATH = 'data/processed/customer_features.csv'
+DEFAULT_OUTPUT_PATH = 'data/processed/churn_scores.parquet'
+DEFAULT_MODEL_PATH = 'models/churn_model.pkl'
+DEFAULT_SCORING_CHUNKSIZE = 500_000
+
+# Columnas que se leen del archivo de clientes
+SCORING_COLUMNS = ['customer_id', 'frequency', 'monetary']
+
+
+def score_customers(input_path=DEFAULT_INPUT_PATH, output_path=DEFAULT_OUTPUT_PATH,
+                    model_path=DEFAULT_MODEL_PATH, chunksize=DEFAULT_SCORING_CHUNKSIZE,
+                    model=None, nthread=None, backend='xgboost') -> dict:
+    """
+    Puntúa todos los clientes de ``input_path`` y escribe customer_id, probability.
+
+    Solo un chunk de clientes y sus probabilidades están en memoria a la vez.
+    Cada chunk pasa directamente a la matriz float32 de features (avg_ticket
+    calculado igual que en el entrenamiento), sin índice ni ranking.
+
+    Args:
+        input_path: Archivo de clientes (CSV, Parquet o Feather) con
+            customer_id, frequency y monetary
+        output_path: Archivo de salida; su sufijo define el formato
+        model_path: Modelo de churn (.pkl o .zip)
+        chunksize: Clientes por chunk
+        model (XGBClassifier, optional): Modelo ya cargado (ignora model_path)
+        nthread (int, optional): Hilos de inferencia (por defecto todos los núcleos)
+        backend (str): Motor de inferencia: 'xgboost' o 'tl2cgen'
+
+    Returns:
+        dict: rows, seconds, rows_per_second y output_path
+
+    Raises:
+        FileNotFoundError: Si no existe el archivo de clientes o el modelo
+        ValueError: Si chunksize no es positivo
+    """
+    if chunksize < 1:
+        raise ValueError("❌ chunksize debe ser >= 1")
+
+    if model is None:
+        model = load_xgboost_model(model_path)
+    engine = ChurnInferenceEngine(model, nthread=nthread, backend=backend)
+
+    chunks = iter_table(
+        input_path,
+        chunksize=chunksize,
+        columns=SCORING_COLUMNS,
+        dtype={col: DTYPE_POLICY[col] for col in SCORING_COLUMNS if col in DTYPE_POLICY}
+    )
+
+    print(f"🔮 Puntuando clientes de {input_path} en chunks de {chunksize:,}...")
+    start = time.perf_counter()
+    with TableWriter(output_path) as writer:
+        for i, chunk in enumerate(chunks, start=1):
+            proba = engine.predict_proba(churn_feature_matrix(chunk['frequency'], chunk['monetary']))
+
+            writer.write(pd.DataFrame({
+                'customer_id': chunk['customer_id'].to_numpy(),
+                'probability': proba.astype('float32'),
+            }))
+
+            elapsed = time.perf_counter() - start
+            print(f"  ✓ Chunk {i}: {len(chunk):,} clientes "
+                  f"({writer.rows_written:,} acumulados, {writer.rows_written / elapsed:,.0f} filas/s)")
+
+    elapsed = time.perf_counter() - start
+    stats = {
+        'rows': writer.rows_written,
+        'seconds': elapsed,
+        'rows_per_second': writer.rows_written / elapsed if elapsed > 0 else float('inf'),
+        'output_path': str(writer.path),
+    }
+    print(f"✅ {stats['rows']:,} clientes puntuados en {elapsed:.2f}s "
+          f"({stats['rows_per_second']:,.0f} filas/s) -> {writer.path}")
+    return stats
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    """Parse command-line options for batch scoring."""
+    parser = argparse.ArgumentParser(description="Puntuación de churn por lotes.")
+    parser.add_argument('--input', default=DEFAULT_INPUT_PATH,
+                        help="Archivo de clientes (customer_id, frequency, monetary)")
+    parser.add_argument('--output', default=DEFAULT_OUTPUT_PATH,
+                        help=f"Archivo de salida ({', '.join(available_formats())} según el sufijo)")
+    parser.add_argument('--model', default=DEFAULT_MODEL_PATH,
+                        help="Modelo de churn (.pkl o artefacto .zip)")
+    parser.add_argument('--chunksize', type=int, default=DEFAULT_SCORING_CHUNKSIZE,
+                        help="Clientes por chunk (acota la memoria)")
+    parser.add_argument('--nthread', type=int, default=None,
+                        help="Hilos de inferencia (por defecto todos los núcleos)")
+    parser.add_argument('--backend', choices=BACKENDS, default='xgboost',
+                        help="Motor de inferencia (tl2cgen requiere pip install tl2cgen y un compilador de C)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    score_customers(
+        input_path=args.input,
+        output_path=args.output,
+        model_path=args.model,
+        chunksize=args.chunksize,
+        nthread=args.nthread,
+        backend=args.backend
+    )
+
+
+if __name__ == "__main__":
+    main()
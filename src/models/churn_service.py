@@ -0,0 +1,464 @@
+"""
+Churn Scoring Service
+Servicio HTTP (asyncio, sin dependencias externas) que carga el modelo de
+churn una sola vez y puntúa clientes individuales o micro-lotes.
+
+Las peticiones concurrentes se agrupan en una única llamada vectorizada al
+motor de inferencia (micro-batching) y se registran latencias p50/p99.
+
+Endpoints:
+    POST /score    {"customer_id": 1, "frequency": 5, "monetary": 320.5}
+                   o {"customers": [{...}, {...}]}
+    GET  /metrics  Latencias p50/p99, peticiones y tamaño medio de lote
+    GET  /health
+
+Uso (desde la raíz del proyecto):
+    python -m src.models.churn_service --port 8502
+"""
+
+import argparse
+import asyncio
+import http.client
+import json
+import sys
+import time
+from collections import deque
+from pathlib import Path
+
+import numpy as np
+
+# Permitir la ejecución directa: python src/models/churn_service.py
+if __package__ in (None, ''):
+    sys.path.append(str(Path(__file__).resolve().parents[2]))
+
+from src.models.churn_predictor import ChurnPredictor
+from src.models.feature_store import churn_feature_matrix
+
+
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8502
+DEFAULT_MAX_BATCH_SIZE = 256
+DEFAULT_MAX_WAIT_MS = 0.0
+# Latencias recientes usadas para los percentiles
+LATENCY_WINDOW = 10_000
+MAX_BODY_BYTES = 1_000_000
+
+HTTP_STATUS = {200: 'OK', 400: 'Bad Request', 404: 'Not Found', 413: 'Payload Too Large',
+               500: 'Internal Server Error'}
+
+
+class LatencyMetrics:
+    """
+    Latencias de las últimas peticiones y contadores del servicio.
+
+    Attributes:
+        latencies (deque): Latencias en segundos (ventana LATENCY_WINDOW)
+        requests (int): Peticiones de puntuación atendidas
+        rows (int): Clientes puntuados
+        batches (int): Llamadas vectorizadas al modelo
+    """
+
+    def __init__(self, window=LATENCY_WINDOW):
+        self.latencies = deque(maxlen=window)
+        self.requests = 0
+        self.rows = 0
+        self.batches = 0
+
+    def record_request(self, seconds: float, rows: int):
+        self.latencies.append(seconds)
+        self.requests += 1
+        self.rows += rows
+
+    def record_batch(self):
+        self.batches += 1
+
+    def snapshot(self) -> dict:
+        """
+        Resumen de métricas.
+
+        Returns:
+            dict: requests, rows, batches, avg_batch_rows, p50_ms, p99_ms
+        """
+        p50_ms = p99_ms = None
+        if self.latencies:
+            p50_ms, p99_ms = (np.percentile(self.latencies, [50, 99]) * 1000).tolist()
+        return {
+            'requests': self.requests,
+            'rows': self.rows,
+            'batches': self.batches,
+            'avg_batch_rows': self.rows / self.batches if self.batches else 0.0,
+            'p50_ms': p50_ms,
+            'p99_ms': p99_ms,
+        }
+
+
+class MicroBatcher:
+    """
+    Agrupa las peticiones pendientes en una sola llamada al motor de inferencia.
+
+    Cada petición espera en una cola; el bucle toma la primera, cede el turno
+    al event loop para que lleguen las concurrentes, vacía la cola hasta
+    max_batch_size filas (esperando como máximo max_wait_ms) y reparte las
+    probabilidades.
+    """
+
+    def __init__(self, engine, max_batch_size=DEFAULT_MAX_BATCH_SIZE,
+                 max_wait_ms=DEFAULT_MAX_WAIT_MS, metrics=None):
+        """
+        Args:
+            engine (ChurnInferenceEngine): Motor con predict_proba
+            max_batch_size (int): Filas máximas por llamada al modelo
+            max_wait_ms (float): Espera máxima para completar un lote
+            metrics (LatencyMetrics, optional): Métricas donde registrar los lotes
+        """
+        self.engine = engine
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        self.metrics = metrics or LatencyMetrics()
+        self._queue = None
+        self._task = None
+
+    def start(self):
+        self._queue = asyncio.Queue()
+        self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        # Peticiones que quedaron en cola: fallan en lugar de esperar para siempre
+        while self._queue is not None and not self._queue.empty():
+            _, future = self._queue.get_nowait()
+            if not future.done():
+                future.set_exception(RuntimeError("❌ Servicio detenido"))
+
+    async def score(self, features: np.ndarray) -> np.ndarray:
+        """
+        Encola una matriz de features y espera sus probabilidades.
+
+        Args:
+            features (np.ndarray): Matriz float32 (n, 3) de churn_feature_matrix
+
+        Returns:
+            np.ndarray: Probabilidades de churn (n,)
+        """
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((features, future))
+        return await future
+
+    async def _collect(self) -> list:
+        """Primera petición de la cola más las que lleguen hasta llenar el lote."""
+        batch = [await self._queue.get()]
+        rows = len(batch[0][0])
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.max_wait
+
+        # Ceder el turno: las conexiones ya leídas encolan sus peticiones
+        await asyncio.sleep(0)
+        while rows < self.max_batch_size:
+            try:
+                item = self._queue.get_nowait()
+            except asyncio.QueueEmpty:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    item = await asyncio.wait_for(self._queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+            batch.append(item)
+            rows += len(item[0])
+        return batch
+
+    async def _run(self):
+        while True:
+            batch = await self._collect()
+            try:
+                self._score_batch(batch)
+            except Exception as exc:
+                # Cualquier fallo del lote se propaga a todas sus peticiones
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(exc)
+
+    def _score_batch(self, batch: list):
+        """Una llamada al motor para todo el lote y reparto de los resultados."""
+        features = [item[0] for item in batch]
+        proba = np.asarray(self.engine.predict_proba(
+            features[0] if len(features) == 1 else np.concatenate(features)
+        ))
+        offsets = np.cumsum([len(f) for f in features])
+        if len(proba) != offsets[-1]:
+            raise RuntimeError(f"❌ El modelo devolvió {len(proba)} probabilidades para {offsets[-1]} filas")
+
+        self.metrics.record_batch()
+        for (_, future), result in zip(batch, np.split(proba, offsets[:-1])):
+            if not future.done():
+                future.set_result(result)
+
+
+def parse_customers(payload) -> tuple:
+    """
+    Valida el cuerpo de /score.
+
+    Args:
+        payload (dict): Un cliente o {"customers": [...]}, cada uno con
+            frequency y monetary (customer_id opcional)
+
+    Returns:
+        tuple: (customer_ids, features, single)
+
+    Raises:
+        ValueError: Si el cuerpo no tiene el formato esperado
+    """
+    if not isinstance(payload, dict):
+        raise ValueError("❌ El cuerpo debe ser un objeto JSON")
+
+    single = 'customers' not in payload
+    customers = [payload] if single else payload['customers']
+    if not isinstance(customers, list) or not customers:
+        raise ValueError("❌ 'customers' debe ser una lista no vacía")
+
+    try:
+        frequency = [float(c['frequency']) for c in customers]
+        monetary = [float(c['monetary']) for c in customers]
+    except (KeyError, TypeError, ValueError):
+        raise ValueError("❌ Cada cliente necesita 'frequency' y 'monetary' numéricos")
+
+    customer_ids = [c.get('customer_id') for c in customers]
+    return customer_ids, churn_feature_matrix(frequency, monetary), single
+
+
+class ChurnScoringService:
+    """
+    Servidor HTTP/1.1 (keep-alive) de puntuación de churn.
+
+    Attributes:
+        predictor (ChurnPredictor): Predictor con el modelo cargado
+        batcher (MicroBatcher): Agrupador de peticiones concurrentes
+        metrics (LatencyMetrics): Latencias y contadores
+        port (int): Puerto en escucha (el asignado si se pidió 0)
+    """
+
+    def __init__(self, predictor=None, host=DEFAULT_HOST, port=DEFAULT_PORT,
+                 max_batch_size=DEFAULT_MAX_BATCH_SIZE, max_wait_ms=DEFAULT_MAX_WAIT_MS):
+        """
+        Inicializa el servicio.
+
+        Args:
+            predictor (ChurnPredictor, optional): Predictor a usar; si no tiene
+                modelo se carga con load_model() al arrancar
+            host (str): Interfaz de escucha
+            port (int): Puerto (0 = puerto libre)
+            max_batch_size (int): Filas máximas por llamada al modelo
+            max_wait_ms (float): Espera máxima para completar un lote
+        """
+        self.predictor = predictor or ChurnPredictor()
+        self.host = host
+        self.port = port
+        self.max_batch_size = max_batch_size
+        self.max_wait_ms = max_wait_ms
+        self.metrics = LatencyMetrics()
+        self.batcher = None
+        self._server = None
+
+    async def start(self):
+        """Carga el modelo (una vez) y abre el socket."""
+        if self.predictor.model is None:
+            self.predictor.load_model()
+
+        self.batcher = MicroBatcher(
+            self.predictor.get_inference_engine(),
+            max_batch_size=self.max_batch_size,
+            max_wait_ms=self.max_wait_ms,
+            metrics=self.metrics
+        )
+        self.batcher.start()
+        self._server = await asyncio.start_server(self._handle_connection, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        print(f"🚀 Servicio de churn escuchando en http://{self.host}:{self.port}")
+
+    async def stop(self):
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+        if self.batcher is not None:
+            await self.batcher.stop()
+
+    async def serve_forever(self):
+        await self.start()
+        try:
+            await self._server.serve_forever()
+        finally:
+            await self.stop()
+
+    async def score(self, payload) -> dict:
+        """
+        Puntúa uno o varios clientes (lo que hace POST /score).
+
+        Args:
+            payload (dict): Cuerpo de la petición (ver parse_customers)
+
+        Returns:
+            dict: {"customer_id", "probability"} o {"predictions": [...]}
+        """
+        start = time.perf_counter()
+        customer_ids, features, single = parse_customers(payload)
+        proba = await self.batcher.score(features)
+        self.metrics.record_request(time.perf_counter() - start, len(features))
+
+        predictions = [
+            {'customer_id': customer_id, 'probability': float(p)}
+            for customer_id, p in zip(customer_ids, proba)
+        ]
+        return predictions[0] if single else {'predictions': predictions}
+
+    async def _route(self, method: str, path: str, body: bytes) -> tuple:
+        if method == 'POST' and path == '/score':
+            try:
+                return 200, await self.score(json.loads(body or b'null'))
+            except json.JSONDecodeError:
+                return 400, {'error': "❌ JSON no válido"}
+            except ValueError as exc:
+                return 400, {'error': str(exc)}
+        if method == 'GET' and path == '/metrics':
+            return 200, self.metrics.snapshot()
+        if method == 'GET' and path == '/health':
+            return 200, {'status': 'ok'}
+        return 404, {'error': f"❌ Ruta no encontrada: {method} {path}"}
+
+    @staticmethod
+    async def _respond(writer, status: int, response: dict, keep_alive: bool):
+        content = json.dumps(response).encode()
+        writer.write(
+            f"HTTP/1.1 {status} {HTTP_STATUS[status]}\r\n"
+            f"Content-Type: application/json\r\n"
+            f"Content-Length: {len(content)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode() + content
+        )
+        await writer.drain()
+
+    async def _handle_connection(self, reader, writer):
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                method, path, _ = request_line.decode('latin-1').split(' ', 2)
+
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b'\r\n', b'\n', b''):
+                        break
+                    name, _, value = line.decode('latin-1').partition(':')
+                    headers[name.strip().lower()] = value.strip()
+
+                length = int(headers.get('content-length', 0))
+                if length > MAX_BODY_BYTES:
+                    status, response = 413, {'error': "❌ Cuerpo demasiado grande"}
+                    keep_alive = False
+                else:
+                    body = await reader.readexactly(length) if length else b''
+                    keep_alive = headers.get('connection', '').lower() != 'close'
+                    try:
+                        status, response = await self._route(method, path.split('?', 1)[0], body)
+                    except Exception as exc:
+                        # Fallo del modelo o del servicio: se responde 500 y sigue la conexión
+                        status, response = 500, {'error': f"❌ Error interno: {exc}"}
+
+                await self._respond(writer, status, response, keep_alive)
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        except ValueError:
+            # Línea de petición o Content-Length mal formados
+            await self._respond_and_ignore(writer, 400, {'error': "❌ Petición HTTP no válida"})
+        except Exception as exc:
+            await self._respond_and_ignore(writer, 500, {'error': f"❌ Error interno: {exc}"})
+        finally:
+            writer.close()
+
+    async def _respond_and_ignore(self, writer, status: int, response: dict):
+        """Última respuesta antes de cerrar (el cliente puede haberse ido ya)."""
+        try:
+            await self._respond(writer, status, response, keep_alive=False)
+        except Exception:
+            pass
+
+
+class ChurnServiceClient:
+    """
+    Cliente síncrono (http.client, conexión persistente) para el servicio.
+    """
+
+    def __init__(self, host=DEFAULT_HOST, port=DEFAULT_PORT, timeout=10):
+        self.connection = http.client.HTTPConnection(host, port, timeout=timeout)
+
+    def _request(self, method, path, payload=None):
+        body = json.dumps(payload) if payload is not None else None
+        self.connection.request(method, path, body=body,
+                                headers={'Content-Type': 'application/json'})
+        response = self.connection.getresponse()
+        data = json.loads(response.read())
+        if response.status != 200:
+            raise RuntimeError(f"HTTP {response.status}: {data.get('error')}")
+        return data
+
+    def score(self, customers):
+        """
+        Puntúa un cliente (dict) o una lista de clientes.
+
+        Returns:
+            dict | list: Predicción o lista de predicciones
+        """
+        if isinstance(customers, dict):
+            return self._request('POST', '/score', customers)
+        return self._request('POST', '/score', {'customers': list(customers)})['predictions']
+
+    def metrics(self) -> dict:
+        return self._request('GET', '/metrics')
+
+    def close(self):
+        self.connection.close()
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    """Parse command-line options for the scoring service."""
+    parser = argparse.ArgumentParser(description="Servicio HTTP de puntuación de churn.")
+    parser.add_argument('--host', default=DEFAULT_HOST)
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT)
+    parser.add_argument('--model', default='models/churn_model.pkl',
+                        help="Modelo de churn (.pkl o artefacto .zip)")
+    parser.add_argument('--max-batch-size', type=int, default=DEFAULT_MAX_BATCH_SIZE,
+                        help="Filas máximas por llamada vectorizada al modelo")
+    parser.add_argument('--max-wait-ms', type=float, default=DEFAULT_MAX_WAIT_MS,
+                        help="Espera máxima para completar un micro-lote")
+    parser.add_argument('--nthread', type=int, default=None,
+                        help="Hilos de inferencia (por defecto todos los núcleos)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    service = ChurnScoringService(
+        predictor=ChurnPredictor(model_path=args.model, nthread=args.nthread),
+        host=args.host,
+        port=args.port,
+        max_batch_size=args.max_batch_size,
+        max_wait_ms=args.max_wait_ms
+    )
+    try:
+        asyncio.run(service.serve_forever())
+    except KeyboardInterrupt:
+        print("\n👋 Servicio detenido")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,345 @@
+"""
+Customer Feature Store
+Features del modelo de churn indexadas por customer_id: búsqueda O(1) de las
+features, la probabilidad y el ranking de riesgo de un cliente, sin recorrer
+el DataFrame.
+
+Se construye una vez al cargar los datos y lo comparten la página de Churn,
+el scoring por lotes (src.models.churn_scoring) y ChurnPredictor.
+"""
+
+import numpy as np
+import pandas as pd
+
+
+# Features del modelo, en el orden de entrenamiento
+FEATURE_COLUMNS = ['frequency', 'monetary', 'avg_ticket']
+
+
+def build_churn_features(df):
+    """
+    Construye la matriz de features del modelo a partir de datos de clientes.
+
+    avg_ticket = monetary / frequency (0 si frequency es 0), igual que en el
+    entrenamiento.
+
+    Args:
+        df (pd.DataFrame): Clientes con columnas frequency y monetary
+
+    Returns:
+        pd.DataFrame: Columnas FEATURE_COLUMNS con el mismo índice que df
+    """
+    return pd.DataFrame({
+        'frequency': df['frequency'],
+        'monetary': df['monetary'],
+        'avg_ticket': _avg_ticket(df['frequency'], df['monetary'])
+    }, index=df.index)
+
+
+def churn_feature_matrix(frequency, monetary):
+    """
+    Matriz float32 de features (orden FEATURE_COLUMNS) sin pasar por pandas.
+
+    Args:
+        frequency (array-like): Número de compras por cliente
+        monetary (array-like): Gasto total por cliente
+
+    Returns:
+        np.ndarray: Matriz (n_clientes, 3) contigua
+    """
+    frequency = np.asarray(frequency, dtype=np.float64)
+    monetary = np.asarray(monetary, dtype=np.float64)
+    return np.ascontiguousarray(
+        np.column_stack([frequency, monetary, _avg_ticket(frequency, monetary)]),
+        dtype=np.float32
+    )
+
+
+def _avg_ticket(frequency, monetary):
+    """monetary / frequency, 0 si frequency es 0 (evita división por cero)."""
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(frequency > 0, monetary / frequency, 0)
+
+
+def _stable_argsort(values, ascending=True) -> np.ndarray:
+    """argsort estable en ambos sentidos: los empates conservan su orden original."""
+    if ascending:
+        return np.argsort(values, kind='stable')
+    # Descendente: ordenar el array invertido y deshacer la inversión (sin negar,
+    # que no sirve para enteros sin signo)
+    return len(values) - 1 - np.argsort(values[::-1], kind='stable')[::-1]
+
+
+def _prefix_sum(values) -> np.ndarray:
+    """Sumas acumuladas en float64 con un 0 inicial: suma de los k primeros = out[k]."""
+    out = np.zeros(len(values) + 1, dtype=np.float64)
+    np.cumsum(values, dtype=np.float64, out=out[1:])
+    return out
+
+
+class CustomerIndex:
+    """
+    Índice customer_id -> posición con búsqueda O(1).
+
+    Si los customer_id son enteros densos el índice es un array de posiciones
+    (igual que ProductLookup); si no, un pd.Index (tabla hash).
+    """
+
+    # Límite de densidad: tamaño del array frente al número de clientes
+    MAX_SPARSITY = 16
+
+    def __init__(self, customer_ids):
+        """
+        Args:
+            customer_ids (array-like): customer_id por posición
+
+        Raises:
+            ValueError: Si hay customer_id duplicados
+        """
+        ids = np.asarray(customer_ids)
+        index = pd.Index(ids)
+        if not index.is_unique:
+            raise ValueError("❌ customer_id duplicados en el índice de clientes")
+
+        self._positions = index
+        if (pd.api.types.is_integer_dtype(ids) and len(ids)
+                and ids.min() >= 0 and ids.max() < self.MAX_SPARSITY * len(ids) + 1024):
+            self._positions = np.full(int(ids.max()) + 1, -1, dtype=np.int64)
+            self._positions[ids] = np.arange(len(ids))
+
+    def __contains__(self, customer_id):
+        try:
+            self.position(customer_id)
+        except KeyError:
+            return False
+        return True
+
+    def position(self, customer_id) -> int:
+        """
+        Posición de un cliente.
+
+        Raises:
+            KeyError: Si el cliente no existe
+        """
+        if isinstance(self._positions, pd.Index):
+            return self._positions.get_loc(customer_id)
+
+        if isinstance(customer_id, (int, np.integer)) and 0 <= customer_id < len(self._positions):
+            position = self._positions[customer_id]
+            if position >= 0:
+                return int(position)
+        raise KeyError(f"❌ Cliente no encontrado: {customer_id}")
+
+
+class CustomerFeatureStore:
+    """
+    Clientes, features, probabilidad de churn y ranking por posición, con un
+    índice customer_id -> posición.
+
+    El índice (CustomerIndex) se construye en la primera búsqueda, así que el
+    scoring por lotes no lo paga.
+
+    Attributes:
+        frame (pd.DataFrame): Clientes con avg_ticket, en orden posicional
+        customer_ids (np.ndarray): customer_id por posición
+        features (np.ndarray): Matriz float32 (n, 3) en orden FEATURE_COLUMNS
+        probability (np.ndarray): Probabilidad de churn por posición (tras score)
+        rank (np.ndarray): Ranking de riesgo por posición (1 = mayor probabilidad)
+        order (np.ndarray): Posiciones ordenadas de mayor a menor probabilidad
+        sorted_probability (np.ndarray): probability[order] (descendente)
+        cum_probability (np.ndarray): Sumas prefijas de sorted_probability (con 0 inicial)
+        cum_monetary (np.ndarray): Sumas prefijas de monetary en el mismo orden
+    """
+
+    def __init__(self, customers: pd.DataFrame):
+        """
+        Construye el store a partir de los datos de clientes.
+
+        Args:
+            customers: Clientes con customer_id, frequency y monetary (el
+                resto de columnas se conservan en frame)
+
+        Raises:
+            ValueError: Si faltan columnas o hay customer_id duplicados
+        """
+        missing = {'customer_id', 'frequency', 'monetary'} - set(customers.columns)
+        if missing:
+            raise ValueError(f"❌ Faltan columnas de clientes: {', '.join(sorted(missing))}")
+
+        self.frame = customers.reset_index(drop=True)
+        self.frame['avg_ticket'] = _avg_ticket(self.frame['frequency'], self.frame['monetary'])
+        self.customer_ids = self.frame['customer_id'].to_numpy()
+        self.features = churn_feature_matrix(self.frame['frequency'], self.frame['monetary'])
+        self.probability = None
+        self.rank = None
+        self.order = None
+        self.sorted_probability = None
+        self.cum_probability = None
+        self.cum_monetary = None
+        self._negated_probability = None
+        self._index = None
+
+    def __len__(self):
+        return len(self.customer_ids)
+
+    def __contains__(self, customer_id):
+        return customer_id in self.index
+
+    @property
+    def index(self) -> 'CustomerIndex':
+        """Índice customer_id -> posición (se construye en el primer acceso)."""
+        if self._index is None:
+            self._index = CustomerIndex(self.customer_ids)
+        return self._index
+
+    def position(self, customer_id) -> int:
+        """
+        Posición de un cliente en el store.
+
+        Raises:
+            KeyError: Si el cliente no existe
+        """
+        return self.index.position(customer_id)
+
+    def score(self, model) -> np.ndarray:
+        """
+        Calcula y guarda la probabilidad de churn y el ranking de todos los clientes.
+
+        Args:
+            model: ChurnInferenceEngine, ChurnPredictor o cualquier objeto con
+                predict_proba(X) que devuelva la probabilidad de churn por fila
+
+        Returns:
+            np.ndarray: Probabilidades por posición
+        """
+        if hasattr(model, 'get_inference_engine'):
+            model = model.get_inference_engine()
+        self.set_probability(model.predict_proba(self.features))
+        return self.probability
+
+    def set_probability(self, probability):
+        """
+        Guarda probabilidades ya calculadas y recalcula el ranking, el orden y
+        las sumas prefijas.
+
+        Args:
+            probability (array-like): Una probabilidad por cliente, en orden posicional
+        """
+        probability = np.asarray(probability)
+        if len(probability) != len(self):
+            raise ValueError(f"❌ Se esperaban {len(self)} probabilidades, hay {len(probability)}")
+
+        order = np.argsort(-probability, kind='stable')
+        self.rank = np.empty(len(order), dtype=np.int64)
+        self.rank[order] = np.arange(1, len(order) + 1)
+        self.order = order
+        self.sorted_probability = probability[order]
+        # Ascendente (negada una sola vez) para searchsorted en count_above
+        self._negated_probability = -self.sorted_probability
+        self.cum_probability = _prefix_sum(self.sorted_probability)
+        self.cum_monetary = _prefix_sum(self.frame['monetary'].to_numpy()[order])
+        self.probability = probability
+
+    def count_above(self, threshold: float) -> int:
+        """Número de clientes con probabilidad > threshold (búsqueda binaria, O(log n))."""
+        self._require_scores()
+        # Umbral en el dtype de las probabilidades: igual que probability > threshold
+        bound = np.asarray(threshold, dtype=self.sorted_probability.dtype)
+        return int(np.searchsorted(self._negated_probability, -bound, side='left'))
+
+    def positions_above(self, threshold: float) -> np.ndarray:
+        """
+        Posiciones de los clientes con probabilidad > threshold, de mayor a menor.
+
+        Es un prefijo de order (ya ordenado): sin volver a pasar por el modelo
+        ni ordenar.
+
+        Args:
+            threshold (float): Umbral de probabilidad
+
+        Returns:
+            np.ndarray: Posiciones (prefijo de order)
+        """
+        return self.order[:self.count_above(threshold)]
+
+    def risk_page(self, threshold: float, start: int = 0, stop: int = None,
+                  sort_by: str = None, ascending: bool = False) -> np.ndarray:
+        """
+        Posiciones de una página de clientes en riesgo, ordenados en el servidor.
+
+        Por probabilidad descendente es un slice de order; en otro caso se
+        ordenan solo los clientes en riesgo con un argsort estable, así que los
+        empates quedan en el orden de positions_above (igual que un
+        sort_values(kind='stable') de pandas sobre esas filas).
+
+        Args:
+            threshold (float): Umbral de probabilidad
+            start (int): Primera fila de la página
+            stop (int, optional): Fila final (exclusiva)
+            sort_by (str, optional): Columna de frame (por defecto la probabilidad)
+            ascending (bool): Orden ascendente
+
+        Returns:
+            np.ndarray: Posiciones de la página
+        """
+        count = self.count_above(threshold)
+        positions = self.order[:count]
+        if sort_by is None or sort_by == 'probability':
+            if not ascending:
+                return positions[start:stop]
+            values = self.sorted_probability[:count]
+        else:
+            values = self.frame[sort_by].to_numpy()[positions]
+
+        return positions[_stable_argsort(values, ascending)[start:stop]]
+
+    def risk_summary(self, threshold: float) -> dict:
+        """
+        Resumen de los clientes en riesgo en O(log n) con las sumas prefijas.
+
+        Args:
+            threshold (float): Umbral de probabilidad
+
+        Returns:
+            dict: count, monetary (dinero en riesgo) y avg_probability (0 si no hay clientes)
+        """
+        count = self.count_above(threshold)
+        return {
+            'count': count,
+            'monetary': float(self.cum_monetary[count]),
+            'avg_probability': float(self.cum_probability[count] / count) if count else 0.0,
+        }
+
+    def _require_scores(self):
+        if self.probability is None:
+            raise RuntimeError("❌ El feature store no tiene probabilidades. Ejecuta score() primero.")
+
+    def get_features(self, customer_id) -> np.ndarray:
+        """Features (1, 3) float32 de un cliente, listas para el modelo."""
+        position = self.position(customer_id)
+        return self.features[position:position + 1]
+
+    def get_probability(self, customer_id) -> float:
+        """Probabilidad de churn guardada de un cliente."""
+        self._require_scores()
+        return float(self.probability[self.position(customer_id)])
+
+    def get_rank(self, customer_id) -> int:
+        """Ranking de riesgo de un cliente (1 = mayor probabilidad)."""
+        self._require_scores()
+        return int(self.rank[self.position(customer_id)])
+
+    def get(self, customer_id) -> dict:
+        """
+        Registro completo de un cliente.
+
+        Returns:
+            dict: Columnas de frame más probability y rank (si hay scores)
+        """
+        position = self.position(customer_id)
+        # Por columna: iloc[position] convertiría todo a un único dtype
+        record = {column: values.iat[position] for column, values in self.frame.items()}
+        if self.probability is not None:
+            record['probability'] = float(self.probability[position])
+            record['rank'] = int(self.rank[position])
+        return record
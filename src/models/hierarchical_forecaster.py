@@ -0,0 +1,370 @@
+"""
+Hierarchical Sales Forecaster Module
+Entrena un modelo Prophet por serie (categoría, producto...) en paralelo y
+reconcilia los pronósticos para que las series sumen el total
+"""
+
+import os
+import sys
+import time
+import warnings
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# Permitir la ejecución directa: python src/models/hierarchical_forecaster.py
+if __package__ in (None, ''):
+    sys.path.append(str(Path(__file__).resolve().parents[2]))
+
+from src.data.preprocessing import DAILY_CATEGORY_SALES, load_daily_aggregate
+from src.data.storage import read_table
+from src.models.artifacts import (
+    prophet_files,
+    prophet_from_files,
+    read_artifact,
+    read_metadata,
+    write_artifact,
+)
+# sales_predictor configura el logging de Prophet antes de importarlo
+from src.models.sales_predictor import PROPHET_PARAMS, predict_future_dates
+
+from prophet import Prophet
+from prophet import __version__ as prophet_version
+
+
+# Tipo de modelo en la cabecera del artefacto (ver src.models.artifacts)
+HIERARCHY_MODEL_TYPE = 'prophet_hierarchy'
+
+# Nombre de la serie agregada (suma de todas las series del nivel)
+TOTAL_SERIES = 'total'
+
+RECONCILIATION_METHODS = ('bottom_up', 'proportional')
+
+MIN_TRAINING_DAYS = 30
+
+
+def build_series_frame(sales: pd.DataFrame, level: str, value_col: str = 'total_amount') -> pd.DataFrame:
+    """
+    Agrega las ventas diarias por serie en formato ancho.
+
+    Args:
+        sales: Ventas con columnas 'date', ``level`` y ``value_col``
+        level: Columna que define las series (p. ej. 'category', 'product_id')
+        value_col: Columna a sumar
+
+    Returns:
+        pd.DataFrame: Índice = fechas con ventas, una columna por serie
+            (0 en los días sin ventas de esa serie)
+    """
+    daily = (
+        sales.groupby(['date', level], observed=True)[value_col].sum()
+        .unstack(level, fill_value=0.0)
+        .astype('float64')
+        .sort_index()
+    )
+    daily.columns = daily.columns.astype(str)
+    daily.columns.name = None
+    return daily
+
+
+def reconcile_forecasts(base: pd.DataFrame, method: str = 'bottom_up') -> pd.DataFrame:
+    """
+    Reconcilia pronósticos base para que las series sumen el total.
+
+    - 'bottom_up': el total es la suma de los pronósticos de cada serie.
+    - 'proportional': se conserva el pronóstico del modelo total y cada
+      serie se escala según su proporción en la suma de las series.
+
+    Args:
+        base: Pronósticos por fecha, una columna por serie más TOTAL_SERIES
+        method: Uno de RECONCILIATION_METHODS
+
+    Returns:
+        pd.DataFrame: Pronósticos coherentes con las mismas columnas
+
+    Raises:
+        ValueError: Si el método no es válido
+    """
+    if method not in RECONCILIATION_METHODS:
+        raise ValueError(
+            f"❌ Método de reconciliación no válido: '{method}'. "
+            f"Opciones: {', '.join(RECONCILIATION_METHODS)}"
+        )
+
+    reconciled = base.copy()
+    bottom = [col for col in base.columns if col != TOTAL_SERIES]
+    bottom_sum = base[bottom].sum(axis=1)
+
+    if method == 'bottom_up':
+        reconciled[TOTAL_SERIES] = bottom_sum
+    else:
+        # Los días cuya suma es 0 no tienen proporciones: se mantienen las series
+        scale = (base[TOTAL_SERIES] / bottom_sum.where(bottom_sum != 0)).fillna(1.0)
+        reconciled[bottom] = base[bottom].mul(scale, axis=0)
+        reconciled[TOTAL_SERIES] = reconciled[bottom].sum(axis=1)
+
+    return reconciled
+
+
+def _fit_series(name: str, dates: np.ndarray, values: np.ndarray) -> tuple:
+    """
+    Entrena el modelo Prophet de una serie (se ejecuta en un proceso del pool).
+
+    Returns:
+        tuple: (nombre, miembros del artefacto (prophet_files), segundos de entrenamiento)
+    """
+    start = time.perf_counter()
+    model = Prophet(**PROPHET_PARAMS)
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        model.fit(pd.DataFrame({'ds': dates, 'y': values}))
+    return name, prophet_files(model), time.perf_counter() - start
+
+
+class HierarchicalSalesForecaster:
+    """
+    Pronóstico de ventas por serie (categoría, producto...) más el total.
+
+    Los modelos se guardan en un único artefacto de src.models.artifacts: la
+    cabecera (metadata.json) describe las series y cada modelo Prophet va bajo
+    su propio prefijo (``series/00000/``), de modo que se pueden cargar series
+    sueltas sin deserializar el resto.
+
+    Attributes:
+        data_path (str): Ruta de sales_processed
+        model_path (str): Ruta del artefacto zip
+        level (str): Columna que define las series
+        n_jobs (int): Procesos usados para entrenar
+        series (pd.DataFrame): Ventas diarias por serie (formato ancho)
+        index (dict): Cabecera (metadata.json) del artefacto
+        models (dict): Modelos Prophet deserializados (nombre -> modelo)
+    """
+
+    def __init__(self, data_path='data/processed/sales_processed.csv',
+                 model_path='models/sales_hierarchy.zip',
+                 level='category', n_jobs=1):
+        """
+        Inicializa el forecaster jerárquico.
+
+        Args:
+            data_path (str): Ruta de las ventas procesadas (CSV, Parquet o Feather)
+            model_path (str): Ruta del artefacto zip con los modelos
+            level (str): Columna que define las series (p. ej. 'category')
+            n_jobs (int): Número de procesos para entrenar (1 = secuencial)
+        """
+        if n_jobs < 1:
+            raise ValueError("❌ n_jobs debe ser >= 1")
+
+        self.data_path = data_path
+        self.model_path = model_path
+        self.level = level
+        self.n_jobs = n_jobs
+        self.series = None
+        self.index = None
+        self.models = {}
+        self._serialized = {}
+
+        # Crear directorio de modelos si no existe
+        Path(os.path.dirname(model_path) or '.').mkdir(parents=True, exist_ok=True)
+
+    @property
+    def series_names(self):
+        """Nombres de las series del nivel (sin el total)."""
+        if self.index is None:
+            raise RuntimeError("❌ El modelo no ha sido entrenado. Llama a train() primero.")
+        return [entry['name'] for entry in self.index['series'] if entry['name'] != TOTAL_SERIES]
+
+    def load_series(self, sales=None):
+        """
+        Construye las series diarias por ``level``.
+
+        Por categoría se usa el agregado ``daily_category_sales`` del
+        pipeline cuando está al día con data_path.
+
+        Args:
+            sales (pd.DataFrame, optional): Ventas ya cargadas; si no se
+                indican, se leen de data_path (solo las columnas necesarias)
+        """
+        if sales is None and self.level == 'category':
+            sales = load_daily_aggregate(self.data_path, DAILY_CATEGORY_SALES,
+                                         columns=['date', 'category', 'total_amount'])
+        if sales is None:
+            sales = read_table(self.data_path, columns=['date', self.level, 'total_amount'],
+                               parse_dates=['date'])
+        self.series = build_series_frame(sales, self.level)
+        print(f"✓ Series por '{self.level}': {self.series.shape[1]} "
+              f"({len(self.series)} días)")
+
+    def train(self, sales=None):
+        """
+        Entrena un modelo por serie y otro para el total, en paralelo.
+
+        Args:
+            sales (pd.DataFrame, optional): Ventas ya cargadas (ver load_series)
+
+        Returns:
+            dict: Estadísticas (series, segundos, series por segundo)
+
+        Raises:
+            ValueError: Si no hay suficientes días para entrenar
+        """
+        print(f"📊 Entrenando modelos por '{self.level}'...")
+        self.load_series(sales)
+
+        if len(self.series) < MIN_TRAINING_DAYS:
+            raise ValueError(f"❌ No hay suficientes datos para entrenar (mín. {MIN_TRAINING_DAYS} días)")
+
+        names = [TOTAL_SERIES] + list(self.series.columns)
+        dates = self.series.index.to_numpy()
+        values = [self.series.sum(axis=1).to_numpy()] + [
+            self.series[name].to_numpy() for name in self.series.columns
+        ]
+
+        print(f"📈 Entrenando {len(names)} modelos con {self.n_jobs} proceso(s)...")
+        start = time.perf_counter()
+        if self.n_jobs > 1:
+            with ProcessPoolExecutor(max_workers=self.n_jobs) as pool:
+                results = list(pool.map(_fit_series, names, [dates] * len(names), values))
+        else:
+            results = [_fit_series(name, dates, y) for name, y in zip(names, values)]
+        elapsed = time.perf_counter() - start
+
+        self._serialized = {name: files for name, files, _ in results}
+        fit_seconds = {name: seconds for name, _, seconds in results}
+        self.models = {}
+        self.save(fit_seconds)
+
+        stats = {
+            'series': len(names),
+            'seconds': elapsed,
+            'series_per_second': len(names) / elapsed,
+        }
+        print(f"✅ {stats['series']} modelos en {elapsed:.1f}s "
+              f"({stats['series_per_second']:.2f} series/s) -> {self.model_path}")
+        return stats
+
+    def save(self, fit_seconds=None):
+        """
+        Guarda los modelos en el artefacto zip (cabecera + un modelo por prefijo).
+
+        Args:
+            fit_seconds (dict, optional): Segundos de entrenamiento por serie
+        """
+        fit_seconds = fit_seconds or {}
+        files = {}
+        entries = []
+
+        for position, (name, model_files) in enumerate(self._serialized.items()):
+            prefix = f"series/{position:05d}/"
+            files.update({prefix + member: content for member, content in model_files.items()})
+            entries.append({
+                'name': name,
+                'prefix': prefix,
+                'fit_seconds': round(fit_seconds.get(name, 0.0), 3),
+            })
+
+        write_artifact(
+            self.model_path, HIERARCHY_MODEL_TYPE, prophet_version,
+            files=files,
+            metadata={
+                'level': self.level,
+                'history_start': str(self.series.index.min().date()),
+                'history_end': str(self.series.index.max().date()),
+                'series': entries,
+            }
+        )
+        self.index = read_metadata(self.model_path, HIERARCHY_MODEL_TYPE)
+
+    def load_model(self):
+        """
+        Lee el índice del artefacto; los modelos se deserializan bajo demanda.
+
+        Raises:
+            FileNotFoundError: Si el artefacto no existe
+            ValueError: Si no es un artefacto jerárquico o la versión del
+                formato no es compatible
+        """
+        if not os.path.exists(self.model_path):
+            raise FileNotFoundError(f"❌ Modelo no encontrado: {self.model_path}")
+
+        index = read_metadata(self.model_path, HIERARCHY_MODEL_TYPE)
+        self.index = index
+        self.level = index['level']
+        self.models = {}
+        self._serialized = {}
+        print(f"✅ Índice cargado desde: {self.model_path} ({len(index['series'])} series)")
+
+    def get_model(self, name):
+        """
+        Devuelve el modelo Prophet de una serie, leyéndolo del zip si hace falta.
+
+        Raises:
+            KeyError: Si la serie no existe en el artefacto
+        """
+        if name in self.models:
+            return self.models[name]
+
+        if name in self._serialized:
+            model_files = self._serialized[name]
+        else:
+            if self.index is None:
+                raise RuntimeError("❌ El modelo no ha sido entrenado. Llama a train() primero.")
+            prefixes = {entry['name']: entry['prefix'] for entry in self.index['series']}
+            if name not in prefixes:
+                raise KeyError(f"❌ Serie no encontrada: {name}")
+            _, model_files = read_artifact(self.model_path, HIERARCHY_MODEL_TYPE, prefix=prefixes[name])
+
+        self.models[name] = prophet_from_files(model_files)
+        return self.models[name]
+
+    def forecast(self, days=30, reconcile='bottom_up'):
+        """
+        Pronostica todas las series y el total para los próximos N días.
+
+        Args:
+            days (int): Número de días a predecir
+            reconcile (str or None): 'bottom_up', 'proportional' o None
+                (pronósticos base sin reconciliar)
+
+        Returns:
+            pd.DataFrame: Índice = fechas, una columna por serie más 'total'
+        """
+        names = [TOTAL_SERIES] + self.series_names
+        base = pd.DataFrame({
+            name: predict_future_dates(self.get_model(name), days, include_uncertainty=False)
+            .set_index('ds')['yhat']
+            for name in names
+        })
+        base.index.name = 'ds'
+
+        if reconcile is None:
+            return base
+        return reconcile_forecasts(base, reconcile)
+
+
+if __name__ == "__main__":
+    """
+    Script principal para entrenar los modelos por categoría.
+    """
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Pronóstico jerárquico de ventas')
+    parser.add_argument('--level', default='category', help='Columna que define las series')
+    parser.add_argument('--n-jobs', type=int, default=os.cpu_count() or 1, help='Procesos para entrenar')
+    parser.add_argument('--days', type=int, default=30, help='Días a predecir')
+    parser.add_argument('--reconcile', default='bottom_up', choices=RECONCILIATION_METHODS)
+    args = parser.parse_args()
+
+    print("=" * 70)
+    print("🚀 HIERARCHICAL SALES FORECASTER - PROPHET POR SERIE")
+    print("=" * 70 + "\n")
+
+    forecaster = HierarchicalSalesForecaster(level=args.level, n_jobs=args.n_jobs)
+    forecaster.train()
+
+    forecast = forecaster.forecast(days=args.days, reconcile=args.reconcile)
+    print(f"\n📈 Ventas predichas en los próximos {args.days} días ({args.reconcile}):")
+    for name, total in forecast.sum().sort_values(ascending=False).items():
+        print(f"  {name:15} ${total:,.2f}")
@@ -4,14 +4,34 @@ Utiliza Prophet para predecir ventas diarias totales
 """
 
 import pandas as pd
-import pickle
+import copy
+import hashlib
+import io
+import json
 import os
+import sys
+import threading
+import time
 import numpy as np
 from pathlib import Path
 from datetime import datetime, timedelta
 import warnings
 import logging
 
+# Permitir la ejecución directa: python src/models/sales_predictor.py
+if __package__ in (None, ''):
+    sys.path.append(str(Path(__file__).resolve().parents[2]))
+
+from src.data.preprocessing import load_daily_aggregate
+from src.data.storage import format_from_path, read_table, resolve_table_path, write_table
+from src.models.artifacts import (
+    load_prophet_model,
+    read_metadata,
+    resolve_model_path,
+    save_prophet_model,
+)
+from src.utils.model_cache import file_fingerprint, load_model_cached
+
 # Configurar logging para evitar advertencias innecesarias
 logging.getLogger('cmdstanpy').setLevel(logging.WARNING)
 logging.getLogger('prophet').setLevel(logging.WARNING)
@@ -25,6 +45,170 @@ except ImportError:
 warnings.filterwarnings('ignore', category=DeprecationWarning)
 warnings.filterwarnings('ignore', category=FutureWarning)
 
+# Columnas de ventas que usa el entrenamiento y de la serie diaria agregada
+DAILY_COLUMNS = ['date', 'total_amount', 'quantity']
+
+# Columnas del pronóstico que se guardan en la caché
+FORECAST_COLUMNS = ['ds', 'yhat', 'yhat_lower', 'yhat_upper']
+
+# Horizonte precalculado por defecto (máximo ofrecido en la página de Ventas)
+DEFAULT_MAX_HORIZON = 90
+
+# Bloque de lectura al calcular el hash de data_path
+HASH_BLOCK_BYTES = 1 << 20
+
+# Configuración de Prophet compartida por los modelos de ventas
+PROPHET_PARAMS = {
+    'yearly_seasonality': True,
+    'weekly_seasonality': True,
+    'daily_seasonality': False,
+    'interval_width': 0.95,
+    'seasonality_mode': 'additive',
+}
+
+
+def predict_future_dates(model, days, include_uncertainty=True):
+    """
+    Predice solo los ``days`` días posteriores al histórico de un modelo Prophet.
+    
+    ``make_future_dataframe`` incluye todas las fechas históricas; aquí se
+    construyen únicamente las fechas futuras. Sin incertidumbre se omite el
+    muestreo de Prophet (la parte más costosa) usando una copia superficial
+    del modelo, de modo que el modelo original (p. ej. en caché) no cambia.
+    
+    Args:
+        model (Prophet): Modelo entrenado
+        days (int): Número de días futuros a predecir
+        include_uncertainty (bool): Calcular yhat_lower / yhat_upper
+    
+    Returns:
+        pd.DataFrame: Predicciones (ds, yhat, yhat_lower, yhat_upper);
+            los intervalos son NaN si include_uncertainty=False
+    """
+    future = pd.DataFrame({
+        'ds': pd.date_range(model.history['ds'].max() + timedelta(days=1), periods=days, freq='D')
+    })
+    
+    if not include_uncertainty:
+        model = copy.copy(model)
+        model.uncertainty_samples = 0
+    
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        forecast = model.predict(future)
+    
+    return forecast.reindex(columns=FORECAST_COLUMNS)
+
+
+def warm_start_params(model):
+    """
+    Parámetros de un modelo Prophet entrenado para inicializar un nuevo ajuste.
+    
+    Args:
+        model (Prophet): Modelo entrenado (MAP, sin MCMC)
+    
+    Returns:
+        dict: Valores iniciales de k, m, sigma_obs, delta y beta
+    """
+    return {
+        'k': model.params['k'][0][0],
+        'm': model.params['m'][0][0],
+        'sigma_obs': model.params['sigma_obs'][0][0],
+        'delta': model.params['delta'][0],
+        'beta': model.params['beta'][0],
+    }
+
+
+def optimizer_iterations(model):
+    """
+    Iteraciones del optimizador de Stan en el último ajuste del modelo.
+    
+    Se leen de la salida de CmdStan: la última fila de la tabla de progreso de
+    L-BFGS (tras la cabecera "Iter log prob ...") o la última línea
+    "Iteration N." de Newton, al que Prophet recurre si L-BFGS falla. Con warm
+    start sobre los mismos datos es normal obtener 1: el punto inicial ya es
+    el óptimo.
+    
+    Returns:
+        int: Iteraciones, o None si la salida no está disponible
+    """
+    try:
+        with open(model.stan_backend.stan_fit.runset.stdout_files[0]) as f:
+            lines = f.read().splitlines()
+    except (AttributeError, IndexError, OSError):
+        return None
+    
+    iterations = None
+    in_table = False
+    for line in lines:
+        tokens = line.split()
+        if not tokens:
+            continue
+        if tokens[0] == 'Iter':
+            in_table = True
+        elif tokens[0] == 'Iteration' and len(tokens) > 1 and tokens[1].rstrip('.').isdigit():
+            iterations = int(tokens[1].rstrip('.'))
+        elif in_table and tokens[0].isdigit() and len(tokens) >= 7:
+            iterations = int(tokens[0])
+        else:
+            in_table = False
+    return iterations
+
+
+def _read_forecast_table(path):
+    """Loader de la caché de pronóstico (función estable: es parte de la clave de load_model_cached)."""
+    return read_table(path, parse_dates=['ds'])
+
+
+def _read_json(path):
+    """Loader de los metadatos de la caché de pronóstico (para load_model_cached)."""
+    with open(path) as f:
+        return json.load(f)
+
+
+def _artifact_version(path):
+    """Loader de la versión de un artefacto: SHA-256 abreviado de su contenido."""
+    return file_fingerprint(path, use_hash=True)[2][:16]
+
+
+def _replace_atomically(path, write):
+    """
+    Escribe ``path`` a través de un temporal del mismo directorio y lo renombra
+    con os.replace: quien lo lea ve el archivo anterior o el nuevo completo,
+    nunca uno a medias.
+    
+    Args:
+        path (Path): Archivo final (el temporal conserva su extensión)
+        write (callable): write(ruta_temporal) escribe el contenido
+    """
+    path = Path(path)
+    tmp_path = path.with_name(f'.{path.stem}.{os.getpid()}.{threading.get_ident()}.tmp{path.suffix}')
+    try:
+        write(tmp_path)
+        os.replace(tmp_path, path)
+    finally:
+        if tmp_path.exists():
+            tmp_path.unlink()
+
+
+def _hash_file(path, limit=None) -> tuple:
+    """
+    SHA-256 de un archivo (o de sus primeros ``limit`` bytes) leído por bloques.
+    
+    Returns:
+        tuple: (objeto hashlib, bytes leídos)
+    """
+    digest = hashlib.sha256()
+    size = 0
+    with open(path, 'rb') as f:
+        while limit is None or size < limit:
+            block = f.read(HASH_BLOCK_BYTES if limit is None else min(HASH_BLOCK_BYTES, limit - size))
+            if not block:
+                break
+            digest.update(block)
+            size += len(block)
+    return digest, size
+
 
 class SalesTimeSeriesPredictor:
     """
@@ -33,28 +217,180 @@ class SalesTimeSeriesPredictor:
     Attributes:
         model (Prophet): Modelo Prophet entrenado
         data_path (str): Ruta del archivo de datos procesados
-        model_path (str): Ruta donde guardar el modelo entrenado
+        model_path (str): Ruta donde guardar el modelo entrenado (.pkl o artefacto .zip)
+        metadata (dict): Cabecera del artefacto (ventana de entrenamiento, ajuste)
         df_train (pd.DataFrame): Datos de entrenamiento en formato Prophet
+        forecast (pd.DataFrame): Pronóstico precalculado (histórico + max_horizon días)
+        forecast_path (Path): Archivo de la caché de pronóstico junto al modelo
+        daily_path (Path): Serie diaria agregada guardada junto al modelo
+        fit_stats (dict): Tiempo e iteraciones del último ajuste
     """
     
     def __init__(self, data_path='data/processed/sales_processed.csv', 
-                 model_path='models/sales_model.pkl'):
+                 model_path='models/sales_model.pkl',
+                 max_horizon=DEFAULT_MAX_HORIZON):
         """
         Inicializa el predictor.
         
         Args:
-            data_path (str): Ruta del archivo CSV con datos procesados
-            model_path (str): Ruta donde guardar el modelo
+            data_path (str): Ruta del archivo con datos procesados (CSV, Parquet o Feather)
+            model_path (str): Ruta donde guardar el modelo (.pkl; con .zip se guarda
+                el artefacto sin pickle, ver src.models.artifacts)
+            max_horizon (int): Días futuros precalculados en la caché de pronóstico
         """
         self.data_path = data_path
         self.model_path = model_path
+        self.max_horizon = max_horizon
         self.model = None
         self.df_train = None
+        self.forecast = None
+        self.forecast_version = None
+        self.fit_stats = {}
+        self.metadata = {}
+        
+        # Serie diaria agregada: models/sales_model.daily.parquet (+ .json con filas leídas)
+        self.daily_path = Path(model_path).with_suffix('.daily.parquet')
+        self.daily_meta_path = Path(model_path).with_suffix('.daily.json')
+        
+        # Caché de pronóstico: models/sales_model.forecast.parquet (+ .json con metadatos)
+        self.forecast_path = Path(model_path).with_suffix('.forecast.parquet')
+        self.forecast_meta_path = Path(model_path).with_suffix('.forecast.json')
         
         # Crear directorio de modelos si no existe
         Path(os.path.dirname(model_path)).mkdir(parents=True, exist_ok=True)
     
-    def train(self):
+    def _read_daily_cache(self):
+        """Agregado diario guardado y número de filas de origen que resume."""
+        if not self.daily_meta_path.exists() or not self.daily_path.exists():
+            return None
+        
+        with open(self.daily_meta_path) as f:
+            metadata = json.load(f)
+        daily = read_table(self.daily_path, parse_dates=['date'])
+        return daily, metadata
+    
+    def _write_daily_cache(self, df_daily, source_path, source_rows, fingerprint, digest=None):
+        """
+        Guarda el agregado diario junto al modelo con la huella exacta del origen.
+        
+        Para CSV se guarda además el tamaño y el SHA-256 del contenido agregado:
+        si después solo se añaden filas al final, ese contenido es un prefijo
+        exacto del archivo y basta con leer lo nuevo.
+        
+        Args:
+            df_daily (pd.DataFrame): Serie diaria agregada
+            source_path (Path): Archivo de origen (data_path resuelto)
+            source_rows (int): Filas de origen resumidas
+            fingerprint (tuple): Huella (mtime, tamaño) de source_path al leerlo
+            digest (tuple, optional): (hash, bytes) del contenido agregado, si ya se calculó
+        """
+        write_table(df_daily, self.daily_path)
+        metadata = {
+            'data_path': str(self.data_path),
+            'source_rows': int(source_rows),
+            'fingerprint': list(fingerprint),
+        }
+        if format_from_path(source_path) == 'csv':
+            digest, size = digest or _hash_file(source_path)
+            metadata['source_bytes'] = size
+            metadata['sha256'] = digest.hexdigest()
+        with open(self.daily_meta_path, 'w') as f:
+            json.dump(metadata, f, indent=2)
+    
+    def _read_appended_rows(self, source_path, metadata):
+        """
+        Filas añadidas al final de un CSV desde que se guardó el agregado.
+        
+        Se comprueba que los primeros ``source_bytes`` bytes siguen teniendo el
+        mismo SHA-256 (sin parsearlos) y solo se parsean los bytes posteriores.
+        
+        Returns:
+            tuple: (filas nuevas, (hash, bytes) del archivo completo), o None si
+            el archivo no es una extensión del contenido ya agregado
+        """
+        if format_from_path(source_path) != 'csv' or 'sha256' not in metadata:
+            return None
+        
+        source_bytes = metadata['source_bytes']
+        digest, size = _hash_file(source_path, limit=source_bytes)
+        if size != source_bytes or digest.hexdigest() != metadata['sha256']:
+            return None
+        
+        with open(source_path, 'rb') as f:
+            f.seek(source_bytes)
+            tail = f.read()
+        digest.update(tail)
+        
+        if tail.strip():
+            header = pd.read_csv(source_path, nrows=0).columns
+            new_rows = pd.read_csv(io.BytesIO(tail), header=None, names=header,
+                                   usecols=DAILY_COLUMNS, parse_dates=['date'])
+        else:
+            new_rows = pd.DataFrame({col: pd.Series(dtype='datetime64[ns]' if col == 'date' else 'float64')
+                                     for col in DAILY_COLUMNS})
+        return new_rows, (digest, source_bytes + len(tail))
+    
+    def load_daily_sales(self, incremental=True):
+        """
+        Construye la serie diaria (date, total_amount, quantity) desde data_path.
+        
+        Con ``incremental=True`` se reutiliza el agregado guardado junto al
+        modelo:
+        
+        - Si data_path no ha cambiado (misma huella mtime/tamaño) no se lee.
+        - Si es un CSV al que solo se han añadido filas al final (como hace
+          append_table / DataPreprocessor.run_incremental), se verifica el
+          SHA-256 del contenido ya agregado y se parsean solo las filas nuevas.
+        - En cualquier otro caso (archivo reescrito, o Parquet/Feather, que
+          append_table reescribe completos) se recalcula desde cero.
+        
+        Args:
+            incremental (bool): Reutilizar el agregado diario guardado
+        
+        Returns:
+            pd.DataFrame: Ventas diarias ordenadas por fecha
+        """
+        source_path = resolve_table_path(self.data_path)
+        fingerprint = file_fingerprint(source_path)
+        
+        cached = self._read_daily_cache() if incremental else None
+        appended = None
+        if cached is not None:
+            daily, metadata = cached
+            if metadata.get('data_path') == str(self.data_path):
+                if tuple(metadata.get('fingerprint', ())) == fingerprint:
+                    print(f"✓ Agregado diario al día: {metadata['source_rows']} registros sin cambios")
+                    return daily[DAILY_COLUMNS]
+                appended = self._read_appended_rows(source_path, metadata)
+            if appended is None:
+                print("⚠ Agregado diario desactualizado: se recalcula completo")
+        
+        if appended is None:
+            df = read_table(source_path, columns=DAILY_COLUMNS, parse_dates=['date'])
+            print(f"✓ Datos cargados: {len(df)} registros")
+            df_daily = df.groupby('date').agg({
+                'total_amount': 'sum',
+                'quantity': 'sum'
+            }).reset_index()
+            source_rows, digest = len(df), None
+        else:
+            # Agrupar solo las filas nuevas y sumarlas al agregado previo
+            new_rows, digest = appended
+            new_daily = new_rows.groupby('date').agg({
+                'total_amount': 'sum',
+                'quantity': 'sum'
+            }).reset_index()
+            df_daily = (
+                pd.concat([daily[DAILY_COLUMNS], new_daily], ignore_index=True)
+                .groupby('date', as_index=False).sum()
+            )
+            source_rows = metadata['source_rows'] + len(new_rows)
+            print(f"✓ Agregado diario reutilizado: {len(new_rows)} filas nuevas agrupadas")
+        
+        self._write_daily_cache(df_daily, source_path, source_rows, fingerprint, digest)
+        return df_daily
+    
+    def train(self, warm_start=False):
         """
         Entrena el modelo Prophet con datos de ventas diarias.
         
@@ -63,7 +399,19 @@ class SalesTimeSeriesPredictor:
         2. Agrupa por fecha sumando ventas diarias
         3. Renombra columnas al formato requerido por Prophet (ds, y)
         4. Entrena el modelo Prophet con seasonality anual
-        5. Guarda el modelo en formato pickle
+        5. Guarda el modelo en model_path (pickle o artefacto .zip, ver src.models.artifacts)
+        6. Precalcula la caché de pronóstico para max_horizon días
+        
+        La serie diaria se toma del agregado ``daily_sales`` que materializa
+        el pipeline de preprocesamiento junto a data_path; solo si falta o
+        está obsoleto se lee data_path completo.
+        
+        Con ``warm_start=True`` el ajuste parte de los parámetros del modelo
+        guardado en model_path y, si hay que leer data_path, se reutiliza el
+        agregado guardado junto al modelo agrupando solo las filas nuevas.
+        
+        Args:
+            warm_start (bool): Reentrenamiento incremental desde el modelo previo
         
         Raises:
             FileNotFoundError: Si el archivo de datos no existe
@@ -71,20 +419,12 @@ class SalesTimeSeriesPredictor:
         """
         print("📊 Iniciando entrenamiento del modelo de ventas...")
         
-        # 1. Cargar datos
-        if not os.path.exists(self.data_path):
-            raise FileNotFoundError(f"❌ Archivo no encontrado: {self.data_path}")
-        
-        df = pd.read_csv(self.data_path)
-        print(f"✓ Datos cargados: {len(df)} registros")
-        
-        # 2. Convertir fecha a datetime y agrupar por día
-        df['date'] = pd.to_datetime(df['date'])
-        
-        df_daily = df.groupby('date').agg({
-            'total_amount': 'sum',
-            'quantity': 'sum'
-        }).reset_index()
+        # 1-2. Serie diaria: agregado materializado o, si no está al día, agrupar data_path
+        df_daily = load_daily_aggregate(self.data_path, columns=DAILY_COLUMNS)
+        if df_daily is not None:
+            print(f"✓ Agregado diario materializado: {len(df_daily)} días")
+        else:
+            df_daily = self.load_daily_sales(incremental=warm_start)
         
         print(f"✓ Serie temporal creada: {len(df_daily)} días")
         
@@ -104,36 +444,92 @@ class SalesTimeSeriesPredictor:
         
         # 4. Instanciar y entrenar Prophet
         print("🔧 Configurando modelo Prophet...")
-        self.model = Prophet(
-            yearly_seasonality=True,
-            weekly_seasonality=True,
-            daily_seasonality=False,
-            interval_width=0.95,
-            seasonality_mode='additive'
-        )
+        self.model = Prophet(**PROPHET_PARAMS)
+        
+        fit_kwargs = {}
+        if warm_start:
+            try:
+                previous_path = resolve_model_path(self.model_path)
+                fit_kwargs['init'] = warm_start_params(load_prophet_model(previous_path))
+                print(f"♻️ Warm start desde: {previous_path}")
+            except FileNotFoundError:
+                print("⚠ No hay modelo previo: entrenamiento desde cero")
         
         print("📈 Entrenando modelo...")
+        fit_start = time.perf_counter()
         with warnings.catch_warnings():
             warnings.simplefilter("ignore")
-            self.model.fit(self.df_train)
-        
-        # 5. Guardar modelo
-        with open(self.model_path, 'wb') as f:
-            pickle.dump(self.model, f)
+            self.model.fit(self.df_train, **fit_kwargs)
+        
+        self.fit_stats = {
+            'seconds': time.perf_counter() - fit_start,
+            'iterations': optimizer_iterations(self.model),
+            'warm_start': 'init' in fit_kwargs,
+        }
+        print(f"⏱️ Ajuste: {self.fit_stats['seconds']:.2f}s, "
+              f"{self.fit_stats['iterations']} iteraciones "
+              f"({'warm start' if self.fit_stats['warm_start'] else 'desde cero'})")
+        
+        # 5. Guardar modelo con su cabecera de metadatos
+        self.metadata = {
+            'training_window': {
+                'start': str(self.df_train['ds'].min().date()),
+                'end': str(self.df_train['ds'].max().date()),
+                'days': len(self.df_train),
+            },
+            'prophet_params': PROPHET_PARAMS,
+            'fit_stats': self.fit_stats,
+            'data_path': str(self.data_path),
+        }
+        save_prophet_model(self.model, self.model_path, metadata=self.metadata)
         
         print(f"✅ Modelo entrenado y guardado en: {self.model_path}")
         print(f"   Período de datos: {self.df_train['ds'].min().date()} a {self.df_train['ds'].max().date()}")
         print(f"   Ventas promedio diarias: ${self.df_train['y'].mean():.2f}")
+        
+        # 6. Precalcular pronóstico (el modelo nuevo invalida la caché anterior)
+        self.build_forecast_cache()
     
-    def predict_next_days(self, days=90):
+    def model_version(self):
         """
-        Realiza predicciones para los próximos N días.
+        Versión del modelo guardado: hash SHA-256 (abreviado) del artefacto.
+        
+        El hash se calcula una vez por proceso y huella del archivo (mtime y
+        tamaño) a través de load_model_cached, no en cada llamada.
+        
+        Returns:
+            str: Identificador que cambia cada vez que se reentrena el modelo
+        
+        Raises:
+            FileNotFoundError: Si el archivo del modelo no existe
+        """
+        return load_model_cached(resolve_model_path(self.model_path), loader=_artifact_version)
+    
+    def _predict_full(self, days):
+        """Predice sobre todo el histórico más ``days`` días futuros."""
+        future = self.model.make_future_dataframe(periods=days)
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            forecast = self.model.predict(future)
+        return forecast[FORECAST_COLUMNS]
+    
+    def _history_end(self):
+        """Última fecha observada por el modelo."""
+        return self.model.history['ds'].max()
+    
+    def predict_future(self, days, include_uncertainty=True):
+        """
+        Predice solo las fechas futuras solicitadas, sin recorrer el histórico.
+        
+        Ver ``predict_future_dates``.
         
         Args:
-            days (int): Número de días a predecir (default: 90)
+            days (int): Número de días futuros a predecir
+            include_uncertainty (bool): Calcular yhat_lower / yhat_upper
         
         Returns:
-            pd.DataFrame: DataFrame con predicciones (ds, yhat, yhat_lower, yhat_upper)
+            pd.DataFrame: Predicciones (ds, yhat, yhat_lower, yhat_upper);
+                los intervalos son NaN si include_uncertainty=False
         
         Raises:
             RuntimeError: Si el modelo no ha sido entrenado
@@ -141,42 +537,148 @@ class SalesTimeSeriesPredictor:
         if self.model is None:
             raise RuntimeError("❌ El modelo no ha sido entrenado. Llama a train() primero.")
         
-        # Generar fechas futuras
-        future = self.model.make_future_dataframe(periods=days)
+        return predict_future_dates(self.model, days, include_uncertainty=include_uncertainty)
+    
+    def _compute_forecast(self):
+        """Pronóstico completo (histórico + max_horizon días) solo en memoria."""
+        self.forecast = self._predict_full(self.max_horizon).reset_index(drop=True)
+        self.forecast_version = None
+        return self.forecast
+    
+    def build_forecast_cache(self):
+        """
+        Calcula el pronóstico para max_horizon días y lo guarda junto al modelo.
         
-        # Realizar predicción
-        with warnings.catch_warnings():
-            warnings.simplefilter("ignore")
-            forecast = self.model.predict(future)
+        El pronóstico incluye el histórico (necesario para los gráficos) y se
+        etiqueta con la versión del modelo guardado, de modo que un
+        reentrenamiento lo invalida. Solo lo llaman train() y el comando
+        ``--forecast-cache``: las rutas de lectura nunca escriben la caché.
+        
+        Ambos archivos se escriben en temporales y se renombran, primero el
+        pronóstico y al final los metadatos, para que las sesiones que leen
+        la caché a la vez no vean archivos a medias.
+        
+        Returns:
+            pd.DataFrame: Pronóstico completo (ds, yhat, yhat_lower, yhat_upper)
+        
+        Raises:
+            RuntimeError: Si el modelo no ha sido entrenado
+        """
+        if self.model is None:
+            raise RuntimeError("❌ El modelo no ha sido entrenado. Llama a train() primero.")
+        
+        print(f"🔮 Precalculando pronóstico para {self.max_horizon} días...")
+        self._compute_forecast()
+        self.forecast_version = self.model_version()
+        
+        _replace_atomically(self.forecast_path, lambda path: write_table(self.forecast, path))
+        metadata = {
+            'model_version': self.forecast_version,
+            'max_horizon': self.max_horizon,
+            'history_end': str(self._history_end().date()),
+            'created_at': datetime.now().isoformat(timespec='seconds'),
+        }
+        _replace_atomically(self.forecast_meta_path,
+                            lambda path: path.write_text(json.dumps(metadata, indent=2)))
+        
+        print(f"✓ Caché de pronóstico guardada en: {self.forecast_path}")
+        return self.forecast
+    
+    def load_forecast_cache(self):
+        """
+        Carga la caché de pronóstico si corresponde al modelo guardado.
+        
+        Returns:
+            bool: True si la caché es válida (misma versión y horizonte suficiente)
+        """
+        if not self.forecast_meta_path.exists() or not self.forecast_path.exists():
+            return False
+        
+        # Metadatos, versión y pronóstico se leen una vez por proceso y huella de archivo
+        metadata = load_model_cached(self.forecast_meta_path, loader=_read_json)
+        version = self.model_version()
+        if metadata.get('model_version') != version or metadata.get('max_horizon', 0) < self.max_horizon:
+            return False
+        
+        self.forecast = load_model_cached(self.forecast_path, loader=_read_forecast_table)
+        self.forecast_version = version
+        return True
+    
+    def get_forecast(self, days, include_history=False):
+        """
+        Devuelve el pronóstico para ``days`` días recortando la caché.
+        
+        Si la caché no existe o pertenece a otra versión del modelo, el
+        pronóstico se calcula en memoria (sin escribir la caché). Las peticiones con ``days > max_horizon``
+        se calculan directamente con el modelo.
+        
+        Args:
+            days (int): Número de días futuros
+            include_history (bool): Incluir también el ajuste sobre el histórico
+        
+        Returns:
+            pd.DataFrame: Pronóstico (ds, yhat, yhat_lower, yhat_upper)
         
-        # Si df_train está disponible, retornar solo predicciones futuras
-        if self.df_train is not None:
-            future_forecast = forecast[forecast['ds'] > self.df_train['ds'].max()][
-                ['ds', 'yhat', 'yhat_lower', 'yhat_upper']
-            ].reset_index(drop=True)
+        Raises:
+            RuntimeError: Si el modelo no ha sido entrenado
+        """
+        if self.model is None:
+            raise RuntimeError("❌ El modelo no ha sido entrenado. Llama a train() primero.")
+        
+        if days > self.max_horizon:
+            if not include_history:
+                return self.predict_future(days)
+            forecast = self._predict_full(days)
         else:
-            # Si no, retornar los últimos 'days' registros
-            future_forecast = forecast[['ds', 'yhat', 'yhat_lower', 'yhat_upper']].tail(days).reset_index(drop=True)
+            if self.forecast is None and not self.load_forecast_cache():
+                self._compute_forecast()
+            forecast = self.forecast
+        
+        is_future = (forecast['ds'] > self._history_end()).to_numpy()
+        n_history = len(forecast) - int(is_future.sum())
+        start = 0 if include_history else n_history
+        
+        return forecast.iloc[start:n_history + days].reset_index(drop=True)
+    
+    def predict_next_days(self, days=90, include_uncertainty=True):
+        """
+        Realiza predicciones para los próximos N días.
+        
+        Usa la caché de pronóstico cuando ``days <= max_horizon``; sin
+        incertidumbre se predicen solo las fechas futuras (predicción puntual).
+        
+        Args:
+            days (int): Número de días a predecir (default: 90)
+            include_uncertainty (bool): Incluir intervalos de confianza
         
-        return future_forecast
+        Returns:
+            pd.DataFrame: DataFrame con predicciones (ds, yhat, yhat_lower, yhat_upper)
+        
+        Raises:
+            RuntimeError: Si el modelo no ha sido entrenado
+        """
+        if self.model is None:
+            raise RuntimeError("❌ El modelo no ha sido entrenado. Llama a train() primero.")
+        
+        if not include_uncertainty:
+            return self.predict_future(days, include_uncertainty=False)
+        return self.get_forecast(days)
     
-    def get_tomorrow_prediction(self):
+    def get_tomorrow_prediction(self, include_uncertainty=True):
         """
         Obtiene la predicción de ventas para mañana.
         
+        Args:
+            include_uncertainty (bool): Incluir intervalos (False: solo yhat, más rápido)
+        
         Returns:
             dict: Diccionario con predicción (yhat, yhat_lower, yhat_upper)
         """
         if self.model is None:
             raise RuntimeError("❌ El modelo no ha sido entrenado.")
         
-        # Si df_train no está disponible (modelo cargado), usar última fecha conocida
-        # Generar predicción para 1 día
-        future = self.model.make_future_dataframe(periods=1)
-        
-        with warnings.catch_warnings():
-            warnings.simplefilter("ignore")
-            forecast = self.model.predict(future)
+        # Primer día futuro (caché de pronóstico o predicción puntual)
+        forecast = self.predict_next_days(1, include_uncertainty=include_uncertainty)
         
         # Obtener última predicción (mañana)
         if len(forecast) > 0:
@@ -193,24 +695,48 @@ class SalesTimeSeriesPredictor:
     
     def load_model(self):
         """
-        Carga un modelo previamente entrenado.
+        Carga un modelo previamente entrenado y su caché de pronóstico.
+        
+        Si model_path no existe se carga el .zip o el .pkl con el mismo nombre.
+        Si la caché no existe o es de otra versión del modelo, el pronóstico
+        se calcula en memoria; la caché solo se escribe con train() o
+        build_forecast_cache().
         
         Raises:
             FileNotFoundError: Si el archivo del modelo no existe
         """
-        if not os.path.exists(self.model_path):
-            raise FileNotFoundError(f"❌ Modelo no encontrado: {self.model_path}")
+        path = resolve_model_path(self.model_path)
+        self.model = load_prophet_model(path)
+        self.metadata = read_metadata(path)
         
-        with open(self.model_path, 'rb') as f:
-            self.model = pickle.load(f)
+        print(f"✅ Modelo cargado desde: {path}")
         
-        print(f"✅ Modelo cargado desde: {self.model_path}")
+        self.forecast = None
+        if self.load_forecast_cache():
+            print(f"✓ Caché de pronóstico válida: {self.forecast_path}")
+        else:
+            print("⚠ Caché de pronóstico ausente u obsoleta: se calcula en memoria "
+                  "(regenerarla: python src/models/sales_predictor.py --forecast-cache)")
+            self._compute_forecast()
 
 
 if __name__ == "__main__":
     """
     Script principal para entrenar el modelo y realizar pruebas.
+    
+    Uso: python src/models/sales_predictor.py [--warm-start | --forecast-cache]
+    
+    Con --forecast-cache solo se carga el modelo guardado y se regenera su
+    caché de pronóstico, sin reentrenar.
     """
+    warm_start = '--warm-start' in sys.argv[1:]
+    
+    if '--forecast-cache' in sys.argv[1:]:
+        predictor = SalesTimeSeriesPredictor(model_path='models/sales_model.pkl')
+        predictor.load_model()
+        predictor.build_forecast_cache()
+        sys.exit(0)
+    
     print("=" * 70)
     print("🚀 SALES TIME SERIES PREDICTOR - PROPHET MODEL")
     print("=" * 70 + "\n")
@@ -224,7 +750,7 @@ if __name__ == "__main__":
     # 1. Entrenar el modelo
     print("\n[1] FASE DE ENTRENAMIENTO")
     print("-" * 70)
-    predictor.train()
+    predictor.train(warm_start=warm_start)
     
     # 2. Realizar predicción de prueba para los próximos 30 días
     print("\n[2] PREDICCIÓN DE PRUEBA (Próximos 30 días)")
@@ -0,0 +1,117 @@
+"""
+Similar Customers Module
+Búsqueda de clientes similares (k vecinos más cercanos) sobre las features
+RFM y avg_ticket escaladas, con un KD-tree precalculado.
+
+Las features de cola larga (frequency, monetary, avg_ticket) se pasan por
+log1p y todas se estandarizan (media 0, desviación 1), para que ninguna
+domine la distancia euclídea por su escala.
+"""
+
+import numpy as np
+import pandas as pd
+from sklearn.neighbors import KDTree
+
+
+SIMILARITY_COLUMNS = ['recency', 'frequency', 'monetary', 'avg_ticket']
+# Columnas con cola larga: se comprimen con log1p antes de estandarizar
+LOG_COLUMNS = ['frequency', 'monetary', 'avg_ticket']
+DEFAULT_LEAF_SIZE = 40
+
+
+class SimilarCustomerIndex:
+    """
+    Índice de vecinos más cercanos de un CustomerFeatureStore.
+
+    Attributes:
+        store (CustomerFeatureStore): Clientes indexados por customer_id
+        mean (np.ndarray): Media de cada feature transformada
+        scale (np.ndarray): Desviación típica de cada feature transformada
+        tree (KDTree): Árbol sobre las features escaladas
+    """
+
+    def __init__(self, store, columns=SIMILARITY_COLUMNS, leaf_size=DEFAULT_LEAF_SIZE):
+        """
+        Construye el índice (una vez por versión de los datos).
+
+        Args:
+            store (CustomerFeatureStore): Clientes con recency, frequency,
+                monetary y avg_ticket en frame
+            columns (list): Features de similitud
+            leaf_size (int): Tamaño de hoja del KD-tree
+
+        Raises:
+            ValueError: Si faltan columnas de similitud
+        """
+        missing = set(columns) - set(store.frame.columns)
+        if missing:
+            raise ValueError(f"❌ Faltan columnas para la similitud: {', '.join(sorted(missing))}")
+
+        self.store = store
+        self.columns = list(columns)
+        raw = self._transform(store.frame[self.columns])
+        self.mean = raw.mean(axis=0)
+        self.scale = raw.std(axis=0)
+        self.scale[self.scale == 0] = 1.0
+        self.tree = KDTree((raw - self.mean) / self.scale, leaf_size=leaf_size)
+
+    def _transform(self, frame: pd.DataFrame) -> np.ndarray:
+        """Features en float64 con log1p en las columnas de cola larga."""
+        values = frame[self.columns].to_numpy(dtype=np.float64)
+        for i, column in enumerate(self.columns):
+            if column in LOG_COLUMNS:
+                values[:, i] = np.log1p(np.clip(values[:, i], 0, None))
+        return values
+
+    def scale_features(self, frame: pd.DataFrame) -> np.ndarray:
+        """
+        Escala features con la media y desviación del índice.
+
+        Args:
+            frame (pd.DataFrame): Filas con las columnas de similitud
+
+        Returns:
+            np.ndarray: Matriz (n, n_features) escalada
+        """
+        return (self._transform(frame) - self.mean) / self.scale
+
+    def query_positions(self, frame: pd.DataFrame, k: int = 10) -> tuple:
+        """
+        k vecinos más cercanos de cada fila de ``frame``.
+
+        Returns:
+            tuple: (distancias (n, k), posiciones en el store (n, k))
+        """
+        k = min(k, len(self.store))
+        return self.tree.query(self.scale_features(frame), k=k)
+
+    def similar_to(self, customer_id, k: int = 10) -> pd.DataFrame:
+        """
+        Clientes más parecidos a uno dado (sin incluirlo).
+
+        Args:
+            customer_id: Cliente de referencia
+            k (int): Número de vecinos
+
+        Returns:
+            pd.DataFrame: Filas del store de los vecinos, ordenadas por
+            distancia, con columnas distance y (si hay scores) probability
+
+        Raises:
+            KeyError: Si el cliente no existe
+        """
+        position = self.store.position(customer_id)
+        # Punto ya escalado guardado en el árbol (sin volver a transformar la fila)
+        point = np.asarray(self.tree.data[position:position + 1])
+        # Un vecino extra: el propio cliente (o un duplicado exacto) está a distancia 0
+        distances, positions = self.tree.query(point, k=min(k + 1, len(self.store)))
+        distances, positions = distances[0], positions[0]
+
+        keep = positions != position
+        distances, positions = distances[keep][:k], positions[keep][:k]
+
+        neighbours = self.store.frame.iloc[positions].copy()
+        neighbours['distance'] = distances
+        if self.store.probability is not None:
+            neighbours['probability'] = self.store.probability[positions]
+        return neighbours
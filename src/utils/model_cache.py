@@ -0,0 +1,138 @@
+"""Caché de modelos en memoria compartida por todo el proceso.
+
+Cada modelo se deserializa una sola vez por proceso y se reutiliza en las
+siguientes llamadas (por ejemplo, en cada rerun de Streamlit). La entrada se
+invalida automáticamente cuando cambia el archivo en disco: se compara la
+huella (mtime y tamaño, y opcionalmente el hash SHA-256 del contenido).
+
+La clave es (ruta, loader): el mismo archivo cargado con loaders distintos
+(p. ej. el objeto crudo y un artefacto envuelto) son entradas independientes.
+El loader debe ser una función estable (definida a nivel de módulo), no una
+lambda creada en cada llamada. Cada clave tiene su propio lock, de modo que
+una carga lenta no bloquea las de otros modelos.
+"""
+
+import hashlib
+import pickle
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Optional, Union
+
+
+PathLike = Union[str, Path]
+
+# (ruta absoluta, loader) -> {'fingerprint', 'model', 'load_seconds', 'loaded_at'}
+_CACHE = {}
+# (ruta absoluta, loader) -> lock de carga de esa entrada
+_KEY_LOCKS = {}
+# Protege _CACHE y _KEY_LOCKS (nunca se mantiene durante una carga)
+_LOCK = threading.Lock()
+
+
+def _load_pickle(path: Path):
+    with open(path, 'rb') as f:
+        return pickle.load(f)
+
+
+def file_fingerprint(path: PathLike, use_hash: bool = False) -> tuple:
+    """
+    Calcula la huella de un archivo para detectar cambios.
+    
+    Args:
+        path: Ruta del archivo
+        use_hash: Incluir el SHA-256 del contenido (más robusto, lee el archivo)
+        
+    Returns:
+        tuple: (mtime_ns, tamaño[, sha256])
+        
+    Raises:
+        FileNotFoundError: Si el archivo no existe
+    """
+    stat = Path(path).stat()
+    fingerprint = (stat.st_mtime_ns, stat.st_size)
+    
+    if use_hash:
+        digest = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for block in iter(lambda: f.read(1 << 20), b''):
+                digest.update(block)
+        fingerprint += (digest.hexdigest(),)
+    
+    return fingerprint
+
+
+def load_model_cached(path: PathLike, loader: Optional[Callable] = None, use_hash: bool = False):
+    """
+    Devuelve el modelo de ``path`` cargándolo solo si no está en caché o cambió.
+    
+    Args:
+        path: Ruta del artefacto del modelo
+        loader: Función ``loader(path) -> modelo`` (por defecto pickle.load);
+            forma parte de la clave de caché
+        use_hash: Validar también el hash del contenido, no solo mtime/tamaño
+        
+    Returns:
+        El modelo deserializado (el mismo objeto mientras el archivo no cambie)
+        
+    Raises:
+        FileNotFoundError: Si el archivo del modelo no existe
+    """
+    key = (Path(path).resolve(), loader or _load_pickle)
+    fingerprint = file_fingerprint(key[0], use_hash=use_hash)
+    
+    with _LOCK:
+        entry = _CACHE.get(key)
+        if entry is not None and entry['fingerprint'] == fingerprint:
+            return entry['model']
+        key_lock = _KEY_LOCKS.setdefault(key, threading.Lock())
+    
+    # Solo un hilo carga cada clave; los demás esperan y reutilizan su resultado
+    with key_lock:
+        with _LOCK:
+            entry = _CACHE.get(key)
+        if entry is not None and entry['fingerprint'] == fingerprint:
+            return entry['model']
+        
+        start = time.perf_counter()
+        model = key[1](key[0])
+        entry = {
+            'fingerprint': fingerprint,
+            'model': model,
+            'load_seconds': time.perf_counter() - start,
+            'loaded_at': time.time(),
+        }
+        with _LOCK:
+            _CACHE[key] = entry
+        return model
+
+
+def cache_info(path: PathLike, loader: Optional[Callable] = None) -> Optional[dict]:
+    """
+    Información de la entrada en caché de un modelo.
+    
+    Args:
+        path: Ruta del artefacto del modelo
+        loader: El mismo loader usado en load_model_cached
+    
+    Returns:
+        dict con fingerprint, load_seconds y loaded_at, o None si no está cargado
+    """
+    entry = _CACHE.get((Path(path).resolve(), loader or _load_pickle))
+    if entry is None:
+        return None
+    return {key: value for key, value in entry.items() if key != 'model'}
+
+
+def clear_model_cache(path: Optional[PathLike] = None):
+    """Elimina un modelo de la caché con todos sus loaders (o todos si no se indica ruta)."""
+    with _LOCK:
+        if path is None:
+            _CACHE.clear()
+            _KEY_LOCKS.clear()
+        else:
+            path = Path(path).resolve()
+            for key in [key for key in _CACHE if key[0] == path]:
+                del _CACHE[key]
+            for key in [key for key in _KEY_LOCKS if key[0] == path]:
+                del _KEY_LOCKS[key]